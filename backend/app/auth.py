@@ -4,8 +4,12 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from tortoise.signals import post_delete, post_save
 import hashlib
+import hmac
+import time
 
+from app.cache import TTLCache
 from app.config import settings
 from app.models import User
 
@@ -16,6 +20,19 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Configuración de OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Cache de tokens ya verificados (token -> username) y de usuarios (username -> User)
+# para no decodificar el JWT ni consultar la tabla users en cada request. El de usuarios
+# tiene un TTL corto: las señales de abajo solo ven las escrituras de este proceso, así que
+# un cambio hecho en otro worker tarda hasta AUTH_USER_CACHE_TTL_SECONDS en aplicarse
+token_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+user_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
 
 def _prepare_password(password: str) -> str:
     """
@@ -71,24 +88,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        username: str = payload.get("sub")
-        
-        if username is None:
-            raise credentials_exception
+    username = token_cache.get(token)
+    
+    if username is None:
+        try:
+            payload = jwt.decode(
+                token, 
+                settings.SECRET_KEY, 
+                algorithms=[settings.ALGORITHM]
+            )
+            username: str = payload.get("sub")
             
-    except JWTError:
-        raise credentials_exception
+            if username is None:
+                raise credentials_exception
+                
+        except JWTError:
+            raise credentials_exception
+        
+        # No cachear el token más allá de su expiración
+        expires_in = payload.get("exp", 0) - time.time()
+        token_cache.set(token, username, ttl=min(settings.AUTH_CACHE_TTL_SECONDS, expires_in))
     
-    user = await User.get_or_none(username=username)
+    user = user_cache.get(username)
     
     if user is None:
-        raise credentials_exception
+        user = await User.get_or_none(username=username)
+        
+        if user is None:
+            raise credentials_exception
+        
+        user_cache.set(username, user)
     
     if not user.is_active:
         raise HTTPException(
@@ -108,4 +137,32 @@ async def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuario inactivo"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def autorizar_metricas(token: str = Depends(oauth2_scheme)) -> None:
+    """
+    Dependencia de /metrics: acepta METRICS_TOKEN si está configurado (el scraper de
+    Prometheus lo envía con bearer_token) o el token de un usuario activo
+    """
+    if settings.METRICS_TOKEN and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return
+    await get_current_active_user(await get_current_user(token))
+
+
+def invalidate_user(user: User) -> None:
+    """
+    Elimina al usuario del cache (por id, por si cambió el username). Solo alcanza al
+    cache de este proceso y no corre con QuerySet.update: ver AUTH_USER_CACHE_TTL_SECONDS
+    """
+    user_cache.invalidate_if(lambda username, cached: cached.id == user.id)
+
+
+@post_save(User)
+async def _user_saved(sender, instance: User, created, using_db, update_fields) -> None:
+    invalidate_user(instance)
+
+
+@post_delete(User)
+async def _user_deleted(sender, instance: User, using_db) -> None:
+    invalidate_user(instance)
@@ -0,0 +1,312 @@
+import asyncio
+import logging
+import re
+import sys
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.etag import TABLAS_EMPLEADOS, leer_marcas
+from app.models import Empleado
+from app.referencias import referencias
+
+logger = logging.getLogger(__name__)
+
+_PALABRA = re.compile(r"\w+")
+
+# Cada inserción o borrado mueve la lista completa: con más cambios que esto en una sola
+# operación (lotes, importaciones) se rearma el índice en la próxima búsqueda
+_CAMBIOS_INCREMENTALES = 64
+
+
+@lru_cache(maxsize=65536)
+def _normalizar_texto(texto: str) -> str:
+    sin_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return sin_acentos.lower()
+
+
+def normalizar(texto: str) -> str:
+    """'Muñoz' -> 'munoz' (minúsculas y sin acentos)"""
+    # Los códigos y la mayoría de los textos son ASCII: no pasan por el cache
+    return texto.lower() if texto.isascii() else _normalizar_texto(texto)
+
+
+def palabras(*textos: Optional[str]) -> Tuple[str, ...]:
+    """Palabras normalizadas y sin repetir de los textos (compartidas con sys.intern)"""
+    vistas = {}
+    for texto in textos:
+        if texto:
+            for palabra in _PALABRA.findall(normalizar(texto)):
+                vistas.setdefault(palabra, None)
+    return tuple(map(sys.intern, vistas))
+
+
+class IndicePrefijos:
+    """
+    Índice de prefijos en memoria. Guarda listas paralelas ordenadas por (palabra, id) y
+    los textos originales de cada id. Una búsqueda hace dos bisect por palabra, recorre el
+    rango de la palabra con menos candidatos y verifica las demás sobre los textos del id.
+    """
+
+    def __init__(self):
+        self._palabras: List[str] = []
+        self._ids: List[int] = []
+        self._textos: Dict[int, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._textos)
+
+    def textos(self, item_id: int) -> Tuple[str, ...]:
+        return self._textos[item_id]
+
+    def ids(self) -> List[int]:
+        return list(self._textos)
+
+    def cargar(self, items: Iterable[Tuple[int, Tuple[str, ...]]]) -> None:
+        """Reemplaza todo el contenido por items: pares (id, textos)"""
+        self._textos = dict(items)
+        entradas = sorted(
+            (palabra, item_id) for item_id, textos in self._textos.items() for palabra in palabras(*textos)
+        )
+        self._palabras = [palabra for palabra, _ in entradas]
+        self._ids = [item_id for _, item_id in entradas]
+
+    def guardar(self, items: Iterable[Tuple[int, Tuple[str, ...]]]) -> None:
+        """Agrega o reemplaza items (id, textos)"""
+        for item_id, textos in items:
+            self._quitar(item_id)
+            self._textos[item_id] = textos
+            for palabra in palabras(*textos):
+                posicion = self._posicion(palabra, item_id)
+                self._palabras.insert(posicion, palabra)
+                self._ids.insert(posicion, item_id)
+
+    def quitar(self, ids: Iterable[int]) -> None:
+        """Quita los ids (los que no estén se ignoran)"""
+        for item_id in ids:
+            self._quitar(item_id)
+
+    def buscar(self, texto: str, limite: int) -> List[int]:
+        """Ids cuyos textos tienen, para cada palabra de texto, una palabra que empieza con ella"""
+        consulta = palabras(texto)
+        if not consulta or limite <= 0:
+            return []
+        # La palabra con menos candidatos guía el recorrido; las demás se verifican
+        rangos = {palabra: self._rango(palabra) for palabra in consulta}
+        guia = min(rangos, key=lambda palabra: rangos[palabra][1] - rangos[palabra][0])
+        inicio, fin = rangos[guia]
+        resto = [palabra for palabra in consulta if palabra != guia]
+
+        encontrados: Dict[int, None] = {}
+        for posicion in range(inicio, fin):
+            item_id = self._ids[posicion]
+            if item_id in encontrados:
+                continue
+            if resto:
+                propias = palabras(*self._textos[item_id])
+                if not all(any(p.startswith(q) for p in propias) for q in resto):
+                    continue
+            encontrados[item_id] = None
+            if len(encontrados) >= limite:
+                break
+        return list(encontrados)
+
+    def _rango(self, prefijo: str) -> Tuple[int, int]:
+        inicio = bisect_left(self._palabras, prefijo)
+        return inicio, bisect_left(self._palabras, prefijo + "\U0010ffff", inicio)
+
+    def _posicion(self, palabra: str, item_id: int) -> int:
+        inicio = bisect_left(self._palabras, palabra)
+        fin = bisect_right(self._palabras, palabra, inicio)
+        return bisect_left(self._ids, item_id, inicio, fin)
+
+    def _quitar(self, item_id: int) -> None:
+        textos = self._textos.pop(item_id, None)
+        if textos is None:
+            return
+        for palabra in palabras(*textos):
+            posicion = self._posicion(palabra, item_id)
+            del self._palabras[posicion]
+            del self._ids[posicion]
+
+
+# Campo mostrado e indexado de cada tabla de referencia
+_CAMPOS_REFERENCIAS = {"departamentos": "nombre", "posiciones": "titulo"}
+
+_COLUMNAS_EMPLEADO = ("id", "nombre", "apellido", "codigo_empleado")
+
+
+def _item_empleado(fila: Sequence) -> Tuple[int, Tuple[str, ...]]:
+    """(id, nombre, apellido, código) -> item del índice"""
+    # Nombres y apellidos se repiten mucho: una sola copia de cada uno en memoria
+    return fila[0], (sys.intern(fila[1]), sys.intern(fila[2]), fila[3])
+
+
+class Autocompletado:
+    """
+    Autocompletado de empleados (nombre, apellido y código), departamentos y posiciones.
+    El índice de empleados se arma al iniciar y lo actualizan las funciones de escritura
+    de crud; los de departamentos y posiciones se rearman desde el cache de referencias
+    cada vez que este cambia, así que siguen sus invalidaciones. Las escrituras de otros
+    workers o de scripts se detectan con la marca de agua de las tablas (sincronizar).
+    """
+
+    def __init__(self):
+        self.empleados = IndicePrefijos()
+        self._referencias = {nombre: IndicePrefijos() for nombre in _CAMPOS_REFERENCIAS}
+        self._fuentes: Dict[str, object] = {}
+        self._vigente = False
+        self._invalidaciones = 0
+        # Cambios recibidos mientras se lee la tabla completa; se vuelven a aplicar al terminar
+        self._pendientes: Optional[List[Tuple[str, list]]] = None
+        self._lock = asyncio.Lock()
+        # Marca de agua de empleados (cantidad, máximo actualizado_en) que refleja el índice
+        self._marca: Optional[Tuple[int, Any]] = None
+        self._proxima_sincronizacion = 0.0
+
+    async def construir(self) -> None:
+        """Lee los empleados (id, nombre, apellido y código) y arma su índice"""
+        async with self._lock:
+            await self._cargar()
+
+    async def _asegurar(self) -> None:
+        if not self._vigente:
+            async with self._lock:
+                if not self._vigente:
+                    await self._cargar()
+
+    async def _cargar(self) -> None:
+        inicio = time.perf_counter()
+        invalidaciones = self._invalidaciones
+        self._pendientes = []
+        try:
+            # Antes de leer las filas: lo que se escriba durante la carga se ve en la próxima sincronización
+            marca = (await leer_marcas(("empleados",)))["empleados"]
+            filas = await Empleado.all().values_list(*_COLUMNAS_EMPLEADO)
+            indice = IndicePrefijos()
+            # Ordenar millones de entradas lleva segundos: fuera del event loop
+            await asyncio.to_thread(indice.cargar, map(_item_empleado, filas))
+        finally:
+            pendientes, self._pendientes = self._pendientes, None
+        for operacion, datos in pendientes:
+            getattr(indice, operacion)(datos)
+        self.empleados = indice
+        self._marca = marca
+        self._vigente = invalidaciones == self._invalidaciones
+        logger.info(
+            "Índice de autocompletado armado",
+            extra={
+                "evento": "autocompletado.indice",
+                "empleados": len(indice),
+                "segundos": round(time.perf_counter() - inicio, 2),
+            },
+        )
+
+    def invalidar(self) -> None:
+        """Marca el índice de empleados para rearmarlo en la próxima búsqueda (cambios masivos)"""
+        self._invalidaciones += 1
+        self._vigente = False
+
+    def empleados_guardados(self, filas: Sequence[Sequence]) -> None:
+        """Agrega o actualiza empleados: filas (id, nombre, apellido, código)"""
+        self._aplicar("guardar", [_item_empleado(fila) for fila in filas])
+
+    def empleados_eliminados(self, ids: Sequence[int]) -> None:
+        self._aplicar("quitar", list(ids))
+
+    def _aplicar(self, operacion: str, datos: list) -> None:
+        if not datos:
+            return
+        if len(datos) > _CAMBIOS_INCREMENTALES:
+            self.invalidar()
+            return
+        getattr(self.empleados, operacion)(datos)
+        if self._pendientes is not None:
+            self._pendientes.append((operacion, datos))
+
+    async def refrescar_empleados(self, ids: Sequence[int] = (), codigos: Sequence[str] = ()) -> None:
+        """Vuelve a leer de la base los empleados indicados por id o código (operaciones en lote)"""
+        if len(ids) + len(codigos) > _CAMBIOS_INCREMENTALES:
+            self.invalidar()
+            return
+        if not self._vigente and self._pendientes is None:
+            return  # se rearma completo en la próxima búsqueda
+        filas = []
+        if ids:
+            filas += await Empleado.filter(id__in=list(ids)).values_list(*_COLUMNAS_EMPLEADO)
+        if codigos:
+            filas += await Empleado.filter(codigo_empleado__in=list(codigos)).values_list(*_COLUMNAS_EMPLEADO)
+        existentes = {fila[0] for fila in filas}
+        self.empleados_eliminados([item_id for item_id in ids if item_id not in existentes])
+        self.empleados_guardados(filas)
+
+    async def sincronizar(self) -> None:
+        """
+        Aplica las escrituras que no pasaron por crud en este proceso (otros workers,
+        importaciones, el generador de datos). Lee la marca de agua a lo sumo cada
+        AUTOCOMPLETE_SYNC_SECONDS; si cambió, vuelve a leer los empleados con
+        actualizado_en desde la marca anterior y, si la cantidad no coincide con la del
+        índice (hubo bajas), quita los ids que ya no existen. Con muchos cambios rearma
+        el índice completo. La misma consulta invalida el cache de referencias si cambió.
+        """
+        ahora = time.monotonic()
+        if ahora < self._proxima_sincronizacion:
+            return
+        self._proxima_sincronizacion = ahora + settings.AUTOCOMPLETE_SYNC_SECONDS
+        marca = (await leer_marcas(TABLAS_EMPLEADOS))["empleados"]
+        if marca == self._marca or not self._vigente:
+            return  # sin cambios, o se rearma completo en la próxima búsqueda
+
+        async with self._lock:
+            if self._marca is None or self._marca[1] is None or not self._vigente:
+                self.invalidar()
+                return
+            campo = Empleado._meta.fields_map["actualizado_en"]
+            desde = campo.to_python_value(self._marca[1])
+            # >=: otra fila pudo guardarse con el mismo actualizado_en que la marca anterior
+            filas = await Empleado.filter(actualizado_en__gte=desde).values_list(*_COLUMNAS_EMPLEADO)
+            if len(filas) > _CAMBIOS_INCREMENTALES:
+                self.invalidar()
+                return
+            self.empleados.guardar(map(_item_empleado, filas))
+            if len(self.empleados) != marca[0]:
+                existentes = set(await Empleado.all().values_list("id", flat=True))
+                self.empleados.quitar([item_id for item_id in self.empleados.ids() if item_id not in existentes])
+            self._marca = marca
+
+    async def _indice_referencias(self, nombre: str) -> IndicePrefijos:
+        instancias = await referencias.tabla(nombre)
+        indice = self._referencias[nombre]
+        if self._fuentes.get(nombre) is not instancias:
+            campo = _CAMPOS_REFERENCIAS[nombre]
+            indice.cargar((item_id, (getattr(fila, campo),)) for item_id, fila in instancias.items())
+            self._fuentes[nombre] = instancias
+        return indice
+
+    async def buscar(self, texto: str, tipos: Iterable[str], limite: int) -> Dict[str, List[dict]]:
+        """Hasta limite coincidencias por tipo ("empleados", "departamentos", "posiciones")"""
+        resultado = {}
+        await self.sincronizar()
+        for tipo in tipos:
+            if tipo == "empleados":
+                await self._asegurar()
+                indice = self.empleados
+                resultado[tipo] = []
+                for item_id in indice.buscar(texto, limite):
+                    nombre, apellido, codigo = indice.textos(item_id)
+                    resultado[tipo].append(
+                        {"id": item_id, "nombre_completo": f"{nombre} {apellido}", "codigo_empleado": codigo}
+                    )
+            else:
+                indice = await self._indice_referencias(tipo)
+                campo = _CAMPOS_REFERENCIAS[tipo]
+                resultado[tipo] = [
+                    {"id": item_id, campo: indice.textos(item_id)[0]} for item_id in indice.buscar(texto, limite)
+                ]
+        return resultado
+
+
+autocompletado = Autocompletado()
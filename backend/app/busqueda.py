@@ -0,0 +1,173 @@
+import logging
+import re
+import time
+from typing import List, Optional, Tuple
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Índice de texto completo de empleados (SQLite FTS5). Es una tabla FTS normal (guarda su
+# propia copia del texto) con rowid = empleados.id; los triggers la mantienen al día ante
+# cualquier escritura, incluidas las operaciones en lote, el upsert y los borrados en cascada.
+TABLA = "empleados_fts"
+COLUMNAS = ("nombre", "apellido", "email", "codigo_empleado", "departamento", "posicion")
+
+# Peso de cada columna en el ranking bm25 (mismo orden que COLUMNAS)
+PESOS = (10.0, 10.0, 4.0, 8.0, 2.0, 2.0)
+
+_CREAR_TABLA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS "{TABLA}" USING fts5(
+    {", ".join(COLUMNAS)},
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+# Valores indexados de un empleado a partir de una fila (new.* en los triggers)
+_VALORES = """
+    {fila}.nombre, {fila}.apellido, {fila}.email, {fila}.codigo_empleado,
+    (SELECT "nombre" FROM "departamentos" WHERE "id" = {fila}."departamento_id"),
+    (SELECT "titulo" FROM "posiciones" WHERE "id" = {fila}."Posicion_id")
+"""
+
+_TRIGGERS = {
+    "empleados_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS "empleados_fts_insert" AFTER INSERT ON "empleados" BEGIN
+            INSERT INTO "{TABLA}" (rowid, {", ".join(COLUMNAS)}) VALUES (new."id", {_VALORES.format(fila="new")});
+        END
+    """,
+    "empleados_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS "empleados_fts_delete" AFTER DELETE ON "empleados" BEGIN
+            DELETE FROM "{TABLA}" WHERE rowid = old."id";
+        END
+    """,
+    # Solo cuando cambia alguna columna indexada (no con los cambios de salario o activo)
+    "empleados_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS "empleados_fts_update"
+        AFTER UPDATE OF "nombre", "apellido", "email", "codigo_empleado", "departamento_id", "Posicion_id"
+        ON "empleados" BEGIN
+            DELETE FROM "{TABLA}" WHERE rowid = old."id";
+            INSERT INTO "{TABLA}" (rowid, {", ".join(COLUMNAS)}) VALUES (new."id", {_VALORES.format(fila="new")});
+        END
+    """,
+    "departamentos_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS "departamentos_fts_update" AFTER UPDATE OF "nombre" ON "departamentos" BEGIN
+            UPDATE "{TABLA}" SET "departamento" = new."nombre"
+            WHERE rowid IN (SELECT "id" FROM "empleados" WHERE "departamento_id" = new."id");
+        END
+    """,
+    "posiciones_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS "posiciones_fts_update" AFTER UPDATE OF "titulo" ON "posiciones" BEGIN
+            UPDATE "{TABLA}" SET "posicion" = new."titulo"
+            WHERE rowid IN (SELECT "id" FROM "empleados" WHERE "Posicion_id" = new."id");
+        END
+    """,
+}
+
+_POBLAR = f"""
+INSERT INTO "{TABLA}" (rowid, {", ".join(COLUMNAS)})
+SELECT e."id", e."nombre", e."apellido", e."email", e."codigo_empleado", d."nombre", p."titulo"
+FROM "empleados" e
+LEFT JOIN "departamentos" d ON d."id" = e."departamento_id"
+LEFT JOIN "posiciones" p ON p."id" = e."Posicion_id"
+"""
+
+# Palabras de la búsqueda: letras, dígitos y guion bajo (lo demás separa, como en el tokenizer)
+_PALABRA = re.compile(r"\w+")
+
+
+def disponible(connection: BaseDBAsyncClient) -> bool:
+    """El índice FTS5 solo existe en SQLite (y si no se desactivó con SEARCH_FTS_ENABLED)"""
+    return settings.SEARCH_FTS_ENABLED and connection.capabilities.dialect == "sqlite"
+
+
+async def existe_indice(connection: BaseDBAsyncClient) -> bool:
+    _, filas = await connection.execute_query(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [TABLA]
+    )
+    return bool(filas)
+
+
+async def asegurar_indice(connection: Optional[BaseDBAsyncClient] = None) -> None:
+    """
+    Crea la tabla FTS y sus triggers si no existen (idempotente; se llama al iniciar).
+    Si la tabla es nueva y ya hay empleados, la llena en ese momento.
+    """
+    connection = connection or connections.get("default")
+    if not disponible(connection):
+        return
+    nueva = not await existe_indice(connection)
+    await connection.execute_script(_CREAR_TABLA)
+    for sql in _TRIGGERS.values():
+        await connection.execute_script(sql)
+    if nueva:
+        inicio = time.perf_counter()
+        await connection.execute_script(_POBLAR)
+        logger.info(
+            "Índice de búsqueda creado",
+            extra={"evento": "busqueda.indice", "segundos": round(time.perf_counter() - inicio, 2)},
+        )
+
+
+async def eliminar_indice(connection: Optional[BaseDBAsyncClient] = None) -> None:
+    """Borra los triggers y la tabla FTS (p. ej. antes de una carga masiva)"""
+    connection = connection or connections.get("default")
+    for nombre in _TRIGGERS:
+        await connection.execute_script(f'DROP TRIGGER IF EXISTS "{nombre}"')
+    await connection.execute_script(f'DROP TABLE IF EXISTS "{TABLA}"')
+
+
+async def reconstruir_indice(connection: Optional[BaseDBAsyncClient] = None) -> dict:
+    """Vuelve a crear el índice desde cero a partir de las tablas y lo compacta"""
+    connection = connection or connections.get("default")
+    inicio = time.perf_counter()
+    await eliminar_indice(connection)
+    await connection.execute_script(_CREAR_TABLA)
+    await connection.execute_script(_POBLAR)
+    for sql in _TRIGGERS.values():
+        await connection.execute_script(sql)
+    await connection.execute_script(f"INSERT INTO \"{TABLA}\" (\"{TABLA}\") VALUES ('optimize')")
+    _, filas = await connection.execute_query(f'SELECT COUNT(*) FROM "{TABLA}"')
+    return {"indexados": int(tuple(filas[0])[0]), "segundos": round(time.perf_counter() - inicio, 2)}
+
+
+def expresion_fts(texto: str) -> Optional[str]:
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura: cada palabra como prefijo
+    entre comillas ("jua"* AND "gar"*). None si no hay ninguna palabra.
+    """
+    palabras = _PALABRA.findall(texto)
+    if not palabras:
+        return None
+    return " AND ".join(f'"{palabra}"*' for palabra in palabras)
+
+
+async def buscar_ids(
+    connection: BaseDBAsyncClient, texto: str, skip: int = 0, limit: int = 20
+) -> Tuple[List[int], int]:
+    """
+    IDs de empleados que coinciden, ordenados por relevancia (bm25), y el total de coincidencias.
+    bm25 se calcula para cada coincidencia: con más de SEARCH_RANK_MAX_MATCHES (búsquedas muy
+    amplias, p. ej. dos letras) se ordena por id, que FTS5 resuelve sin recorrer todo.
+    """
+    expresion = expresion_fts(texto)
+    if expresion is None:
+        return [], 0
+    _, filas = await connection.execute_query(f'SELECT COUNT(*) FROM "{TABLA}" WHERE "{TABLA}" MATCH ?', [expresion])
+    total = int(tuple(filas[0])[0])
+    if total == 0 or skip >= total:
+        return [], total
+
+    if total <= settings.SEARCH_RANK_MAX_MATCHES:
+        orden = f'bm25("{TABLA}", {", ".join(map(str, PESOS))}), rowid'
+    else:
+        orden = "rowid"
+    _, filas = await connection.execute_query(
+        f'SELECT rowid FROM "{TABLA}" WHERE "{TABLA}" MATCH ? ORDER BY {orden} LIMIT ? OFFSET ?',
+        [expresion, limit, skip],
+    )
+    return [fila[0] for fila in filas], total
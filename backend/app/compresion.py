@@ -0,0 +1,255 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Códecs opcionales: se usan solo si el paquete está instalado
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+# Tipos de contenido que vale la pena comprimir
+TIPOS_COMPRIMIBLES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._comp.compress(data)
+
+    def flush(self) -> bytes:
+        # Vacía lo pendiente sin cerrar el stream (para respuestas en streaming)
+        return self._comp.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._comp.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._comp = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._comp.process(data)
+
+    def flush(self) -> bytes:
+        return self._comp.flush()
+
+    def finish(self) -> bytes:
+        return self._comp.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._comp = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._comp.compress(data)
+
+    def flush(self) -> bytes:
+        return self._comp.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._comp.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def codecs_disponibles() -> List[str]:
+    """Content-Encodings que se pueden producir en este entorno"""
+    disponibles = ["gzip"]
+    if brotli is not None:
+        disponibles.append("br")
+    if zstandard is not None:
+        disponibles.append("zstd")
+    return disponibles
+
+
+def elegir_encoding(accept_encoding: str, preferencias: List[str]) -> Optional[str]:
+    """Primer encoding de preferencias que el cliente acepta (q > 0) según Accept-Encoding"""
+    aceptados: Dict[str, float] = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        if nombre:
+            aceptados[nombre.strip().lower()] = q
+
+    for encoding in preferencias:
+        q = aceptados.get(encoding, aceptados.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+
+def _separar_sufijo(etiqueta: str, encodings: List[str]) -> Tuple[str, Optional[str]]:
+    """'"abc-gzip"' -> ('"abc"', 'gzip')"""
+    for encoding in encodings:
+        sufijo = f'-{encoding}"'
+        if etiqueta.endswith(sufijo):
+            return etiqueta[:-len(sufijo)] + '"', encoding
+    return etiqueta, None
+
+
+class CompressionMiddleware:
+    """
+    Comprime respuestas (gzip y, si están instalados, brotli o zstd) según Accept-Encoding.
+    Solo comprime tipos de texto a partir de minimum_size bytes; las respuestas en streaming
+    se comprimen bloque a bloque sin acumularlas. Al ETag se le agrega el encoding
+    ("abc" -> "abc-gzip") para que cada representación tenga su propio ETag fuerte, y
+    If-None-Match se normaliza antes de llegar a los endpoints.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Optional[List[str]] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        disponibles = codecs_disponibles()
+        self.encodings = [e for e in (encodings or ["zstd", "br", "gzip"]) if e in disponibles]
+        self._niveles = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+
+    def _compresor(self, encoding: str):
+        nivel = self._niveles[encoding]
+        if encoding == "br":
+            return _Brotli(nivel)
+        if encoding == "zstd":
+            return _Zstd(nivel)
+        return _Gzip(nivel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = elegir_encoding(headers.get("accept-encoding", ""), self.encodings)
+
+        # El cliente devuelve el ETag con sufijo; los endpoints conocen el original
+        sufijo_cliente = None
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            etiquetas = []
+            for etiqueta in if_none_match.split(","):
+                etiqueta, sufijo = _separar_sufijo(etiqueta.strip(), self.encodings)
+                sufijo_cliente = sufijo_cliente or sufijo
+                etiquetas.append(etiqueta)
+            scope["headers"] = [
+                (k, v) for k, v in scope["headers"] if k != b"if-none-match"
+            ] + [(b"if-none-match", ", ".join(etiquetas).encode("latin-1"))]
+
+        responder = _Respuesta(self, encoding, sufijo_cliente, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _Respuesta:
+    """Estado de una respuesta en curso dentro de CompressionMiddleware"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], sufijo_cliente: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.sufijo_cliente = sufijo_cliente
+        self._send = send
+        self.inicio: Optional[Message] = None
+        self.compresor = None
+        self.pasar = False
+
+    async def send(self, message: Message) -> None:
+        tipo = message["type"]
+        if tipo == "http.response.start":
+            # Se retiene hasta ver el primer bloque del cuerpo
+            self.inicio = message
+            return
+        if tipo != "http.response.body" or self.inicio is None:
+            await self._send(message)
+            return
+
+        if self.compresor is None and not self.pasar:
+            await self._empezar(message)
+            return
+
+        if self.pasar:
+            await self._send(message)
+            return
+
+        body = self.compresor.compress(message.get("body", b""))
+        if message.get("more_body", False):
+            body += self.compresor.flush()
+        else:
+            body += self.compresor.finish()
+        await self._send({**message, "body": body})
+
+    async def _empezar(self, message: Message) -> None:
+        inicio = self.inicio
+        headers = MutableHeaders(raw=list(inicio["headers"]))
+        inicio["headers"] = headers.raw
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        comprimible = (
+            headers.get("content-type", "").startswith(TIPOS_COMPRIMIBLES)
+            and "content-encoding" not in headers
+        )
+        if comprimible:
+            headers.add_vary_header("Accept-Encoding")
+
+        if inicio["status"] == 304:
+            # Mismo ETag que la representación que el cliente tiene guardada
+            if self.sufijo_cliente:
+                headers.add_vary_header("Accept-Encoding")
+                self._sufijo_etag(headers, self.sufijo_cliente)
+            self.pasar = True
+        elif (
+            not comprimible
+            or self.encoding is None
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            self.pasar = True
+
+        if self.pasar:
+            await self._send(inicio)
+            await self._send(message)
+            return
+
+        self.compresor = self.middleware._compresor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        self._sufijo_etag(headers, self.encoding)
+        if more_body:
+            del headers["Content-Length"]
+            body = self.compresor.compress(body) + self.compresor.flush()
+        else:
+            body = self.compresor.compress(body) + self.compresor.finish()
+            headers["Content-Length"] = str(len(body))
+
+        await self._send(inicio)
+        await self._send({**message, "body": body})
+
+    @staticmethod
+    def _sufijo_etag(headers: MutableHeaders, encoding: str) -> None:
+        etag = headers.get("etag")
+        if etag and etag.endswith('"'):
+            headers["ETag"] = f'{etag[:-1]}-{encoding}"'
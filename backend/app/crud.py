@@ -1,75 +1,702 @@
-from app.models import Posicion, Departamento, Empleado
+import string
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from tortoise import timezone
+from tortoise.expressions import Q, RawSQL
+from tortoise.fields import DatetimeField
+from tortoise.functions import Avg, Count, Sum
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app import busqueda
+from app.autocompletado import autocompletado
+from app.cache import TTLCache
+from app.config import settings
+from app.models import CAMPOS_PREFIJO, SALARIO_NUMERICO, Posicion, Departamento, Empleado, expresion_prefijo
+from app.referencias import referencias
+
+# lower() de SQLite solo pasa a minúsculas las letras ASCII
+_MINUSCULAS_ASCII = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Relaciones de empleado que se pueden anidar en las respuestas
+EMPLEADO_RELACIONES = ("departamento", "Posicion")
+
+# Campos de empleado que indexa el autocompletado
+_CAMPOS_AUTOCOMPLETADO = ("nombre", "apellido", "codigo_empleado")
+
+def _fila_autocompletado(empleado: Empleado) -> tuple:
+    return (empleado.id, empleado.nombre, empleado.apellido, empleado.codigo_empleado)
+
+# Campos por los que se puede ordenar el listado de empleados
+EMPLEADO_ORDEN = ("id", "codigo_empleado", "nombre", "apellido", "fecha_contratacion", "salario", "creado_en")
+
+# Cache de corta duración para las estadísticas (se limpia en cada escritura)
+stats_cache = TTLCache(max_size=1, ttl=settings.STATS_CACHE_TTL_SECONDS)
+
+def _invalidar_caches() -> None:
+    """Limpia los caches derivados de los datos; llamar después de cada escritura"""
+    stats_cache.clear()
+
+# Backends que soportan UPDATE ... RETURNING (SQLite >= 3.35, PostgreSQL)
+_DIALECTOS_RETURNING = ("sqlite", "postgres")
+
+async def _update_returning(model, pk: int, datos: dict) -> Optional[Model]:
+    """
+    Actualiza una fila y devuelve la instancia actualizada en una sola sentencia
+    (UPDATE ... RETURNING). Actualiza también actualizado_en, que QuerySet.update no toca.
+    Devuelve None si la fila no existe.
+    """
+    datos = {**datos, "actualizado_en": timezone.now()}
+    db = model._meta.db
+
+    if db.capabilities.dialect not in _DIALECTOS_RETURNING:
+        if not await model.filter(id=pk).update(**datos):
+            return None
+        return await model.get_or_none(id=pk)
+
+    executor = db.executor_class(model=model, db=db)
+    instancia = model(**datos)
+    campos = list(datos)
+    valores = [executor.column_map[campo](getattr(instancia, campo), instancia) for campo in campos]
+    valores.append(model._meta.pk.to_db_value(pk, instancia))
+
+    _, filas = await db.execute_query(executor.get_update_sql(campos, {}) + " RETURNING *", valores)
+    if not filas:
+        return None
+    return model._init_from_db(**dict(filas[0]))
 
 # ===== FUNCIONES PARA DEPARTAMENTOS =====
 
+def _paginar_referencias(filas: List[Model], skip: int, limit: int, after_id: Optional[int]) -> List[Model]:
+    """Pagina en memoria una tabla de referencia ya ordenada por id"""
+    if after_id is not None:
+        return [fila for fila in filas if fila.id > after_id][:limit]
+    return filas[skip:skip + limit]
+
 async def get_departamento(departamento_id: int):
-    """Obtiene un departamento por ID"""
-    return await Departamento.get_or_none(id=departamento_id)
+    """Obtiene un departamento por ID (desde el cache de referencias)"""
+    return (await referencias.departamentos()).get(departamento_id)
 
-async def get_departamentos(skip: int = 0, limit: int = 100):
-    """Obtiene una lista de departamentos con paginación"""
-    return await Departamento.all().offset(skip).limit(limit)
+async def get_departamentos(skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Obtiene una lista de departamentos con paginación (desde el cache de referencias).
+    Si se indica after_id usa paginación por cursor (id > after_id) en lugar de offset.
+    """
+    departamentos = list((await referencias.departamentos()).values())
+    return _paginar_referencias(departamentos, skip, limit, after_id)
 
 async def create_departamento(departamento: dict):
     """Crea un nuevo departamento"""
-    return await Departamento.create(**departamento)
+    db_departamento = await Departamento.create(**departamento)
+    _invalidar_caches()
+    await referencias.invalidar("departamentos")
+    return db_departamento
 
 async def update_departamento(departamento_id: int, departamento: dict):
     """Actualiza un departamento existente"""
-    await Departamento.filter(id=departamento_id).update(**departamento)
-    return await get_departamento(departamento_id)
+    db_departamento = await _update_returning(Departamento, departamento_id, departamento)
+    _invalidar_caches()
+    await referencias.invalidar("departamentos")
+    return db_departamento
 
 async def delete_departamento(departamento_id: int):
     """Elimina un departamento"""
     deleted_count = await Departamento.filter(id=departamento_id).delete()
+    _invalidar_caches()
+    await referencias.invalidar("departamentos")
+    if deleted_count:
+        # Los empleados del departamento se borran en cascada
+        autocompletado.invalidar()
     return deleted_count > 0
 
 # ===== FUNCIONES PARA POSICIONES =====
 
 async def get_posicion(posicion_id: int):
-    """Obtiene una posición por ID"""
-    return await Posicion.get_or_none(id=posicion_id)
+    """Obtiene una posición por ID (desde el cache de referencias)"""
+    return (await referencias.posiciones()).get(posicion_id)
 
-async def get_posiciones(skip: int = 0, limit: int = 100):
-    """Obtiene una lista de posiciones con paginación"""
-    return await Posicion.all().offset(skip).limit(limit)
+async def get_posiciones(skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Obtiene una lista de posiciones con paginación (desde el cache de referencias).
+    Si se indica after_id usa paginación por cursor (id > after_id) en lugar de offset.
+    """
+    posiciones = list((await referencias.posiciones()).values())
+    return _paginar_referencias(posiciones, skip, limit, after_id)
 
 async def create_posicion(posicion: dict):
     """Crea una nueva posición"""
-    return await Posicion.create(**posicion)
+    db_posicion = await Posicion.create(**posicion)
+    _invalidar_caches()
+    await referencias.invalidar("posiciones")
+    return db_posicion
 
 async def update_posicion(posicion_id: int, posicion: dict):
     """Actualiza una posición existente"""
-    await Posicion.filter(id=posicion_id).update(**posicion)
-    return await get_posicion(posicion_id)
+    db_posicion = await _update_returning(Posicion, posicion_id, posicion)
+    _invalidar_caches()
+    await referencias.invalidar("posiciones")
+    return db_posicion
 
 async def delete_posicion(posicion_id: int):
     """Elimina una posición"""
     deleted_count = await Posicion.filter(id=posicion_id).delete()
+    _invalidar_caches()
+    await referencias.invalidar("posiciones")
+    if deleted_count:
+        autocompletado.invalidar()
     return deleted_count > 0
 
 # ===== FUNCIONES PARA EMPLEADOS =====
 
-async def get_empleado(empleado_id: int):
-    return await Empleado.get_or_none(id=empleado_id).prefetch_related("departamento", "Posicion")
+async def get_empleado(
+    empleado_id: int,
+    columnas: Optional[Sequence[str]] = None,
+    expandir: Sequence[str] = EMPLEADO_RELACIONES,
+):
+    """
+    Obtiene un empleado por ID; departamento y posición salen del cache de referencias.
+    columnas limita el SELECT; expandir indica qué relaciones hidratar.
+    """
+    query = Empleado.filter(id=empleado_id)
+    if columnas is not None:
+        query = query.only(*columnas)
+    empleado = await query.first()
+    if empleado is not None:
+        await referencias.hidratar_empleados([empleado], expandir)
+    return empleado
+
+def filtrar_empleados(
+    departamento_id: Optional[int] = None,
+    Posicion_id: Optional[int] = None,
+    activo: Optional[bool] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    salario_min: Optional[float] = None,
+    salario_max: Optional[float] = None,
+    q: Optional[str] = None,
+) -> QuerySet[Empleado]:
+    """Construye la consulta de empleados aplicando los filtros en SQL"""
+    query = Empleado.all()
+
+    if departamento_id is not None:
+        query = query.filter(departamento_id=departamento_id)
+    if Posicion_id is not None:
+        query = query.filter(Posicion_id=Posicion_id)
+    if activo is not None:
+        query = query.filter(activo=activo)
+    if fecha_desde is not None:
+        query = query.filter(fecha_contratacion__gte=fecha_desde)
+    if fecha_hasta is not None:
+        query = query.filter(fecha_contratacion__lte=fecha_hasta)
+    if salario_min is not None or salario_max is not None:
+        # Misma expresión que el índice idx_empleados_salario_num
+        query = query.annotate(salario_num=RawSQL(SALARIO_NUMERICO))
+        if salario_min is not None:
+            query = query.filter(salario_num__gte=salario_min)
+        if salario_max is not None:
+            query = query.filter(salario_num__lte=salario_max)
+    if q:
+        query = _filtrar_prefijo(query, q)
+
+    return query
+
+def _filtrar_prefijo(query: QuerySet[Empleado], prefijo: str) -> QuerySet[Empleado]:
+    """
+    Búsqueda por prefijo sin distinguir mayúsculas en nombre, apellido, email o código.
+    Cada campo se compara por rango (lower(campo) >= prefijo y < prefijo + U+10FFFF) para
+    usar su índice lower(campo): istartswith no puede, castea la columna dentro de UPPER().
+    La expresión (con su colación en PostgreSQL) es la misma que la del índice.
+    """
+    dialecto = Empleado._meta.db.capabilities.dialect
+    if dialecto == "sqlite":
+        prefijo = prefijo.translate(_MINUSCULAS_ASCII)
+    else:
+        prefijo = prefijo.lower()
+    condiciones = []
+    for campo in CAMPOS_PREFIJO:
+        # Calificada: el listado hace JOIN con departamentos, que también tiene "nombre"
+        expresion = expresion_prefijo(campo, dialecto, tabla="empleados")
+        query = query.annotate(**{f"{campo}_lower": RawSQL(expresion)})
+        condiciones.append(Q(**{f"{campo}_lower__gte": prefijo, f"{campo}_lower__lt": prefijo + "\U0010ffff"}))
+    return query.filter(Q(*condiciones, join_type="OR"))
+
+def parse_valor_orden(campo: str, valor: Any) -> Any:
+    """Convierte el valor guardado en un cursor al tipo de la columna de orden"""
+    if campo in ("codigo_empleado", "nombre", "apellido"):
+        return str(valor)
+    if campo == "fecha_contratacion":
+        return date.fromisoformat(valor)
+    if campo == "creado_en":
+        return datetime.fromisoformat(valor)
+    if campo == "salario":
+        return float(valor)
+    return valor
+
+def _consulta_empleados(
+    skip: int,
+    limit: int,
+    after_id: Optional[int],
+    after_value: Any,
+    sort: str,
+    **filtros
+) -> QuerySet[Empleado]:
+    """Consulta del listado: filtros, orden y paginación (offset o cursor clave de orden + id)"""
+    descendente = sort.startswith("-")
+    campo = sort.lstrip("-")
+    query = filtrar_empleados(**filtros)
+
+    columna = campo
+    if campo == "salario":
+        query = query.annotate(salario_num=RawSQL(SALARIO_NUMERICO))
+        columna = "salario_num"
+
+    if after_id is not None:
+        op = "lt" if descendente else "gt"
+        if campo == "id":
+            query = query.filter(**{f"id__{op}": after_id})
+        else:
+            query = query.filter(
+                Q(**{f"{columna}__{op}": after_value})
+                | Q(**{columna: after_value, f"id__{op}": after_id})
+            )
+    else:
+        query = query.offset(skip)
+
+    prefijo = "-" if descendente else ""
+    orden = [f"{prefijo}{columna}"] if campo == "id" else [f"{prefijo}{columna}", f"{prefijo}id"]
+
+    return query.order_by(*orden).limit(limit)
+
+async def get_empleados(
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    after_value: Any = None,
+    sort: str = "id",
+    columnas: Optional[Sequence[str]] = None,
+    expandir: Sequence[str] = EMPLEADO_RELACIONES,
+    **filtros
+):
+    """
+    Obtiene una lista de empleados con paginación, filtros y orden.
+    Si se indica after_id usa paginación por cursor (clave de orden + id) en lugar de offset.
+    columnas limita el SELECT (siempre incluye id y el campo de orden); expandir indica
+    qué relaciones hidratar (las demás quedan solo como *_id).
+    """
+    query = _consulta_empleados(skip, limit, after_id, after_value, sort, **filtros)
+    if columnas is not None:
+        query = query.only(*{"id", sort.lstrip("-"), *columnas})
+    empleados = await query
+    await referencias.hidratar_empleados(empleados, expandir)
+    return empleados
+
+async def get_empleados_filas(
+    columnas: Sequence[str],
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    after_value: Any = None,
+    sort: str = "id",
+    **filtros
+) -> List[tuple]:
+    """
+    Igual que get_empleados pero devuelve tuplas con las columnas pedidas, sin crear
+    instancias. Las columnas de relaciones (departamento__nombre, Posicion__titulo, ...)
+    salen de un LEFT JOIN en la misma consulta.
+    """
+    return await _leer_filas(_consulta_empleados(skip, limit, after_id, after_value, sort, **filtros), columnas)
+
+async def buscar_empleados(
+    texto: str,
+    columnas: Sequence[str],
+    skip: int = 0,
+    limit: int = 20,
+) -> Tuple[List[tuple], int]:
+    """
+    Búsqueda de texto completo en nombre, apellido, email, código, departamento y posición.
+    Devuelve las tuplas (como get_empleados_filas; columnas debe incluir id) ordenadas por
+    relevancia y el total de coincidencias. En SQLite usa el índice FTS5 de app.busqueda;
+    en otros motores cae al filtro por prefijo de q, ordenado por apellido.
+    """
+    db = Empleado._choose_db()
+    if not busqueda.disponible(db):
+        query = filtrar_empleados(q=texto)
+        total = await query.count()
+        filas = await _leer_filas(query.order_by("apellido", "nombre", "id").offset(skip).limit(limit), columnas)
+        return filas, total
+
+    ids, total = await busqueda.buscar_ids(db, texto, skip, limit)
+    if not ids:
+        return [], total
+    filas = await _leer_filas(Empleado.filter(id__in=ids), columnas)
+    # Mismo orden que el ranking
+    orden = {empleado_id: posicion for posicion, empleado_id in enumerate(ids)}
+    indice_id = list(columnas).index("id")
+    filas.sort(key=lambda fila: orden[fila[indice_id]])
+    return filas, total
+
+async def _leer_filas(query: QuerySet[Empleado], columnas: Sequence[str]) -> List[tuple]:
+    """
+    Ejecuta la consulta como values_list(*columnas). Misma conversión que values_list, pero
+    los valores de las relaciones (que se repiten en casi todas las filas) se convierten
+    una sola vez por consulta
+    """
+    valores = query.values_list(*columnas)
+    conversiones = [_conversion_columna(valores, columna) for columna in columnas]
+    _, filas = await Empleado._choose_db().execute_query(valores.sql())
+    return [tuple(convertir(valor) for convertir, valor in zip(conversiones, fila)) for fila in filas]
+
+def _conversion_columna(query, columna: str) -> Callable[[Any], Any]:
+    """Conversión a Python de una columna de values_list, con los atajos de _leer_filas"""
+    convertir = query.resolve_to_python_value(Empleado, columna)
+    if isinstance(getattr(convertir, "__self__", None), DatetimeField):
+        convertir = _datetime_desde_texto(convertir)
+    if "__" in columna:
+        convertir = _convertir_repetidos(convertir)
+    return convertir
+
+def _datetime_desde_texto(convertir: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    SQLite devuelve los datetimes como texto ISO: datetime.fromisoformat (en C) es mucho
+    más rápido que el parser de Tortoise; la zona horaria la sigue resolviendo Tortoise
+    """
+    def convertir_datetime(valor):
+        if isinstance(valor, str):
+            try:
+                valor = datetime.fromisoformat(valor)
+            except ValueError:
+                pass
+        return convertir(valor)
+
+    return convertir_datetime
+
+def _convertir_repetidos(convertir: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Envuelve una conversión para que cada valor distinto se convierta una sola vez"""
+    convertidos: Dict[Any, Any] = {}
 
-async def get_empleados(skip: int = 0, limit: int = 100):
-    """Obtiene una lista de empleados con paginación"""
-    return await Empleado.all().offset(skip).limit(limit).prefetch_related("departamento", "Posicion")
+    def convertir_una_vez(valor):
+        try:
+            return convertidos[valor]
+        except KeyError:
+            resultado = convertidos[valor] = convertir(valor)
+            return resultado
+
+    return convertir_una_vez
 
 async def create_empleado(empleado: dict):
+    """Crea un empleado y lo devuelve con sus relaciones (INSERT + un SELECT)"""
     empleado_obj = await Empleado.create(**empleado)
-    await empleado_obj.fetch_related("departamento", "Posicion")
-    return empleado_obj
+    _invalidar_caches()
+    autocompletado.empleados_guardados([_fila_autocompletado(empleado_obj)])
+    return await get_empleado(empleado_obj.id)
 
 async def update_empleado(empleado_id: int, empleado: dict):
-    await Empleado.filter(id=empleado_id).update(**empleado)
-    empleado_obj = await get_empleado(empleado_id)
-    if empleado_obj:
-        await empleado_obj.fetch_related("departamento", "Posicion")    
-    return empleado_obj
+    """Actualiza un empleado (UPDATE + un SELECT; solo el UPDATE si no existe)"""
+    actualizados = await Empleado.filter(id=empleado_id).update(**empleado, actualizado_en=timezone.now())
+    _invalidar_caches()
+    if not actualizados:
+        return None
+    db_empleado = await get_empleado(empleado_id)
+    if db_empleado is not None and any(campo in empleado for campo in _CAMPOS_AUTOCOMPLETADO):
+        autocompletado.empleados_guardados([_fila_autocompletado(db_empleado)])
+    return db_empleado
 
 async def delete_empleado(empleado_id: int):
     """Elimina una empleado"""
     deleted_count = await Empleado.filter(id=empleado_id).delete()
-    return deleted_count > 0
\ No newline at end of file
+    _invalidar_caches()
+    if deleted_count:
+        autocompletado.empleados_eliminados([empleado_id])
+    return deleted_count > 0
+
+# ===== EXPORTACIÓN DE EMPLEADOS =====
+
+# Columnas exportadas; los nombres de departamento y posición se resuelven con un JOIN
+EXPORT_COLUMNAS = (
+    "id", "codigo_empleado", "nombre", "apellido", "email", "telefono",
+    "fecha_nacimiento", "fecha_contratacion", "salario", "activo",
+    "departamento_id", "departamento", "Posicion_id", "posicion",
+)
+_EXPORT_CAMPOS = tuple(
+    {"departamento": "departamento__nombre", "posicion": "Posicion__titulo"}.get(c, c)
+    for c in EXPORT_COLUMNAS
+)
+_EXPORT_SALARIO = EXPORT_COLUMNAS.index("salario")
+
+async def iter_empleados_export(chunk_size: Optional[int] = None, **filtros) -> AsyncIterator[List[tuple]]:
+    """
+    Recorre los empleados filtrados en bloques de tuplas (paginación por id),
+    para exportar tablas grandes con memoria constante
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    ultimo_id = 0
+    while True:
+        filas = await (
+            filtrar_empleados(**filtros)
+            .filter(id__gt=ultimo_id)
+            .order_by("id")
+            .limit(chunk_size)
+            .values_list(*_EXPORT_CAMPOS)
+        )
+        if not filas:
+            break
+        # Mismo formato de salario que la API (2 decimales)
+        yield [
+            fila[:_EXPORT_SALARIO] + (f"{fila[_EXPORT_SALARIO]:.2f}",) + fila[_EXPORT_SALARIO + 1:]
+            for fila in filas
+        ]
+        if len(filas) < chunk_size:
+            break
+        ultimo_id = filas[-1][0]
+
+# ===== OPERACIONES EN LOTE SOBRE EMPLEADOS =====
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for inicio in range(0, len(items), size):
+        yield items[inicio:inicio + size]
+
+async def _ids_existentes(model, ids: Iterable[int]) -> set:
+    """IDs que existen en la tabla del modelo (consultados por bloques)"""
+    ids = list({i for i in ids if i is not None})
+    existentes = set()
+    for bloque in _chunks(ids, settings.BULK_CHUNK_SIZE):
+        existentes.update(await model.filter(id__in=bloque).values_list("id", flat=True))
+    return existentes
+
+async def _empleados_por_valor(campo: str, valores: Iterable[str]) -> Dict[str, int]:
+    """Mapa valor -> id de empleado para un campo único (código o email)"""
+    valores = list({v for v in valores if v is not None})
+    existentes = {}
+    for bloque in _chunks(valores, settings.BULK_CHUNK_SIZE):
+        filas = await Empleado.filter(**{f"{campo}__in": bloque}).values_list(campo, "id")
+        existentes.update(dict(filas))
+    return existentes
+
+def _validar_referencias(
+    datos: dict,
+    empleado_id: Optional[int],
+    departamentos: set,
+    posiciones: set,
+    codigos: Dict[str, int],
+    emails: Dict[str, int],
+) -> dict:
+    """
+    Valida FKs y unicidad de una fila del lote contra los datos precargados.
+    Registra el código y el email de la fila para detectar duplicados dentro del lote.
+    """
+    errores = {}
+    if "departamento_id" in datos and datos["departamento_id"] not in departamentos:
+        errores["departamento_id"] = ["Departamento no encontrado"]
+    if "Posicion_id" in datos and datos["Posicion_id"] not in posiciones:
+        errores["Posicion_id"] = ["Posición no encontrada"]
+
+    for campo, existentes, mensaje in (
+        ("codigo_empleado", codigos, "Ya existe un empleado con este código"),
+        ("email", emails, "Ya existe un empleado con este email"),
+    ):
+        valor = datos.get(campo)
+        if valor is None:
+            continue
+        if valor in existentes and (empleado_id is None or existentes[valor] != empleado_id):
+            errores[campo] = [mensaje]
+
+    if not errores:
+        for campo, existentes in (("codigo_empleado", codigos), ("email", emails)):
+            if datos.get(campo) is not None:
+                existentes[datos[campo]] = empleado_id
+    return errores
+
+async def bulk_create_empleados(filas: List[Tuple[int, dict]]) -> Tuple[int, List[dict]]:
+    """
+    Crea empleados en lote con bulk_create por bloques dentro de una sola transacción.
+    filas: pares (índice en el request, datos ya validados por el schema).
+    Devuelve la cantidad creada y los errores por fila (las filas con error se omiten).
+    """
+    departamentos = await _ids_existentes(Departamento, (d.get("departamento_id") for _, d in filas))
+    posiciones = await _ids_existentes(Posicion, (d.get("Posicion_id") for _, d in filas))
+    codigos = await _empleados_por_valor("codigo_empleado", (d.get("codigo_empleado") for _, d in filas))
+    emails = await _empleados_por_valor("email", (d.get("email") for _, d in filas))
+
+    errores = []
+    nuevos = []
+    for indice, datos in filas:
+        errores_fila = _validar_referencias(datos, None, departamentos, posiciones, codigos, emails)
+        if errores_fila:
+            errores.append({"index": indice, "errores": errores_fila})
+        else:
+            nuevos.append(Empleado(**datos))
+
+    if nuevos:
+        async with in_transaction("default") as connection:
+            for bloque in _chunks(nuevos, settings.BULK_CHUNK_SIZE):
+                await Empleado.bulk_create(bloque, using_db=connection)
+        _invalidar_caches()
+        await autocompletado.refrescar_empleados(codigos=[nuevo.codigo_empleado for nuevo in nuevos])
+
+    return len(nuevos), errores
+
+# Campos que se sobrescriben cuando el código de empleado ya existe
+_UPSERT_CAMPOS = [
+    "nombre", "apellido", "email", "telefono", "fecha_nacimiento", "fecha_contratacion",
+    "salario", "activo", "departamento_id", "Posicion_id", "actualizado_en",
+]
+
+async def upsert_empleados(filas: List[Tuple[int, dict]]) -> Tuple[int, int, List[dict]]:
+    """
+    Inserta o actualiza empleados (clave: codigo_empleado) con INSERT ... ON CONFLICT
+    en una sola transacción. filas: pares (índice o número de línea, datos validados).
+    Devuelve creados, actualizados y errores por fila.
+    """
+    departamentos = await _ids_existentes(Departamento, (d.get("departamento_id") for _, d in filas))
+    posiciones = await _ids_existentes(Posicion, (d.get("Posicion_id") for _, d in filas))
+    codigos = await _empleados_por_valor("codigo_empleado", (d.get("codigo_empleado") for _, d in filas))
+    emails = await _empleados_por_valor("email", (d.get("email") for _, d in filas))
+
+    errores = []
+    objetos = []
+    vistos = set()
+    actualizados = 0
+    for indice, datos in filas:
+        codigo = datos["codigo_empleado"]
+        if codigo in vistos:
+            errores.append({"index": indice, "errores": {"codigo_empleado": ["Código repetido en el lote"]}})
+            continue
+        empleado_id = codigos.get(codigo)
+        # El código propio no cuenta como duplicado: es la clave del upsert
+        otros_codigos = {} if empleado_id is not None else codigos
+        errores_fila = _validar_referencias(datos, empleado_id, departamentos, posiciones, otros_codigos, emails)
+        if errores_fila:
+            errores.append({"index": indice, "errores": errores_fila})
+            continue
+        vistos.add(codigo)
+        actualizados += empleado_id is not None
+        objetos.append(Empleado(**datos))
+
+    if objetos:
+        async with in_transaction("default") as connection:
+            for bloque in _chunks(objetos, settings.BULK_CHUNK_SIZE):
+                await Empleado.bulk_create(
+                    bloque,
+                    on_conflict=["codigo_empleado"],
+                    update_fields=_UPSERT_CAMPOS,
+                    using_db=connection,
+                )
+        _invalidar_caches()
+        await autocompletado.refrescar_empleados(codigos=[objeto.codigo_empleado for objeto in objetos])
+
+    return len(objetos) - actualizados, actualizados, errores
+
+async def bulk_update_empleados(filas: List[Tuple[int, int, dict]]) -> Tuple[int, List[dict]]:
+    """
+    Actualiza empleados en lote dentro de una sola transacción.
+    filas: tuplas (índice en el request, id del empleado, datos ya validados).
+    Devuelve la cantidad actualizada y los errores por fila.
+    """
+    ids = await _ids_existentes(Empleado, (empleado_id for _, empleado_id, _ in filas))
+    departamentos = await _ids_existentes(Departamento, (d.get("departamento_id") for _, _, d in filas))
+    posiciones = await _ids_existentes(Posicion, (d.get("Posicion_id") for _, _, d in filas))
+    codigos = await _empleados_por_valor("codigo_empleado", (d.get("codigo_empleado") for _, _, d in filas))
+    emails = await _empleados_por_valor("email", (d.get("email") for _, _, d in filas))
+
+    errores = []
+    cambios = []
+    for indice, empleado_id, datos in filas:
+        if empleado_id not in ids:
+            errores.append({"index": indice, "errores": {"id": ["Empleado no encontrado"]}})
+            continue
+        errores_fila = _validar_referencias(datos, empleado_id, departamentos, posiciones, codigos, emails)
+        if errores_fila:
+            errores.append({"index": indice, "errores": errores_fila})
+        else:
+            cambios.append((empleado_id, datos))
+
+    if cambios:
+        ahora = timezone.now()
+        async with in_transaction("default") as connection:
+            for empleado_id, datos in cambios:
+                await Empleado.filter(id=empleado_id).using_db(connection).update(
+                    **datos, actualizado_en=ahora
+                )
+        _invalidar_caches()
+        await autocompletado.refrescar_empleados(ids=[
+            empleado_id for empleado_id, datos in cambios
+            if any(campo in datos for campo in _CAMPOS_AUTOCOMPLETADO)
+        ])
+
+    return len(cambios), errores
+
+async def bulk_delete_empleados(ids: List[int]) -> Tuple[int, List[int]]:
+    """Elimina empleados en lote. Devuelve la cantidad eliminada y los IDs inexistentes"""
+    existentes = await _ids_existentes(Empleado, ids)
+    eliminados = 0
+    if existentes:
+        async with in_transaction("default") as connection:
+            for bloque in _chunks(sorted(existentes), settings.BULK_CHUNK_SIZE):
+                eliminados += await Empleado.filter(id__in=bloque).using_db(connection).delete()
+        _invalidar_caches()
+        autocompletado.empleados_eliminados(sorted(existentes))
+    return eliminados, sorted(set(ids) - existentes)
+
+# ===== ESTADÍSTICAS =====
+
+def _resumen_salarios(fila: Optional[dict]) -> dict:
+    if fila is None:
+        return {"empleados": 0, "activos": 0, "salario_total": 0.0, "salario_promedio": None}
+    promedio = fila["salario_promedio"]
+    return {
+        "empleados": fila["headcount"],
+        "activos": fila["activos"],
+        "salario_total": round(float(fila["salario_total"] or 0), 2),
+        "salario_promedio": round(float(promedio), 2) if promedio is not None else None,
+    }
+
+async def _agrupar_empleados(campo: str) -> dict:
+    """Headcount, activos y salarios agrupados por una FK, calculados en SQL"""
+    filas = await (
+        Empleado.annotate(
+            headcount=Count("id"),
+            activos=Count("id", _filter=Q(activo=True)),
+            salario_total=Sum("salario"),
+            salario_promedio=Avg("salario"),
+        )
+        .group_by(campo)
+        .values(campo, "headcount", "activos", "salario_total", "salario_promedio")
+    )
+    return {fila[campo]: fila for fila in filas}
+
+async def get_estadisticas(marca: Optional[str] = None) -> dict:
+    """
+    Obtiene conteos y agregados de salarios por departamento y posición (cacheado).
+    marca es la marca de agua de las tablas (etag.marca_de_agua): el cache es por proceso
+    y solo lo limpian las escrituras de este worker, así que se guarda por marca para
+    no devolver estadísticas viejas después de una escritura en otro worker.
+    """
+    estadisticas = stats_cache.get(("stats", marca))
+    if estadisticas is not None:
+        return estadisticas
+
+    por_departamento = await _agrupar_empleados("departamento_id")
+    por_posicion = await _agrupar_empleados("Posicion_id")
+    departamentos = [{"id": d.id, "nombre": d.nombre} for d in (await referencias.departamentos()).values()]
+    posiciones = [{"id": p.id, "titulo": p.titulo} for p in (await referencias.posiciones()).values()]
+
+    total = sum(fila["headcount"] for fila in por_departamento.values())
+    activos = sum(fila["activos"] for fila in por_departamento.values())
+
+    estadisticas = {
+        "total_empleados": total,
+        "empleados_activos": activos,
+        "empleados_inactivos": total - activos,
+        "total_departamentos": len(departamentos),
+        "total_posiciones": len(posiciones),
+        "por_departamento": [
+            {**d, **_resumen_salarios(por_departamento.get(d["id"]))} for d in departamentos
+        ],
+        "por_posicion": [
+            {**p, **_resumen_salarios(por_posicion.get(p["id"]))} for p in posiciones
+        ],
+    }
+    stats_cache.set(("stats", marca), estadisticas)
+    return estadisticas
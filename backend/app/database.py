@@ -1,22 +1,212 @@
+import asyncio
+import time
+from itertools import cycle
+from typing import Dict, List
+
 from tortoise import Tortoise
+from tortoise.backends.base.client import BaseTransactionWrapper
+from tortoise.backends.base.config_generator import expand_db_url
+from tortoise.connection import connections
+from tortoise.exceptions import DBConnectionError
 from fastapi import FastAPI
 
-TORTOISE_ORM = {
-    "connections": {
-        "default": "sqlite://empleados.db"
-    },
-    "apps": {
-        "models": {
-            "models": ["app.models", "aerich.models"],
-            "default_connection": "default",
+from app.busqueda import asegurar_indice as asegurar_indice_busqueda
+from app.config import settings
+from app.models import empleado_indices_expresion
+
+
+def _sqlite_path(url: str) -> str:
+    return url[len("sqlite://"):]
+
+
+def sqlite_pragmas() -> Dict[str, object]:
+    """Perfil de rendimiento de SQLite (se aplica como PRAGMA al abrir cada conexión)"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": "ON",
+    }
+
+
+def postgres_pool_options() -> Dict[str, object]:
+    """Parámetros del pool de asyncpg (se pasan a asyncpg.create_pool)"""
+    return {
+        "minsize": settings.DB_POOL_MIN_SIZE,
+        "maxsize": settings.DB_POOL_MAX_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "max_inactive_connection_lifetime": settings.DB_POOL_MAX_INACTIVE_LIFETIME_SECONDS,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT_SECONDS,
+        "timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+    }
+
+
+def read_connection_names() -> List[str]:
+    """Conexiones de solo lectura configuradas (ninguna si no es SQLite en archivo o no usa WAL)"""
+    url = settings.DATABASE_URL
+    if (
+        not url.startswith("sqlite://")
+        or _sqlite_path(url) == ":memory:"
+        or settings.SQLITE_JOURNAL_MODE.upper() != "WAL"
+    ):
+        return []
+    return [f"read_{i}" for i in range(settings.SQLITE_READ_CONNECTIONS)]
+
+
+def get_tortoise_config() -> dict:
+    """Arma la configuración de Tortoise a partir de settings"""
+    url = settings.DATABASE_URL
+    connections_config: Dict[str, object] = {"default": url}
+    routers = []
+
+    if url.startswith("sqlite://"):
+        path = _sqlite_path(url)
+        pragmas = sqlite_pragmas()
+        connections_config["default"] = {
+            "engine": "tortoise.backends.sqlite",
+            "credentials": {"file_path": path, **pragmas},
         }
+        # Con WAL los lectores no esperan al escritor: cada conexión de lectura
+        # tiene su propio hilo y no comparte el lock de la conexión de escritura
+        for name in read_connection_names():
+            connections_config[name] = {
+                "engine": "tortoise.backends.sqlite",
+                "credentials": {"file_path": path, **pragmas, "query_only": "ON"},
+            }
+        if read_connection_names():
+            routers.append("app.database.ReadWriteRouter")
+    elif url.startswith(("postgres://", "asyncpg://")):
+        default = expand_db_url(url)
+        default["credentials"].update(postgres_pool_options())
+        connections_config["default"] = default
+
+    return {
+        "connections": connections_config,
+        "apps": {
+            "models": {
+                "models": ["app.models", "aerich.models"],
+                "default_connection": "default",
+            }
+        },
+        "routers": routers,
     }
-}
+
+
+class ReadWriteRouter:
+    """
+    Envía las escrituras a la conexión principal y reparte las lecturas entre
+    las conexiones de solo lectura (round-robin). Dentro de una transacción
+    todo va a la conexión de la transacción para leer lo recién escrito.
+    """
+
+    def __init__(self):
+        self._readers = cycle(read_connection_names() or ["default"])
+
+    def db_for_read(self, model):
+        if isinstance(connections.get("default"), BaseTransactionWrapper):
+            return "default"
+        return next(self._readers)
+
+    def db_for_write(self, model):
+        return "default"
+
+
+TORTOISE_ORM = get_tortoise_config()
+
+
+def get_aerich_config() -> dict:
+    """
+    Configuración para aerich (pyproject.toml). Las migraciones de migrations/models
+    son SQL de SQLite (AUTOINCREMENT, DECIMAL como VARCHAR, índices de expresión):
+    con otra base se rechaza el comando antes de aplicar nada, en vez de fallar a mitad
+    de una migración. En PostgreSQL el esquema lo crea init_db (DB_GENERATE_SCHEMAS).
+    """
+    if not settings.DATABASE_URL.startswith("sqlite://"):
+        raise RuntimeError(
+            "Las migraciones de aerich son solo para SQLite; en PostgreSQL el esquema se crea "
+            "al iniciar con DB_GENERATE_SCHEMAS=true"
+        )
+    return get_tortoise_config()
+
+
+def __getattr__(nombre: str):
+    # aerich lee AERICH_ORM recién al correr un comando: importar este módulo no valida la base
+    if nombre == "AERICH_ORM":
+        return get_aerich_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+async def _ping(connection) -> float:
+    """Ejecuta SELECT 1 y devuelve la latencia en milisegundos"""
+    inicio = time.perf_counter()
+    await connection.execute_query("SELECT 1")
+    return (time.perf_counter() - inicio) * 1000
+
+
+async def warmup_db() -> None:
+    """
+    Verifica cada conexión al iniciar. Con asyncpg abre en paralelo tantas
+    conexiones como el mínimo del pool para no pagar el handshake en el primer request.
+    """
+    for connection in connections.all():
+        concurrentes = getattr(connection, "pool_minsize", 1)
+        await asyncio.gather(*(_ping(connection) for _ in range(concurrentes)))
+
+
+async def database_health() -> dict:
+    """Estado de cada conexión: latencia de SELECT 1 y, si hay pool, su ocupación"""
+    estado = {}
+    for connection in connections.all():
+        info = {"dialect": connection.capabilities.dialect}
+        try:
+            info["latency_ms"] = round(await _ping(connection), 2)
+            info["status"] = "ok"
+        except Exception as exc:
+            info["status"] = "error"
+            info["error"] = str(exc)
+        pool = getattr(connection, "_pool", None)
+        if pool is not None:
+            info["pool"] = {
+                "size": pool.get_size(),
+                "idle": pool.get_idle_size(),
+                "min_size": pool.get_min_size(),
+                "max_size": pool.get_max_size(),
+            }
+        estado[connection.connection_name] = info
+    return estado
+
+
+async def asegurar_indices_expresion() -> None:
+    """Crea los índices de expresión de empleados que generate_schemas no sabe crear"""
+    connection = Tortoise.get_connection("default")
+    for nombre, expresion in empleado_indices_expresion(connection.capabilities.dialect).items():
+        # Doble paréntesis: PostgreSQL lo exige para expresiones que no son llamadas a función
+        await connection.execute_script(
+            f'CREATE INDEX IF NOT EXISTS "{nombre}" ON "empleados" (({expresion}))'
+        )
+
 
 async def init_db(app: FastAPI) -> None:
-    await Tortoise.init(config=TORTOISE_ORM)
-    await Tortoise.generate_schemas()
+    intentos = max(settings.DB_STARTUP_RETRIES, 1)
+    for intento in range(1, intentos + 1):
+        try:
+            await Tortoise.init(config=get_tortoise_config())
+            await warmup_db()
+            break
+        except (OSError, asyncio.TimeoutError, DBConnectionError):
+            # La base puede tardar en aceptar conexiones (p. ej. al levantar con docker compose)
+            await Tortoise.close_connections()
+            if intento == intentos:
+                raise
+            await asyncio.sleep(settings.DB_STARTUP_RETRY_DELAY_SECONDS)
+
+    if settings.DB_GENERATE_SCHEMAS:
+        await Tortoise.generate_schemas()
+    await asegurar_indices_expresion()
+    await asegurar_indice_busqueda()
     app.state.db = Tortoise.get_connection("default")
 
 async def close_db() -> None:
-    await Tortoise.close_connections() 
\ No newline at end of file
+    await Tortoise.close_connections()
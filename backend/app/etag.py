@@ -0,0 +1,83 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.models import Empleado
+from app.referencias import referencias
+from app.serializers import json_response
+
+# Tablas de las que depende cada grupo de endpoints
+TABLAS_EMPLEADOS = ("empleados", "departamentos", "posiciones")
+TABLAS_DEPARTAMENTOS = ("departamentos",)
+TABLAS_POSICIONES = ("posiciones",)
+
+
+async def leer_marcas(tablas: Iterable[str]) -> Dict[str, Tuple[int, Any]]:
+    """
+    (cantidad de filas, máximo actualizado_en tal como lo devuelve la base) de cada tabla,
+    en una sola consulta. Cambia con cualquier alta, baja o modificación (las escrituras
+    de crud siempre actualizan actualizado_en). Las tablas de referencia tienen un cache
+    por proceso: si su marca cambió (p. ej. por una escritura en otro worker) se invalida.
+    """
+    tablas = tuple(tablas)
+    consultas = [
+        f'(SELECT COUNT(*) FROM "{tabla}"), (SELECT MAX("actualizado_en") FROM "{tabla}")'
+        for tabla in tablas
+    ]
+    _, filas = await Empleado._choose_db().execute_query(f"SELECT {', '.join(consultas)}")
+    valores = tuple(filas[0])
+    marcas = {tabla: (valores[2 * i], valores[2 * i + 1]) for i, tabla in enumerate(tablas)}
+    for tabla, (cantidad, ultima) in marcas.items():
+        if tabla in referencias.tablas:
+            await referencias.sincronizar(tabla, f"{cantidad}|{ultima}")
+    return marcas
+
+
+async def marca_de_agua(tablas: Iterable[str]) -> str:
+    """Resumen barato del estado de las tablas (ver leer_marcas) para el ETag"""
+    marcas = await leer_marcas(tablas)
+    return "|".join(f"{cantidad}|{ultima}" for cantidad, ultima in marcas.values())
+
+
+def calcular_etag(request: Request, marca: str) -> str:
+    """ETag fuerte a partir de la marca de agua, la ruta y los parámetros de la consulta"""
+    parametros = sorted(request.query_params.multi_items())
+    clave = f"{marca}|{request.url.path}|{parametros}"
+    return f'"{hashlib.sha1(clave.encode("utf-8")).hexdigest()}"'
+
+
+def coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (RFC 9110), como corresponde a GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etiquetas = (etiqueta.strip() for etiqueta in if_none_match.split(","))
+    return etag in (etiqueta[2:] if etiqueta.startswith("W/") else etiqueta for etiqueta in etiquetas)
+
+
+async def respuesta_condicional(
+    request: Request,
+    tablas: Iterable[str],
+    construir: Callable[[], Awaitable[Any]],
+) -> Response:
+    """
+    Responde 304 sin cargar ni serializar filas si el cliente ya tiene la versión actual;
+    si no, arma la respuesta con construir() y le agrega el ETag. La marca de agua queda
+    en request.state.marca_de_agua para que construir() la use como clave de sus caches:
+    un cache por proceso no ve las escrituras de otros workers y, sin esa clave, podría
+    devolver datos viejos con el ETag nuevo.
+    """
+    marca = await marca_de_agua(tablas)
+    request.state.marca_de_agua = marca
+    etag = calcular_etag(request, marca)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if coincide(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    respuesta = await construir()
+    if not isinstance(respuesta, Response):
+        respuesta = json_response(respuesta)
+    respuesta.headers.update(headers)
+    return respuesta
@@ -0,0 +1,220 @@
+import random
+import time
+import unicodedata
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from tortoise import connections, timezone
+from tortoise.transactions import in_transaction
+
+from app import busqueda, crud
+from app.autocompletado import autocompletado
+from app.config import settings
+from app.models import Departamento, Empleado, Posicion
+from app.referencias import referencias
+
+NOMBRES = (
+    "Juan", "María", "José", "Ana", "Luis", "Laura", "Carlos", "Lucía", "Jorge", "Sofía",
+    "Miguel", "Valentina", "Diego", "Camila", "Pablo", "Martina", "Martín", "Julieta", "Andrés", "Paula",
+    "Fernando", "Florencia", "Ricardo", "Agustina", "Sebastián", "Carolina", "Javier", "Natalia", "Gustavo", "Daniela",
+    "Alejandro", "Gabriela", "Nicolás", "Victoria", "Hernán", "Mariana", "Federico", "Romina", "Tomás", "Belén",
+)
+APELLIDOS = (
+    "García", "Rodríguez", "González", "Fernández", "López", "Martínez", "Sánchez", "Pérez", "Gómez", "Martín",
+    "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno", "Álvarez", "Muñoz", "Romero", "Alonso", "Gutiérrez",
+    "Navarro", "Torres", "Domínguez", "Vázquez", "Ramos", "Gil", "Ramírez", "Serrano", "Blanco", "Suárez",
+    "Molina", "Morales", "Ortega", "Delgado", "Castro", "Ortiz", "Rubio", "Marín", "Sanz", "Castineira",
+)
+DEPARTAMENTOS = (
+    "Ventas", "Marketing", "Finanzas", "Recursos Humanos", "Tecnología", "Operaciones", "Logística",
+    "Legal", "Compras", "Atención al Cliente", "Producto", "Calidad", "Seguridad", "Administración", "Investigación",
+)
+# Título base y rango salarial del nivel más bajo
+PUESTOS = (
+    ("Analista", 900), ("Desarrollador", 1200), ("Vendedor", 800), ("Contador", 1100), ("Diseñador", 1000),
+    ("Administrativo", 700), ("Técnico", 850), ("Abogado", 1300), ("Comprador", 900), ("Operador", 650),
+)
+NIVELES = (("Junior", 1.0), ("Semi Senior", 1.5), ("Senior", 2.2), ("Líder", 3.0), ("Gerente", 4.5))
+
+
+def _slug(texto: str) -> str:
+    """'Muñoz' -> 'munoz' (para armar emails)"""
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii").lower().replace(" ", "")
+
+
+async def _asegurar_departamentos(cantidad: int) -> List[int]:
+    """IDs de departamentos; crea los que falten hasta llegar a cantidad"""
+    existentes = await Departamento.all().values_list("nombre", flat=True)
+    faltan = cantidad - len(existentes)
+    if faltan > 0:
+        usados = set(existentes)
+        nuevos = []
+        k = 0
+        while len(nuevos) < faltan:
+            base = DEPARTAMENTOS[k % len(DEPARTAMENTOS)]
+            nombre = base if k < len(DEPARTAMENTOS) else f"{base} {k // len(DEPARTAMENTOS) + 1}"
+            if nombre not in usados:
+                usados.add(nombre)
+                nuevos.append(Departamento(nombre=nombre))
+            k += 1
+        await Departamento.bulk_create(nuevos)
+        await referencias.invalidar("departamentos")
+    return list(await Departamento.all().order_by("id").limit(cantidad).values_list("id", flat=True))
+
+
+async def _asegurar_posiciones(cantidad: int) -> List[Tuple[int, Decimal, Decimal]]:
+    """(id, salario mínimo, salario máximo) de las posiciones; crea las que falten"""
+    faltan = cantidad - await Posicion.all().count()
+    if faltan > 0:
+        nuevas = []
+        for k in range(faltan):
+            titulo, base = PUESTOS[k % len(PUESTOS)]
+            nivel, factor = NIVELES[(k // len(PUESTOS)) % len(NIVELES)]
+            minimo = Decimal(int(base * factor))
+            nuevas.append(Posicion(
+                titulo=f"{titulo} {nivel}", salario_min=minimo, salario_max=(minimo * Decimal("1.6")).quantize(Decimal(1)),
+            ))
+        await Posicion.bulk_create(nuevas)
+        await referencias.invalidar("posiciones")
+    filas = await Posicion.all().order_by("id").limit(cantidad).values_list("id", "salario_min", "salario_max")
+    return [(i, minimo or Decimal(800), maximo or Decimal(2000)) for i, minimo, maximo in filas]
+
+
+class _Generador:
+    """Arma filas de empleados ya convertidas al formato de la base, en el orden del INSERT"""
+
+    def __init__(self, executor, departamentos: List[int], posiciones: List[tuple], semilla: Optional[int]):
+        self.rng = random.Random(semilla)
+        self.columnas = executor.regular_columns
+        self.departamentos = departamentos
+        self.posiciones = posiciones
+        self.slugs = {texto: _slug(texto) for texto in NOMBRES + APELLIDOS}
+        self.hoy = date.today()
+        # Las conversiones al formato de la base dependen del backend (p. ej. SQLite guarda
+        # decimales como texto y booleanos como 0/1); las de valores fijos se hacen una vez.
+        # Textos, enteros y fechas se generan válidos y pasan sin convertir.
+        self.convertir = executor.column_map
+        ahora = timezone.now()
+        self.ahora = self.convertir["creado_en"](ahora, Empleado)
+        self.activo = {valor: self.convertir["activo"](valor, Empleado) for valor in (True, False)}
+
+    def fila(self, n: int) -> list:
+        rng = self.rng
+        nombre = rng.choice(NOMBRES)
+        apellido = rng.choice(APELLIDOS)
+        posicion_id, minimo, maximo = rng.choice(self.posiciones)
+        nacimiento = date(1960, 1, 1) + timedelta(days=rng.randrange(42 * 365))
+        # Contratado entre los 18 años y hoy
+        desde = nacimiento + timedelta(days=18 * 365)
+        contratacion = desde + timedelta(days=rng.randrange(max((self.hoy - desde).days, 1)))
+        salario = Decimal(rng.randint(int(minimo) * 100, int(maximo) * 100)) / 100
+        valores = {
+            "codigo_empleado": f"EMP{n:07d}",
+            "nombre": nombre,
+            "apellido": apellido,
+            "email": f"{self.slugs[nombre]}.{self.slugs[apellido]}{n}@empresa.example",
+            "telefono": f"+54 11 {rng.randrange(4000, 7000)}-{rng.randrange(10000):04d}" if rng.random() < 0.7 else None,
+            "fecha_nacimiento": nacimiento,
+            "fecha_contratacion": contratacion,
+            "salario": self.convertir["salario"](salario, Empleado),
+            "activo": self.activo[rng.random() < 0.9],
+            "creado_en": self.ahora,
+            "actualizado_en": self.ahora,
+            "departamento_id": rng.choice(self.departamentos),
+            "Posicion_id": posicion_id,
+        }
+        return [valores[columna] for columna in self.columnas]
+
+
+async def _indices_secundarios(connection) -> List[Tuple[str, str]]:
+    """(nombre, CREATE INDEX) de los índices no únicos de empleados en SQLite"""
+    _, filas = await connection.execute_query(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'empleados' "
+        "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'"
+    )
+    return [(fila[0], fila[1]) for fila in filas]
+
+
+async def generar_empleados(
+    cantidad: int,
+    departamentos: int = 25,
+    posiciones: int = 50,
+    batch_size: int = 10000,
+    filas_por_transaccion: int = 200000,
+    semilla: Optional[int] = None,
+    recrear_indices: bool = True,
+) -> dict:
+    """
+    Inserta `cantidad` empleados sintéticos con FKs válidas y códigos/emails únicos
+    (continúa la numeración a partir del mayor id). Usa executemany por bloques de
+    batch_size dentro de transacciones grandes. En SQLite además relaja synchronous y
+    cache_size durante la carga y, si recrear_indices, borra los índices secundarios y el
+    de búsqueda y los vuelve a crear al final (más rápido que mantenerlos fila a fila).
+    Devuelve un reporte con tiempos y filas por segundo.
+    """
+    connection = connections.get("default")
+    es_sqlite = connection.capabilities.dialect == "sqlite"
+    ids_departamentos = await _asegurar_departamentos(departamentos)
+    datos_posiciones = await _asegurar_posiciones(posiciones)
+
+    _, filas = await connection.execute_query('SELECT COALESCE(MAX("id"), 0) FROM "empleados"')
+    primero = int(tuple(filas[0])[0]) + 1
+
+    executor = connection.executor_class(model=Empleado, db=connection)
+    generador = _Generador(executor, ids_departamentos, datos_posiciones, semilla)
+
+    indices = []
+    con_busqueda = False
+    if es_sqlite:
+        await connection.execute_script("PRAGMA synchronous = OFF; PRAGMA cache_size = -512000; PRAGMA temp_store = MEMORY;")
+        if recrear_indices:
+            indices = await _indices_secundarios(connection)
+            for nombre, _ in indices:
+                await connection.execute_script(f'DROP INDEX IF EXISTS "{nombre}"')
+            # El índice de búsqueda también se arma de una vez al final en lugar de por trigger
+            con_busqueda = await busqueda.existe_indice(connection)
+            if con_busqueda:
+                await busqueda.eliminar_indice(connection)
+
+    inicio = time.perf_counter()
+    creados = 0
+    segundos_indices = 0.0
+    try:
+        while creados < cantidad:
+            async with in_transaction("default") as transaccion:
+                limite = min(cantidad, creados + filas_por_transaccion)
+                while creados < limite:
+                    bloque = min(batch_size, limite - creados)
+                    await transaccion.execute_many(
+                        executor.insert_query,
+                        [generador.fila(primero + creados + k) for k in range(bloque)],
+                    )
+                    creados += bloque
+        segundos_carga = time.perf_counter() - inicio
+    finally:
+        if es_sqlite:
+            inicio_indices = time.perf_counter()
+            for _, sql in indices:
+                await connection.execute_script(sql)
+            if con_busqueda:
+                await busqueda.reconstruir_indice(connection)
+            await connection.execute_script(
+                f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}; "
+                f"PRAGMA cache_size = {settings.SQLITE_CACHE_SIZE}; "
+                "PRAGMA temp_store = DEFAULT; ANALYZE;"
+            )
+            segundos_indices = time.perf_counter() - inicio_indices
+        crud._invalidar_caches()
+        autocompletado.invalidar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "creados": creados,
+        "departamentos": len(ids_departamentos),
+        "posiciones": len(datos_posiciones),
+        "segundos_carga": round(segundos_carga, 2),
+        "segundos_indices": round(segundos_indices, 2),
+        "segundos": round(segundos, 2),
+        "filas_por_segundo": round(creados / segundos) if segundos else creados,
+    }
@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.auth import get_password_hash, verify_password
+from app.config import settings
+
+
+class PasswordHasher:
+    """
+    Servicio asíncrono de hashing de contraseñas.
+    Ejecuta bcrypt en un pool de threads o procesos para no bloquear el event loop,
+    limitando la cantidad de operaciones simultáneas con un semáforo.
+    """
+
+    def __init__(self, executor_type: str = "thread", workers: int = 4, max_concurrency: int = 8):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Tipo de executor inválido: {executor_type}")
+        self.executor_type = executor_type
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Métricas
+        self.waiting = 0
+        self.in_progress = 0
+        self.completed = 0
+        self.max_waiting = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_progress += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_progress -= 1
+            self.completed += 1
+            semaphore.release()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica la contraseña sin bloquear el event loop"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Genera el hash de la contraseña sin bloquear el event loop"""
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        """Métricas del pool: profundidad de la cola y operaciones en curso"""
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "in_progress": self.in_progress,
+            "completed": self.completed,
+            "max_waiting": self.max_waiting,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
@@ -0,0 +1,101 @@
+import csv
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from app import crud
+from app.config import settings
+from app.referencias import referencias
+from app.schemas import empleado_create_validator
+
+# Columnas del CSV que se cargan tal cual en el schema (vacías = no informadas)
+COLUMNAS_EMPLEADO = (
+    "codigo_empleado", "nombre", "apellido", "email", "telefono",
+    "fecha_nacimiento", "fecha_contratacion", "salario", "activo",
+)
+
+
+async def _mapa_referencias() -> Tuple[dict, dict]:
+    """Nombre de departamento -> id y título de posición -> id (el de menor id si se repite)"""
+    departamentos = {}
+    for departamento in reversed(list((await referencias.departamentos()).values())):
+        departamentos[departamento.nombre.strip().lower()] = departamento.id
+    posiciones = {}
+    for posicion in reversed(list((await referencias.posiciones()).values())):
+        posiciones[posicion.titulo.strip().lower()] = posicion.id
+    return departamentos, posiciones
+
+
+def _preparar_fila(fila: dict, departamentos: dict, posiciones: dict) -> Tuple[Optional[dict], dict]:
+    """Convierte una fila del CSV en datos validados por el modelo EmpleadoCreate"""
+    datos = {}
+    for columna in COLUMNAS_EMPLEADO:
+        valor = (fila.get(columna) or "").strip()
+        if valor:
+            datos[columna] = valor
+
+    errores = {}
+    departamento = (fila.get("departamento") or "").strip().lower()
+    posicion = (fila.get("posicion") or "").strip().lower()
+    if departamento not in departamentos:
+        errores["departamento"] = ["Departamento no encontrado"]
+    else:
+        datos["departamento_id"] = departamentos[departamento]
+    if posicion not in posiciones:
+        errores["posicion"] = ["Posición no encontrada"]
+    else:
+        datos["Posicion_id"] = posiciones[posicion]
+
+    validados, errores_schema = empleado_create_validator.validate(datos)
+    # Si falta la referencia ya se informó por nombre; no exigir el id
+    for campo in ("departamento_id", "Posicion_id"):
+        if campo not in datos:
+            errores_schema.pop(campo, None)
+    errores.update(errores_schema)
+
+    return (None, errores) if errores else (validados, {})
+
+
+async def importar_empleados_csv(lineas: Iterable[str], batch_size: Optional[int] = None) -> dict:
+    """
+    Importa empleados desde un CSV (con encabezado) leído línea a línea.
+    Los departamentos y posiciones se buscan por nombre en un mapa en memoria y cada lote
+    se guarda con upsert sobre codigo_empleado en su propia transacción.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    inicio = time.perf_counter()
+    departamentos, posiciones = await _mapa_referencias()
+
+    reporte = {"procesadas": 0, "creados": 0, "actualizados": 0, "rechazadas": 0, "errores": []}
+
+    def rechazar(linea: int, errores: dict) -> None:
+        reporte["rechazadas"] += 1
+        if len(reporte["errores"]) < settings.IMPORT_MAX_ERRORES:
+            reporte["errores"].append({"linea": linea, "errores": errores})
+
+    async def guardar(lote: List[Tuple[int, dict]]) -> None:
+        creados, actualizados, errores = await crud.upsert_empleados(lote)
+        reporte["creados"] += creados
+        reporte["actualizados"] += actualizados
+        for error in errores:
+            rechazar(error["index"], error["errores"])
+
+    reader = csv.DictReader(lineas)
+    lote = []
+    for fila in reader:
+        reporte["procesadas"] += 1
+        datos, errores = _preparar_fila(fila, departamentos, posiciones)
+        if errores:
+            rechazar(reader.line_num, errores)
+            continue
+        lote.append((reader.line_num, datos))
+        if len(lote) >= batch_size:
+            await guardar(lote)
+            lote = []
+    if lote:
+        await guardar(lote)
+
+    reporte["errores"].sort(key=lambda error: error["linea"])
+    segundos = time.perf_counter() - inicio
+    reporte["segundos"] = round(segundos, 3)
+    reporte["filas_por_segundo"] = round(reporte["procesadas"] / segundos, 1) if segundos else None
+    return reporte
@@ -1,11 +1,12 @@
 from tortoise import Tortoise
-from app.database import TORTOISE_ORM
+from app.database import TORTOISE_ORM, asegurar_indices_expresion
 
 async def init_db():
     print("Initializing database...")
     await Tortoise.init(config=TORTOISE_ORM)
     print("Generating schemas...")
     await Tortoise.generate_schemas()
+    await asegurar_indices_expresion()
     print("Database initialized successfully!")
     await Tortoise.close_connections()
     print("Database connections closed.")
@@ -1,9 +1,16 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import init_db, close_db
-from app.routers import departamentos, posiciones, empleados, auth
+from app.compresion import CompressionMiddleware
+from app.database import init_db, close_db, database_health
+from app.routers import departamentos, posiciones, empleados, estadisticas, auth, autocompletado
+from app.autocompletado import autocompletado as indice_autocompletado
+from app.auth import autorizar_metricas
 from app.config import settings
+from app.hashing import password_hasher
+from app.registro import iniciar_logging, detener_logging
+from app.metricas import MetricsMiddleware, exponer_metricas, instalar_hook_consultas
 
 app = FastAPI(
     title="Empleados API",
@@ -18,8 +25,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Comprimir respuestas grandes (se agrega después de CORS para envolverlo)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        encodings=settings.COMPRESSION_ENCODINGS,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+
+# Medir cada request (se agrega al final para que quede afuera de todo y cuente la compresión)
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        slow_request_ms=settings.METRICS_SLOW_REQUEST_MS,
+        slow_request_max_queries=settings.METRICS_SLOW_REQUEST_MAX_QUERIES,
+    )
+
 # Incluir router de autenticación (SIN protección)
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 
@@ -27,14 +54,22 @@ app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(departamentos.router, prefix="/api/departments", tags=["departments"])
 app.include_router(posiciones.router, prefix="/api/positions", tags=["positions"])
 app.include_router(empleados.router, prefix="/api/employees", tags=["employees"])
+app.include_router(estadisticas.router, prefix="/api/stats", tags=["stats"])
+app.include_router(autocompletado.router, prefix="/api/autocomplete", tags=["autocomplete"])
 
 @app.on_event("startup")
 async def startup_event():
+    iniciar_logging()
     await init_db(app)
+    await indice_autocompletado.construir()
+    if settings.METRICS_ENABLED:
+        instalar_hook_consultas()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     await close_db()
+    password_hasher.shutdown()
+    detener_logging()
 
 @app.get("/")
 async def root():
@@ -50,4 +85,20 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    database = await database_health()
+    ok = all(info["status"] == "ok" for info in database.values())
+    return JSONResponse(
+        status_code=200 if ok else 503,
+        content={
+            "status": "ok" if ok else "error",
+            "database": database,
+            "password_hasher": password_hasher.stats(),
+        },
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(_: None = Depends(autorizar_metricas)):  # 🔒 PROTEGIDO
+    """Métricas de este worker en formato de texto de Prometheus"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas deshabilitadas")
+    return PlainTextResponse(exponer_metricas(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,273 @@
+import bisect
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+logger = logging.getLogger("app.metricas")
+
+# Buckets por defecto de los clientes de Prometheus (segundos)
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_METODOS_CONSULTA = ("execute_query", "execute_query_dict", "execute_insert", "execute_many", "execute_script")
+
+
+class Histograma:
+    """Histograma acumulativo con etiquetas, en formato de exposición de Prometheus"""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str], buckets: Sequence[float]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.buckets = tuple(buckets)
+        # valores de etiquetas -> [conteos por bucket..., +Inf], suma
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observar(self, valor: float, *etiquetas: str) -> None:
+        serie = self._series.get(etiquetas)
+        if serie is None:
+            serie = self._series[etiquetas] = ([0] * (len(self.buckets) + 1), [0.0])
+        conteos, suma = serie
+        conteos[bisect.bisect_left(self.buckets, valor)] += 1
+        suma[0] += valor
+
+    def exponer(self) -> Iterator[str]:
+        yield f"# HELP {self.nombre} {self.ayuda}"
+        yield f"# TYPE {self.nombre} histogram"
+        for valores, (conteos, suma) in sorted(self._series.items()):
+            etiquetas = _etiquetas(self.etiquetas, valores)
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + (float("inf"),), conteos):
+                acumulado += conteo
+                le = "+Inf" if limite == float("inf") else repr(float(limite))
+                yield f'{self.nombre}_bucket{{{etiquetas}{"," if etiquetas else ""}le="{le}"}} {acumulado}'
+            yield f"{self.nombre}_sum{{{etiquetas}}} {suma[0]}"
+            yield f"{self.nombre}_count{{{etiquetas}}} {acumulado}"
+
+
+class Contador:
+    """Contador monótono con etiquetas"""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def incrementar(self, *etiquetas: str, cantidad: float = 1) -> None:
+        self._series[etiquetas] = self._series.get(etiquetas, 0) + cantidad
+
+    def exponer(self) -> Iterator[str]:
+        yield f"# HELP {self.nombre} {self.ayuda}"
+        yield f"# TYPE {self.nombre} counter"
+        for valores, valor in sorted(self._series.items()):
+            yield f"{self.nombre}{{{_etiquetas(self.etiquetas, valores)}}} {valor}"
+
+
+def _etiquetas(nombres: Sequence[str], valores: Sequence[str]) -> str:
+    def escapar(valor: str) -> str:
+        return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{nombre}="{escapar(valor)}"' for nombre, valor in zip(nombres, valores))
+
+
+# ===== MÉTRICAS =====
+# Viven en memoria del proceso: con varios workers cada uno expone las suyas
+
+REQUESTS = Contador("http_requests_total", "Requests atendidos", ("method", "route", "status"))
+DURACION = Histograma(
+    "http_request_duration_seconds", "Duración total del request", ("method", "route"), BUCKETS_SEGUNDOS
+)
+CONSULTAS_POR_REQUEST = Histograma(
+    "http_request_db_queries", "Consultas a la base por request", ("method", "route"), BUCKETS_CONSULTAS
+)
+TIEMPO_DB = Histograma(
+    "http_request_db_seconds", "Tiempo en la base por request", ("method", "route"), BUCKETS_SEGUNDOS
+)
+TIEMPO_SERIALIZACION = Histograma(
+    "http_request_serialization_seconds", "Tiempo serializando la respuesta por request", ("method", "route"), BUCKETS_SEGUNDOS
+)
+LENTOS = Contador("http_slow_requests_total", "Requests por encima de METRICS_SLOW_REQUEST_MS", ("method", "route"))
+DURACION_CONSULTA = Histograma(
+    "db_query_duration_seconds", "Duración de cada consulta a la base", ("connection", "operation"), BUCKETS_SEGUNDOS
+)
+
+METRICAS = (REQUESTS, DURACION, CONSULTAS_POR_REQUEST, TIEMPO_DB, TIEMPO_SERIALIZACION, LENTOS, DURACION_CONSULTA)
+
+
+def exponer_metricas() -> str:
+    """Todas las métricas en formato de texto de Prometheus (version 0.0.4)"""
+    lineas = []
+    for metrica in METRICAS:
+        lineas.extend(metrica.exponer())
+    return "\n".join(lineas) + "\n"
+
+
+# ===== MEDICIÓN POR REQUEST =====
+
+class Medicion:
+    """Lo que se acumula durante un request: consultas (sql, segundos) y tiempo de serialización"""
+
+    __slots__ = ("consultas", "tiempo_db", "tiempo_serializacion")
+
+    def __init__(self):
+        self.consultas: List[Tuple[str, float]] = []
+        self.tiempo_db = 0.0
+        self.tiempo_serializacion = 0.0
+
+
+_medicion_actual: ContextVar[Optional[Medicion]] = ContextVar("medicion_actual", default=None)
+
+
+@contextmanager
+def medir_serializacion():
+    """Suma al request en curso el tiempo del bloque (serializar o codificar la respuesta)"""
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion.tiempo_serializacion += time.perf_counter() - inicio
+
+
+def _operacion(sql: str) -> str:
+    return sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "OTHER"
+
+
+def _instrumentar(metodo):
+    @functools.wraps(metodo)
+    async def envoltura(self, query: str, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return await metodo(self, query, *args, **kwargs)
+        finally:
+            duracion = time.perf_counter() - inicio
+            DURACION_CONSULTA.observar(duracion, self.connection_name, _operacion(query))
+            medicion = _medicion_actual.get()
+            if medicion is not None:
+                medicion.consultas.append((query, duracion))
+                medicion.tiempo_db += duracion
+
+    envoltura._instrumentado = True
+    return envoltura
+
+
+def _subclases(clase: type) -> Iterator[type]:
+    for subclase in clase.__subclasses__():
+        yield subclase
+        yield from _subclases(subclase)
+
+
+def instalar_hook_consultas() -> None:
+    """
+    Envuelve los execute_* de los clientes de Tortoise ya importados (incluidos los de
+    transacción) para medir cada consulta. Se llama después de Tortoise.init, que es
+    cuando se importa el backend configurado; es idempotente.
+    """
+    for clase in _subclases(BaseDBAsyncClient):
+        for nombre in _METODOS_CONSULTA:
+            metodo = clase.__dict__.get(nombre)
+            if metodo is not None and not getattr(metodo, "_instrumentado", False):
+                setattr(clase, nombre, _instrumentar(metodo))
+
+
+_rutas: Dict[object, str] = {}
+
+
+def _ruta(scope: Scope) -> str:
+    """Plantilla de la ruta (/api/employees/{empleado_id}) para no crear una serie por id"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return "sin_ruta"
+    ruta = _rutas.get(endpoint)
+    if ruta is None:
+        ruta = next(
+            (route.path for route in app.router.routes if getattr(route, "endpoint", None) is endpoint),
+            "sin_ruta",
+        )
+        _rutas[endpoint] = ruta
+    return ruta
+
+
+class MetricsMiddleware:
+    """
+    Mide cada request HTTP: duración total (incluido el envío de respuestas en streaming),
+    cantidad y tiempo de consultas a la base y tiempo de serialización. Los requests más
+    lentos que slow_request_ms se registran en el log con la lista de consultas.
+    """
+
+    def __init__(self, app: ASGIApp, slow_request_ms: float = 500, slow_request_max_queries: int = 50):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.slow_request_max_queries = slow_request_max_queries
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        medicion = Medicion()
+        token = _medicion_actual.set(medicion)
+        status = 500
+
+        async def send_con_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_status)
+        finally:
+            duracion = time.perf_counter() - inicio
+            _medicion_actual.reset(token)
+            self._registrar(scope, status, duracion, medicion)
+
+    def _registrar(self, scope: Scope, status: int, duracion: float, medicion: Medicion) -> None:
+        method = scope["method"]
+        ruta = _ruta(scope)
+        REQUESTS.incrementar(method, ruta, str(status))
+        DURACION.observar(duracion, method, ruta)
+        CONSULTAS_POR_REQUEST.observar(len(medicion.consultas), method, ruta)
+        TIEMPO_DB.observar(medicion.tiempo_db, method, ruta)
+        TIEMPO_SERIALIZACION.observar(medicion.tiempo_serializacion, method, ruta)
+
+        if duracion * 1000 >= self.slow_request_ms:
+            LENTOS.incrementar(method, ruta)
+            consultas = "\n".join(
+                f"  {tiempo * 1000:8.2f} ms  {sql}"
+                for sql, tiempo in medicion.consultas[: self.slow_request_max_queries]
+            )
+            omitidas = len(medicion.consultas) - self.slow_request_max_queries
+            if omitidas > 0:
+                consultas += f"\n  ... {omitidas} consultas más"
+            logger.warning(
+                "Request lento: %s %s -> %s en %.1f ms (%d consultas, %.1f ms en la base, %.1f ms serializando)\n%s",
+                method,
+                scope.get("path", ""),
+                status,
+                duracion * 1000,
+                len(medicion.consultas),
+                medicion.tiempo_db * 1000,
+                medicion.tiempo_serializacion * 1000,
+                consultas,
+                extra={
+                    "evento": "request.lento",
+                    "method": method,
+                    "route": ruta,
+                    "status": status,
+                    "duracion_ms": round(duracion * 1000, 1),
+                    "consultas": len(medicion.consultas),
+                },
+            )
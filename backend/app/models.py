@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from tortoise import fields
 from tortoise.models import Model
 
@@ -40,16 +42,16 @@ class Empleado(Model):
     
     # Información personal
     codigo_empleado = fields.CharField(max_length=20, unique=True)
-    nombre = fields.CharField(max_length=50)
+    nombre = fields.CharField(max_length=50, index=True)
     apellido = fields.CharField(max_length=50)
     email = fields.CharField(max_length=100, unique=True)
     telefono = fields.CharField(max_length=20, null=True)
     fecha_nacimiento = fields.DateField(null=True)
     
     # Información laboral
-    fecha_contratacion = fields.DateField()
+    fecha_contratacion = fields.DateField(index=True)
     salario = fields.DecimalField(max_digits=10, decimal_places=2)
-    activo = fields.BooleanField(default=True)
+    activo = fields.BooleanField(default=True, index=True)
     
     # Relaciones ForeignKey
     departamento = fields.ForeignKeyField('models.Departamento', related_name='empleados')
@@ -57,10 +59,17 @@ class Empleado(Model):
     
     # Timestamps
     creado_en = fields.DatetimeField(auto_now_add=True)
-    actualizado_en = fields.DatetimeField(auto_now=True)
+    actualizado_en = fields.DatetimeField(auto_now=True, index=True)  # MAX() para los ETags
     
     class Meta:
         table = "empleados"
+        # Compuestos para filtros/reportes por departamento o posición + activo
+        # y para ordenar por apellido; cubren también los índices simples de su prefijo
+        indexes = (
+            ("departamento_id", "activo"),
+            ("Posicion_id", "activo"),
+            ("apellido", "nombre"),
+        )
     
     def __str__(self):
         return f"{self.nombre} {self.apellido} ({self.codigo_empleado})"
@@ -70,6 +79,43 @@ class Empleado(Model):
         return f"{self.nombre} {self.apellido}"
 
 
+# ===== ÍNDICES DE EXPRESIÓN DE EMPLEADOS =====
+# generate_schemas solo crea índices sobre columnas: estos se crean al iniciar
+# (app.database) y en la migración 3. Las consultas tienen que usar exactamente
+# la misma expresión para que la base use el índice.
+
+# El salario se guarda como DECIMAL (texto en SQLite): para comparar y ordenar
+# numéricamente hay que castearlo
+SALARIO_NUMERICO = 'CAST("salario" AS DOUBLE PRECISION)'
+
+# Campos de la búsqueda por prefijo (q), sin distinguir mayúsculas: lower(campo)
+CAMPOS_PREFIJO = ("nombre", "apellido", "email", "codigo_empleado")
+
+
+def expresion_prefijo(campo: str, dialecto: str, tabla: Optional[str] = None) -> str:
+    """
+    lower(campo) para la búsqueda por prefijo, que compara por rango. En PostgreSQL va
+    con COLLATE "C": con la colación de la base (p. ej. en_US.UTF-8) el orden no es por
+    código de carácter y el rango deja afuera o mete filas que no empiezan con el prefijo.
+    """
+    columna = f'"{tabla}"."{campo}"' if tabla else f'"{campo}"'
+    if dialecto == "postgres":
+        return f'lower({columna}) COLLATE "C"'
+    return f"lower({columna})"
+
+
+def empleado_indices_expresion(dialecto: str) -> Dict[str, str]:
+    """{nombre del índice: expresión}; en PostgreSQL los de prefijo llevan la colación en el nombre"""
+    sufijo = "_c" if dialecto == "postgres" else ""
+    return {
+        "idx_empleados_salario_num": SALARIO_NUMERICO,
+        **{
+            f"idx_empleados_{campo}_lower{sufijo}": expresion_prefijo(campo, dialecto)
+            for campo in CAMPOS_PREFIJO
+        },
+    }
+
+
 class User(Model):
     """Modelo para Usuario del sistema"""
     id = fields.IntField(pk=True, generated=True)
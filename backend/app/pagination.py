@@ -0,0 +1,50 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(data: dict) -> str:
+    """Codifica la posición de la última fila como un token opaco"""
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decodifica un token generado por encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        data = None
+
+    if not isinstance(data, dict) or not isinstance(data.get("id"), int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    return data
+
+
+def after_id(after: Optional[str]) -> int:
+    """ID a partir del cual continuar (0 para la primera página)"""
+    if not after:
+        return 0
+    return decode_cursor(after)["id"]
+
+
+def build_page(
+    rows: List[Any],
+    limit: int,
+    cursor_for: Callable[[Any], dict] = lambda row: {"id": row.id}
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Recibe hasta limit + 1 filas y devuelve la página junto con el cursor
+    de la siguiente (None si no hay más filas)
+    """
+    if len(rows) <= limit or limit <= 0:
+        return rows[:max(limit, 0)], None
+    rows = rows[:limit]
+    return rows, encode_cursor(cursor_for(rows[-1]))
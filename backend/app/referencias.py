@@ -0,0 +1,177 @@
+import importlib
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+import pydantic_core
+from tortoise.models import Model
+
+from app.cache import TTLCache
+from app.config import settings
+from app.models import Departamento, Empleado, Posicion
+
+
+class MemoryBackend:
+    """Guarda las tablas de referencia en memoria del proceso (un cache por worker)"""
+
+    def __init__(self, url: str = "", ttl: float = 300.0):
+        self._cache = TTLCache(max_size=16, ttl=ttl)
+
+    async def get(self, clave: str) -> Optional[List[dict]]:
+        return self._cache.get(clave)
+
+    async def set(self, clave: str, filas: List[dict]) -> None:
+        self._cache.set(clave, filas)
+
+    async def delete(self, clave: str) -> None:
+        self._cache.delete(clave)
+
+
+class RedisBackend:
+    """
+    Guarda las tablas de referencia en Redis, compartidas entre workers: una escritura
+    en cualquier worker invalida la copia de todos. Requiere el paquete redis.
+    Las filas se guardan como JSON: fechas y decimales vuelven como texto y
+    ReferenceCache los convierte con el campo del modelo.
+    """
+
+    def __init__(self, url: str = "", ttl: float = 300.0):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("RedisBackend requiere el paquete 'redis' (pip install redis)") from exc
+        self._redis = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self._ttl = int(ttl)
+
+    async def get(self, clave: str) -> Optional[List[dict]]:
+        data = await self._redis.get(f"empleados:referencias:{clave}")
+        return pydantic_core.from_json(data) if data is not None else None
+
+    async def set(self, clave: str, filas: List[dict]) -> None:
+        await self._redis.set(f"empleados:referencias:{clave}", pydantic_core.to_json(filas), ex=self._ttl)
+
+    async def delete(self, clave: str) -> None:
+        await self._redis.delete(f"empleados:referencias:{clave}")
+
+
+def _cargar_backend(ruta: str):
+    """Instancia el backend indicado como ruta con puntos (p. ej. app.referencias.RedisBackend)"""
+    modulo, _, clase = ruta.rpartition(".")
+    backend_class = getattr(importlib.import_module(modulo), clase)
+    return backend_class(url=settings.REFERENCE_CACHE_URL, ttl=settings.REFERENCE_CACHE_TTL_SECONDS)
+
+
+class ReferenceCache:
+    """
+    Cache read-through de tablas chicas que casi no cambian (departamentos y posiciones).
+    Se carga la tabla completa en una consulta la primera vez y luego se sirve desde el
+    backend. Las funciones de escritura de crud llaman a invalidar(); las escrituras de
+    otros workers se detectan con sincronizar() en cada request con ETag.
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._modelos: Dict[str, Type[Model]] = {"departamentos": Departamento, "posiciones": Posicion}
+        # Instancias ya construidas para las últimas filas leídas del backend
+        self._filas: Dict[str, List[dict]] = {}
+        self._instancias: Dict[str, Dict[int, Model]] = {}
+        # Evita guardar una carga que empezó antes de una invalidación
+        self._generacion: Dict[str, int] = {}
+        # Última marca de agua (cantidad y máximo actualizado_en) vista en la base por tabla
+        self._marcas: Dict[str, str] = {}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = _cargar_backend(settings.REFERENCE_CACHE_BACKEND)
+        return self._backend
+
+    @property
+    def tablas(self) -> Tuple[str, ...]:
+        return tuple(self._modelos)
+
+    async def tabla(self, nombre: str) -> Dict[int, Model]:
+        """Devuelve {id: instancia} de la tabla, leyendo de la base solo si no está en cache"""
+        filas = await self.backend.get(nombre)
+        if filas is None:
+            generacion = self._generacion.get(nombre, 0)
+            filas = await self._modelos[nombre].all().order_by("id").values()
+            if generacion == self._generacion.get(nombre, 0):
+                await self.backend.set(nombre, filas)
+
+        if filas is not self._filas.get(nombre):
+            model = self._modelos[nombre]
+            instancias = {}
+            campos = model._meta.fields_map
+            for fila in filas:
+                # Un backend que serializa (Redis) devuelve texto en vez de datetime/Decimal
+                fila = {campo: campos[campo].to_python_value(valor) for campo, valor in fila.items()}
+                instancia = model._init_from_db(**fila)
+                instancias[instancia.id] = instancia
+            self._filas[nombre] = filas
+            self._instancias[nombre] = instancias
+        return self._instancias[nombre]
+
+    async def departamentos(self) -> Dict[int, Departamento]:
+        return await self.tabla("departamentos")
+
+    async def posiciones(self) -> Dict[int, Posicion]:
+        return await self.tabla("posiciones")
+
+    async def invalidar(self, nombre: str) -> None:
+        self._generacion[nombre] = self._generacion.get(nombre, 0) + 1
+        self._filas.pop(nombre, None)
+        self._instancias.pop(nombre, None)
+        await self.backend.delete(nombre)
+
+    async def sincronizar(self, nombre: str, marca: str) -> None:
+        """
+        Invalida la tabla si su marca de agua en la base cambió desde la última vez que se
+        vio: así se detectan las escrituras de otros workers, que no pasan por invalidar()
+        de este proceso. La marca la lee etag.marca_de_agua, sin consultas extra.
+        """
+        if self._marcas.get(nombre) != marca:
+            await self.invalidar(nombre)
+            self._marcas[nombre] = marca
+
+    async def hidratar_empleados(
+        self, empleados: Iterable[Empleado], relaciones: Iterable[str] = ("departamento", "Posicion")
+    ) -> None:
+        """Asigna departamento y/o posición a cada empleado desde el cache (sin consultas)"""
+        empleados = list(empleados)
+        relaciones = tuple(relaciones)
+        if not empleados or not relaciones:
+            return
+        con_departamento = "departamento" in relaciones
+        con_posicion = "Posicion" in relaciones
+        departamentos = await self.departamentos() if con_departamento else {}
+        posiciones = await self.posiciones() if con_posicion else {}
+
+        faltantes = any(
+            (con_departamento and e.departamento_id not in departamentos)
+            or (con_posicion and e.Posicion_id not in posiciones)
+            for e in empleados
+        )
+        if faltantes:
+            # Otro worker creó la referencia y este cache todavía no se enteró
+            if con_departamento:
+                await self.invalidar("departamentos")
+                departamentos = await self.departamentos()
+            if con_posicion:
+                await self.invalidar("posiciones")
+                posiciones = await self.posiciones()
+
+        sin_cache = []
+        for empleado in empleados:
+            # Con columnas parciales el id de una relación no expandida puede no estar cargado
+            departamento = departamentos.get(empleado.departamento_id) if con_departamento else None
+            posicion = posiciones.get(empleado.Posicion_id) if con_posicion else None
+            if (con_departamento and departamento is None) or (con_posicion and posicion is None):
+                sin_cache.append(empleado)
+                continue
+            if con_departamento:
+                empleado.departamento = departamento
+            if con_posicion:
+                empleado.Posicion = posicion
+        if sin_cache:
+            await Empleado.fetch_for_list(sin_cache, *relaciones)
+
+referencias = ReferenceCache()
@@ -0,0 +1,90 @@
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import pydantic_core
+
+from app.config import settings
+
+# Atributos propios de LogRecord; lo demás llegó por extra= y va como campo del JSON
+_ATRIBUTOS_RECORD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[QueueHandler] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Una línea JSON por registro: ts, level, logger, msg y los campos pasados con extra="""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_RECORD and not clave.startswith("_"):
+                datos[clave] = valor
+        if record.exc_info:
+            datos["exc"] = self.formatException(record.exc_info)
+        return pydantic_core.to_json(datos, fallback=str).decode("utf-8")
+
+
+class MuestreoFilter(logging.Filter):
+    """
+    Deja pasar solo una fracción de los eventos de alto volumen (extra={"evento": ...}).
+    Los WARNING o más graves nunca se descartan.
+    """
+
+    def __init__(self, tasas: Dict[str, float]):
+        super().__init__()
+        self.tasas = tasas
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        tasa = self.tasas.get(getattr(record, "evento", None))
+        if tasa is None or record.levelno >= logging.WARNING:
+            return True
+        return random.random() < tasa
+
+
+def iniciar_logging() -> None:
+    """
+    Configura el logger raíz con un QueueHandler: en el event loop solo se encola el
+    registro y un hilo (QueueListener) lo formatea y lo escribe en stdout. Aplica los
+    niveles por módulo de LOG_LEVELS y el muestreo de LOG_SAMPLING. Es idempotente.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    salida = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        salida.setFormatter(JSONFormatter())
+    else:
+        salida.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    cola: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _handler = QueueHandler(cola)
+    _handler.addFilter(MuestreoFilter(settings.LOG_SAMPLING))
+
+    raiz = logging.getLogger()
+    raiz.handlers = [_handler]
+    raiz.setLevel(settings.LOG_LEVEL.upper())
+    for nombre, nivel in settings.LOG_LEVELS.items():
+        logging.getLogger(nombre).setLevel(nivel.upper())
+
+    _listener = QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+
+
+def detener_logging() -> None:
+    """Escribe lo que quedó en la cola y detiene el hilo del listener"""
+    global _listener, _handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        _listener = _handler = None
@@ -1,14 +1,14 @@
+import logging
 from datetime import timedelta
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.models import User
 from app.auth import (
-    verify_password, 
-    get_password_hash, 
     create_access_token,
     get_current_active_user
 )
+from app.hashing import password_hasher
 from app.auth_schemas import (
     UserRegister, 
     UserLogin, 
@@ -18,6 +18,7 @@ from app.auth_schemas import (
 from app.config import settings
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -38,7 +39,7 @@ async def register(user_data: UserRegister):
             detail="El email ya está registrado"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     
     user = await User.create(
         username=user_data.username,
@@ -56,30 +57,32 @@ async def register(user_data: UserRegister):
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login de usuario"""
     
-    print(f"🔍 Intentando login para usuario: {form_data.username}")
+    logger.info("Intento de login", extra={"evento": "auth.intento", "usuario": form_data.username})
     
     user = await User.get_or_none(username=form_data.username)
     
     if not user:
-        print(f"❌ Usuario no encontrado: {form_data.username}")
+        logger.warning(
+            "Login fallido: usuario no encontrado",
+            extra={"evento": "auth.fallido", "usuario": form_data.username, "motivo": "usuario"},
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario o contraseña incorrectos",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    print(f"✅ Usuario encontrado: {user.username}")
-    
-    if not verify_password(form_data.password, user.hashed_password):
-        print(f"❌ Contraseña incorrecta")
+    if not await password_hasher.verify(form_data.password, user.hashed_password):
+        logger.warning(
+            "Login fallido: contraseña incorrecta",
+            extra={"evento": "auth.fallido", "usuario": user.username, "motivo": "password"},
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario o contraseña incorrectos",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    print(f"✅ Contraseña correcta")
-    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -92,7 +95,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         expires_delta=access_token_expires
     )
     
-    print(f"✅ Login exitoso")
+    logger.info("Login exitoso", extra={"evento": "auth.exito", "usuario": user.username})
     
     return {
         "access_token": access_token,
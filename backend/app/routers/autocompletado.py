@@ -0,0 +1,38 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_active_user
+from app.autocompletado import autocompletado
+from app.config import settings
+from app.models import User
+from app.serializers import json_response
+
+router = APIRouter()
+
+# Tipo pedido en types= -> índice
+TIPOS = {"employees": "empleados", "departments": "departamentos", "positions": "posiciones"}
+
+@router.get("/", response_model=dict)
+async def autocomplete(
+    q: str = Query(..., min_length=1, description="Texto tipeado; cada palabra se toma como prefijo"),
+    types: Optional[str] = Query(None, description="employees, departments y/o positions separados por comas (por defecto todos)"),
+    limit: int = Query(10, ge=1, le=settings.AUTOCOMPLETE_MAX_RESULTS),
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """
+    GET /api/autocomplete?q=&types=&limit= - Requiere autenticación
+    Sugerencias desde un índice en memoria; solo consulta la base para leer la marca de agua
+    (a lo sumo cada AUTOCOMPLETE_SYNC_SECONDS) y aplicar las escrituras de otros workers:
+    {"employees": [{id, nombre_completo, codigo_empleado}], "departments": [{id, nombre}], "positions": [{id, titulo}]}
+    """
+    pedidos = [t.strip() for t in types.split(",") if t.strip()] if types else list(TIPOS)
+    invalidos = [t for t in pedidos if t not in TIPOS]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipos inválidos: {', '.join(invalidos)}. Permitidos: {', '.join(TIPOS)}"
+        )
+    
+    resultados = await autocompletado.buscar(q, [TIPOS[t] for t in pedidos], limit)
+    return json_response({tipo: resultados[TIPOS[tipo]] for tipo in pedidos})
@@ -1,37 +1,55 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from marshmallow import ValidationError
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 
 from app import crud
-from app.schemas import DepartamentoSchema, DepartamentoCreateSchema
+from app.serializers import departamento_serializer, json_response
+from app.pagination import after_id, build_page
+from app.etag import TABLAS_DEPARTAMENTOS, respuesta_condicional
+from app.schemas import DepartamentoSchema, departamento_create_validator
 from app.auth import get_current_active_user
 from app.models import User
 
 router = APIRouter()
 departamento_schema = DepartamentoSchema()
-departamentos_schema = DepartamentoSchema(many=True)
-departamento_create_schema = DepartamentoCreateSchema()
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=Union[List[dict], dict])
 async def read_departamentos(
+    request: Request,
     skip: int = 0, 
     limit: int = 100,
+    cursor: bool = False,
+    after: Optional[str] = None,
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
-    """GET /api/departments - Requiere autenticación"""
-    departamentos = await crud.get_departamentos(skip=skip, limit=limit)
-    return departamentos_schema.dump(departamentos)
+    """
+    GET /api/departments - Requiere autenticación
+    Con cursor=true o after=<token> responde {"items": [...], "next_cursor": ...}
+    """
+    async def construir():
+        if cursor or after is not None:
+            rows = await crud.get_departamentos(limit=limit + 1, after_id=after_id(after))
+            departamentos, next_cursor = build_page(rows, limit)
+            return json_response({"items": departamento_serializer.dump_many(departamentos), "next_cursor": next_cursor})
+        
+        departamentos = await crud.get_departamentos(skip=skip, limit=limit)
+        return json_response(departamento_serializer.dump_many(departamentos))
+    
+    return await respuesta_condicional(request, TABLAS_DEPARTAMENTOS, construir)
 
 @router.get("/{departamento_id}", response_model=dict)
 async def read_departamento(
     departamento_id: int,
+    request: Request,
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """GET /api/departments/{id} - Requiere autenticación"""
-    db_departamento = await crud.get_departamento(departamento_id=departamento_id)
-    if db_departamento is None:
-        raise HTTPException(status_code=404, detail="Departamento no encontrado")
-    return departamento_schema.dump(db_departamento)
+    async def construir():
+        db_departamento = await crud.get_departamento(departamento_id=departamento_id)
+        if db_departamento is None:
+            raise HTTPException(status_code=404, detail="Departamento no encontrado")
+        return departamento_schema.dump(db_departamento)
+    
+    return await respuesta_condicional(request, TABLAS_DEPARTAMENTOS, construir)
 
 @router.post("/", response_model=dict, status_code=201)
 async def create_departamento(
@@ -39,10 +57,9 @@ async def create_departamento(
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """POST /api/departments - Requiere autenticación"""
-    try:
-        data = departamento_create_schema.load(departamento_data)
-    except ValidationError as err:
-        raise HTTPException(status_code=400, detail=err.messages)
+    data, errores = departamento_create_validator.validate(departamento_data)
+    if errores:
+        raise HTTPException(status_code=400, detail=errores)
     
     departamento = await crud.create_departamento(data)
     return departamento_schema.dump(departamento)
@@ -54,10 +71,9 @@ async def update_departamento(
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """PUT /api/departments/{id} - Requiere autenticación"""
-    try:
-        data = departamento_create_schema.load(departamento_data)
-    except ValidationError as err:
-        raise HTTPException(status_code=400, detail=err.messages)
+    data, errores = departamento_create_validator.validate(departamento_data)
+    if errores:
+        raise HTTPException(status_code=400, detail=errores)
     
     db_departamento = await crud.update_departamento(departamento_id=departamento_id, departamento=data)
     if db_departamento is None:
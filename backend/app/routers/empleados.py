@@ -1,39 +1,334 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from marshmallow import ValidationError
+import csv
+import io
+import json
+from datetime import date
+from fastapi import APIRouter, HTTPException, Depends, Body, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
+from tortoise.exceptions import IntegrityError
 
 from app import crud
-from app.schemas import EmpleadoSchema, EmpleadoCreateSchema, EmpleadoUpdateSchema
+from app.etag import TABLAS_EMPLEADOS, respuesta_condicional
+from app.importacion import importar_empleados_csv
+from app.metricas import medir_serializacion
+from app.serializers import (
+    CAMPOS_COMPLETOS, FilasEmpleado, SeleccionEmpleado, filas_empleado, json_response, seleccion_empleado,
+)
+from app.pagination import build_page, decode_cursor
+from app.schemas import EmpleadoSchema, empleado_create_validator, empleado_update_validator
 from app.auth import get_current_active_user
+from app.config import settings
 from app.models import User
 
 router = APIRouter()
 empleado_schema = EmpleadoSchema()
-empleados_schema = EmpleadoSchema(many=True)
-empleado_create_schema = EmpleadoCreateSchema()
-empleado_update_schema = EmpleadoUpdateSchema()
+
+def filtros_empleados(
+    departamento_id: Optional[int] = None,
+    Posicion_id: Optional[int] = None,
+    activo: Optional[bool] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    salario_min: Optional[float] = None,
+    salario_max: Optional[float] = None,
+    q: Optional[str] = None,
+) -> dict:
+    """Dependencia con los filtros comunes del listado y la exportación"""
+    return dict(
+        departamento_id=departamento_id,
+        Posicion_id=Posicion_id,
+        activo=activo,
+        fecha_desde=fecha_desde,
+        fecha_hasta=fecha_hasta,
+        salario_min=salario_min,
+        salario_max=salario_max,
+        q=q,
+    )
+
+def seleccion_campos(
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    expand: Optional[str] = Query(None, description="Relaciones a anidar: departamento, Posicion"),
+) -> Optional[SeleccionEmpleado]:
+    """Dependencia de fields= / expand=; None si no se pidió ninguno (respuesta completa)"""
+    try:
+        return seleccion_empleado(fields, expand)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+def _crud_seleccion(seleccion: Optional[SeleccionEmpleado]) -> dict:
+    """Argumentos de columnas y relaciones para crud según la selección"""
+    if seleccion is None:
+        return {}
+    return {"columnas": seleccion.columnas, "expandir": seleccion.expandir}
+
+def _plan_filas(seleccion: Optional[SeleccionEmpleado], campo_orden: str) -> FilasEmpleado:
+    """Lectura como tuplas (una sola consulta con JOIN a departamento y posición) según la selección"""
+    if seleccion is None:
+        return filas_empleado(CAMPOS_COMPLETOS, crud.EMPLEADO_RELACIONES, campo_orden)
+    return filas_empleado(seleccion.campos, seleccion.expandir, campo_orden)
 
 # Agregar dependencia de autenticación a todos los endpoints
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=Union[List[dict], dict])
 async def read_empleados(
+    request: Request,
     skip: int = 0, 
     limit: int = 100,
+    cursor: bool = False,
+    after: Optional[str] = None,
+    sort: str = "id",
+    filtros: dict = Depends(filtros_empleados),
+    seleccion: Optional[SeleccionEmpleado] = Depends(seleccion_campos),
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """
+    GET /api/employees - Requiere autenticación
+    Filtros: departamento_id, Posicion_id, activo, fecha_desde/fecha_hasta (contratación),
+    salario_min/salario_max y q (prefijo de nombre, apellido, email o código).
+    Orden: sort=<campo> o sort=-<campo> (descendente).
+    Campos: fields=id,nombre,... y expand=departamento,Posicion (sin expandir salen como *_id).
+    Con cursor=true o after=<token> responde {"items": [...], "next_cursor": ...}
+    """
+    campo = sort.lstrip("-")
+    if campo not in crud.EMPLEADO_ORDEN:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Orden inválido. Campos permitidos: {', '.join(crud.EMPLEADO_ORDEN)}"
+        )
+    
+    return await respuesta_condicional(
+        request, TABLAS_EMPLEADOS, lambda: _listar_empleados(skip, limit, cursor, after, sort, filtros, seleccion)
+    )
+
+async def _listar_empleados(
+    skip: int,
+    limit: int,
+    cursor: bool,
+    after: Optional[str],
+    sort: str,
+    filtros: dict,
+    seleccion: Optional[SeleccionEmpleado],
+):
+    campo = sort.lstrip("-")
+    plan = _plan_filas(seleccion, campo)
+    if cursor or after is not None:
+        after_id, after_value = None, None
+        if after:
+            posicion = decode_cursor(after)
+            if posicion.get("s", "id") != sort:
+                raise HTTPException(status_code=400, detail="El cursor no corresponde al orden solicitado")
+            after_id = posicion["id"]
+            if campo != "id":
+                try:
+                    after_value = crud.parse_valor_orden(campo, posicion["k"])
+                except (KeyError, TypeError, ValueError):
+                    raise HTTPException(status_code=400, detail="Cursor inválido")
+        
+        rows = await crud.get_empleados_filas(
+            plan.columnas,
+            limit=limit + 1,
+            after_id=after_id,
+            after_value=after_value,
+            sort=sort,
+            **filtros
+        )
+        filas, next_cursor = build_page(
+            rows,
+            limit,
+            lambda f: {"id": f[plan.indice_id], "s": sort, "k": f[plan.indice_orden]}
+        )
+        return json_response({"items": plan.serializer.dump_many(filas), "next_cursor": next_cursor})
+    
+    filas = await crud.get_empleados_filas(plan.columnas, skip=skip, limit=limit, sort=sort, **filtros)
+    return json_response(plan.serializer.dump_many(filas))
+
+@router.get("/search", response_model=dict)
+async def search_empleados(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Texto a buscar; cada palabra se toma como prefijo"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    seleccion: Optional[SeleccionEmpleado] = Depends(seleccion_campos),
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
-    """GET /api/employees - Requiere autenticación"""
-    empleados = await crud.get_empleados(skip=skip, limit=limit)
-    return empleados_schema.dump(empleados)
+    """
+    GET /api/employees/search?q= - Requiere autenticación
+    Busca en nombre, apellido, email, código, departamento y posición (deben coincidir
+    todas las palabras) y responde {"items": [...], "total": n} ordenado por relevancia.
+    Acepta fields= y expand= como el listado.
+    """
+    async def construir():
+        plan = _plan_filas(seleccion, "id")
+        filas, total = await crud.buscar_empleados(q, plan.columnas, skip=skip, limit=limit)
+        return json_response({"items": plan.serializer.dump_many(filas), "total": total})
+    
+    return await respuesta_condicional(request, TABLAS_EMPLEADOS, construir)
+
+async def _exportar_csv(filtros: dict):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(crud.EXPORT_COLUMNAS)
+    async for filas in crud.iter_empleados_export(**filtros):
+        with medir_serializacion():
+            writer.writerows(filas)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+async def _exportar_ndjson(filtros: dict):
+    async for filas in crud.iter_empleados_export(**filtros):
+        with medir_serializacion():
+            bloque = "".join(
+                json.dumps(dict(zip(crud.EXPORT_COLUMNAS, fila)), default=str, ensure_ascii=False) + "\n"
+                for fila in filas
+            )
+        yield bloque
+
+@router.get("/export")
+async def export_empleados(
+    request: Request,
+    formato: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    filtros: dict = Depends(filtros_empleados),
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """
+    GET /api/employees/export?format=csv|ndjson - Requiere autenticación
+    Transmite los empleados por bloques, sin cargar toda la tabla en memoria
+    """
+    async def construir():
+        if formato == "csv":
+            contenido, media_type = _exportar_csv(filtros), "text/csv; charset=utf-8"
+        else:
+            contenido, media_type = _exportar_ndjson(filtros), "application/x-ndjson"
+        
+        return StreamingResponse(
+            contenido,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="empleados.{formato}"'}
+        )
+    
+    return await respuesta_condicional(request, TABLAS_EMPLEADOS, construir)
+
+@router.post("/import", response_model=dict)
+async def import_empleados(
+    archivo: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """
+    POST /api/employees/import - Requiere autenticación
+    Importa un CSV (multipart, campo "archivo") con columnas codigo_empleado, nombre, apellido,
+    email, telefono, fecha_nacimiento, fecha_contratacion, salario, activo, departamento y posicion.
+    Crea o actualiza por codigo_empleado y reporta las filas rechazadas.
+    """
+    lineas = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+    try:
+        return await importar_empleados_csv(lineas)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="El archivo debe estar codificado en UTF-8")
+    except csv.Error as err:
+        raise HTTPException(status_code=400, detail=f"CSV inválido: {err}")
+    finally:
+        lineas.detach()
+
+def _validar_tamanio_lote(items: list) -> None:
+    if not items:
+        raise HTTPException(status_code=400, detail="El lote está vacío")
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El lote supera el máximo de {settings.BULK_MAX_ITEMS} elementos"
+        )
+
+@router.post("/bulk", response_model=dict)
+async def bulk_create_empleados(
+    empleados_data: List[dict],
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """
+    POST /api/employees/bulk - Requiere autenticación
+    Crea varios empleados en una transacción; las filas inválidas se reportan sin abortar el lote
+    """
+    _validar_tamanio_lote(empleados_data)
+    
+    filas = []
+    errores = []
+    for indice, item in enumerate(empleados_data):
+        data, errores_fila = empleado_create_validator.validate(item)
+        if errores_fila:
+            errores.append({"index": indice, "errores": errores_fila})
+        else:
+            filas.append((indice, data))
+    
+    try:
+        creados, errores_db = await crud.bulk_create_empleados(filas)
+    except IntegrityError as err:
+        raise HTTPException(status_code=409, detail=f"El lote no se pudo guardar: {err}")
+    
+    errores = sorted(errores + errores_db, key=lambda e: e["index"])
+    return {"creados": creados, "errores": errores}
+
+@router.put("/bulk", response_model=dict)
+async def bulk_update_empleados(
+    empleados_data: List[dict],
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """
+    PUT /api/employees/bulk - Requiere autenticación
+    Cada elemento debe incluir "id" y los campos a modificar; solo esos se escriben
+    (el validador de actualización no completa valores por defecto como activo)
+    """
+    _validar_tamanio_lote(empleados_data)
+    
+    filas = []
+    errores = []
+    for indice, item in enumerate(empleados_data):
+        item = dict(item)
+        empleado_id = item.pop("id", None)
+        if not isinstance(empleado_id, int) or isinstance(empleado_id, bool):
+            errores.append({"index": indice, "errores": {"id": ["Se requiere el id del empleado"]}})
+            continue
+        data, errores_fila = empleado_update_validator.validate(item)
+        if errores_fila:
+            errores.append({"index": indice, "errores": errores_fila})
+        else:
+            filas.append((indice, empleado_id, data))
+    
+    try:
+        actualizados, errores_db = await crud.bulk_update_empleados(filas)
+    except IntegrityError as err:
+        raise HTTPException(status_code=409, detail=f"El lote no se pudo guardar: {err}")
+    
+    errores = sorted(errores + errores_db, key=lambda e: e["index"])
+    return {"actualizados": actualizados, "errores": errores}
+
+@router.delete("/bulk", response_model=dict)
+async def bulk_delete_empleados(
+    ids: List[int] = Body(..., embed=True),
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """DELETE /api/employees/bulk - Requiere autenticación. Body: {"ids": [...]}"""
+    _validar_tamanio_lote(ids)
+    eliminados, no_encontrados = await crud.bulk_delete_empleados(ids)
+    return {"eliminados": eliminados, "no_encontrados": no_encontrados}
 
 @router.get("/{empleado_id}", response_model=dict)
 async def read_empleado(
     empleado_id: int,
+    request: Request,
+    seleccion: Optional[SeleccionEmpleado] = Depends(seleccion_campos),
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
-    """GET /api/employees/{id} - Requiere autenticación"""
-    db_empleado = await crud.get_empleado(empleado_id=empleado_id)
-    if db_empleado is None:
-        raise HTTPException(status_code=404, detail="Empleado no encontrado")
-    return empleado_schema.dump(db_empleado)
+    """GET /api/employees/{id} - Requiere autenticación. Acepta fields= y expand= como el listado"""
+    async def construir():
+        db_empleado = await crud.get_empleado(empleado_id=empleado_id, **_crud_seleccion(seleccion))
+        if db_empleado is None:
+            raise HTTPException(status_code=404, detail="Empleado no encontrado")
+        if seleccion is not None:
+            return seleccion.serializer.dump(db_empleado)
+        return empleado_schema.dump(db_empleado)
+    
+    return await respuesta_condicional(request, TABLAS_EMPLEADOS, construir)
 
 @router.post("/", response_model=dict, status_code=201)
 async def create_empleado(
@@ -41,10 +336,9 @@ async def create_empleado(
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """POST /api/employees - Requiere autenticación"""
-    try:
-        data = empleado_create_schema.load(empleado_data)
-    except ValidationError as err:
-        raise HTTPException(status_code=400, detail=err.messages)
+    data, errores = empleado_create_validator.validate(empleado_data)
+    if errores:
+        raise HTTPException(status_code=400, detail=errores)
     
     empleado = await crud.create_empleado(data)
     return empleado_schema.dump(empleado)
@@ -56,10 +350,9 @@ async def update_empleado(
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """PUT /api/employees/{id} - Requiere autenticación"""
-    try:
-        data = empleado_update_schema.load(empleado_data)
-    except ValidationError as err:
-        raise HTTPException(status_code=400, detail=err.messages)
+    data, errores = empleado_update_validator.validate(empleado_data)
+    if errores:
+        raise HTTPException(status_code=400, detail=errores)
     
     db_empleado = await crud.update_empleado(empleado_id=empleado_id, empleado=data)
     if db_empleado is None:
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Request
+
+from app import crud
+from app.auth import get_current_active_user
+from app.etag import TABLAS_EMPLEADOS, respuesta_condicional
+from app.models import User
+
+router = APIRouter()
+
+@router.get("/", response_model=dict)
+async def read_estadisticas(
+    request: Request,
+    current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
+):
+    """GET /api/stats - Requiere autenticación"""
+    return await respuesta_condicional(
+        request, TABLAS_EMPLEADOS, lambda: crud.get_estadisticas(request.state.marca_de_agua)
+    )
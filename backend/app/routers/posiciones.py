@@ -1,37 +1,55 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from marshmallow import ValidationError
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 
 from app import crud
-from app.schemas import PosicionSchema, PosicionCreateSchema
+from app.serializers import posicion_serializer, json_response
+from app.pagination import after_id, build_page
+from app.etag import TABLAS_POSICIONES, respuesta_condicional
+from app.schemas import PosicionSchema, posicion_create_validator
 from app.auth import get_current_active_user
 from app.models import User
 
 router = APIRouter()
 posicion_schema = PosicionSchema()
-posiciones_schema = PosicionSchema(many=True)
-posicion_create_schema = PosicionCreateSchema()
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=Union[List[dict], dict])
 async def read_posiciones(
+    request: Request,
     skip: int = 0, 
     limit: int = 100,
+    cursor: bool = False,
+    after: Optional[str] = None,
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
-    """GET /api/positions - Requiere autenticación"""
-    posiciones = await crud.get_posiciones(skip=skip, limit=limit)
-    return posiciones_schema.dump(posiciones)
+    """
+    GET /api/positions - Requiere autenticación
+    Con cursor=true o after=<token> responde {"items": [...], "next_cursor": ...}
+    """
+    async def construir():
+        if cursor or after is not None:
+            rows = await crud.get_posiciones(limit=limit + 1, after_id=after_id(after))
+            posiciones, next_cursor = build_page(rows, limit)
+            return json_response({"items": posicion_serializer.dump_many(posiciones), "next_cursor": next_cursor})
+        
+        posiciones = await crud.get_posiciones(skip=skip, limit=limit)
+        return json_response(posicion_serializer.dump_many(posiciones))
+    
+    return await respuesta_condicional(request, TABLAS_POSICIONES, construir)
 
 @router.get("/{posicion_id}", response_model=dict)
 async def read_posicion(
     posicion_id: int,
+    request: Request,
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """GET /api/positions/{id} - Requiere autenticación"""
-    db_posicion = await crud.get_posicion(posicion_id=posicion_id)
-    if db_posicion is None:
-        raise HTTPException(status_code=404, detail="Posición no encontrada")
-    return posicion_schema.dump(db_posicion)
+    async def construir():
+        db_posicion = await crud.get_posicion(posicion_id=posicion_id)
+        if db_posicion is None:
+            raise HTTPException(status_code=404, detail="Posición no encontrada")
+        return posicion_schema.dump(db_posicion)
+    
+    return await respuesta_condicional(request, TABLAS_POSICIONES, construir)
 
 @router.post("/", response_model=dict, status_code=201)
 async def create_posicion(
@@ -39,10 +57,9 @@ async def create_posicion(
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """POST /api/positions - Requiere autenticación"""
-    try:
-        data = posicion_create_schema.load(posicion_data)
-    except ValidationError as err:
-        raise HTTPException(status_code=400, detail=err.messages)
+    data, errores = posicion_create_validator.validate(posicion_data)
+    if errores:
+        raise HTTPException(status_code=400, detail=errores)
     
     posicion = await crud.create_posicion(data)
     return posicion_schema.dump(posicion)
@@ -54,10 +71,9 @@ async def update_posicion(
     current_user: User = Depends(get_current_active_user)  # 🔒 PROTEGIDO
 ):
     """PUT /api/positions/{id} - Requiere autenticación"""
-    try:
-        data = posicion_create_schema.load(posicion_data)
-    except ValidationError as err:
-        raise HTTPException(status_code=400, detail=err.messages)
+    data, errores = posicion_create_validator.validate(posicion_data)
+    if errores:
+        raise HTTPException(status_code=400, detail=errores)
     
     db_posicion = await crud.update_posicion(posicion_id=posicion_id, posicion=data)
     if db_posicion is None:
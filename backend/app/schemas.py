@@ -1,5 +1,13 @@
-from marshmallow import Schema, fields, validate
+import re
 from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, get_args, get_type_hints
+
+from marshmallow import Schema, fields, validate
+from pydantic import BeforeValidator, ConfigDict, Field, PlainValidator, StringConstraints, TypeAdapter, ValidationError
+from pydantic_core import PydanticCustomError
+from typing_extensions import Annotated, NotRequired, TypedDict
+
 
 class DepartamentoSchema(Schema):
     """Schema para validar datos de Departamento"""
@@ -9,12 +17,6 @@ class DepartamentoSchema(Schema):
     creado_en = fields.DateTime(dump_only=True)
     actualizado_en = fields.DateTime(dump_only=True)
 
-class DepartamentoCreateSchema(Schema):
-    """Schema para crear departamentos"""
-    nombre = fields.Str(required=True, validate=validate.Length(min=1))
-    descripcion = fields.Str(required=False, allow_none=True)
-
-
 class PosicionSchema(Schema):
     """Schema para validar datos de Posición"""
     id = fields.Int(dump_only=True)
@@ -25,13 +27,6 @@ class PosicionSchema(Schema):
     creado_en = fields.DateTime(dump_only=True)
     actualizado_en = fields.DateTime(dump_only=True)
 
-class PosicionCreateSchema(Schema):
-    """Schema para crear posiciones"""
-    titulo = fields.Str(required=True, validate=validate.Length(min=1))
-    descripcion = fields.Str(required=False, allow_none=True)
-    salario_min = fields.Decimal(required=False, allow_none=True)
-    salario_max = fields.Decimal(required=False, allow_none=True)
-
 
 # ===== SCHEMAS PARA EMPLEADO =====
 
@@ -60,29 +55,192 @@ class EmpleadoSchema(Schema):
     nombre_completo = fields.Str(dump_only=True)
 
 
-class EmpleadoCreateSchema(Schema):
-    """Schema para crear empleados - solo campos editables"""
-    codigo_empleado = fields.Str(required=True, validate=validate.Length(min=1))
-    nombre = fields.Str(required=True, validate=validate.Length(min=1, max=50))
-    apellido = fields.Str(required=True, validate=validate.Length(min=1, max=50))
-    email = fields.Email(required=True)
-    telefono = fields.Str(required=False, allow_none=True, validate=validate.Length(max=20))
-    fecha_nacimiento = fields.Date(required=False, allow_none=True)
-    fecha_contratacion = fields.Date(required=True)
-    salario = fields.Float(required=True, places=2, validate=validate.Range(min=0))
-    activo = fields.Bool(required=False, load_default=True)
-    departamento_id = fields.Int(required=True)
-    Posicion_id = fields.Int(required=True)
-
-class EmpleadoUpdateSchema(Schema):
-    codigo_empleado = fields.Str(required=False, validate=validate.Length(min=1))
-    nombre = fields.Str(required=False, validate=validate.Length(min=1, max=50))
-    apellido = fields.Str(required=False, validate=validate.Length(min=1, max=50))
-    email = fields.Email(required=False)
-    telefono = fields.Str(required=False, allow_none=True, validate=validate.Length(max=20))
-    fecha_nacimiento = fields.Date(required=False, allow_none=True)
-    fecha_contratacion = fields.Date(required=False)
-    salario = fields.Float(required=False, places=2, validate=validate.Range(min=0))
-    activo = fields.Bool(required=False, load_default=True)
-    departamento_id = fields.Int(required=False)
-    Posicion_id = fields.Int(required=False)
\ No newline at end of file
+# ===== MODELOS DE ENTRADA (pydantic-core) =====
+# Los cuerpos de POST/PUT se validan con validadores compilados una sola vez al importar.
+# Siguen las reglas de los schemas marshmallow que reemplazan (mismos tipos aceptados y
+# mismos mensajes) y devuelven un dict con solo los campos recibidos.
+
+def _rechazar_booleanos(tipo_error: str):
+    """Como marshmallow, true/false no cuentan como número (pydantic los acepta en modo lax)"""
+    def validar(valor):
+        if valor is True or valor is False:
+            raise PydanticCustomError(tipo_error, "Input should be a valid number")
+        return valor
+    return validar
+
+
+_FECHA_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})$")
+
+def _fecha_iso(valor: Any) -> date:
+    """Solo 'AAAA-MM-DD' (admite mes y día de un dígito), sin hora ni timestamps"""
+    try:
+        if len(valor) == 10 and valor[4] == valor[7] == "-" and valor.isascii():
+            return date.fromisoformat(valor)
+        return date(*map(int, _FECHA_ISO.match(valor).groups()))
+    except (TypeError, AttributeError, ValueError):
+        raise PydanticCustomError("date_type", "Input should be a valid date") from None
+
+
+# Misma validación que marshmallow.validate.Email. Los dominios no ASCII, que marshmallow
+# valida pasados a punycode, se aceptan con letras y dígitos Unicode en la etiqueta
+_ETIQUETA_UNICODE = r"[\p{L}\p{N}-]*[\p{L}\p{N}&&[^\x00-\x7f]][\p{L}\p{N}-]*"
+_EMAIL = (
+    r"^(?:[-!#$%&'*+/=?^`{}|~\w]+(?:\.[-!#$%&'*+/=?^`{}|~\w]+)*"
+    r'|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f!#-\[\]-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")'
+    r"@(?:localhost"
+    rf"|(?:(?:[A-Za-z0-9](?:[A-Za-z0-9-]{{0,61}}[A-Za-z0-9])?|{_ETIQUETA_UNICODE})\.)+(?:[A-Za-z0-9-]{{2,}}|{_ETIQUETA_UNICODE})"
+    r"|\[(?:25[0-5]|2[0-4]\d|[0-1]?\d?\d)(?:\.(?:25[0-5]|2[0-4]\d|[0-1]?\d?\d)){3}\])$"
+)
+
+Entero = Annotated[int, BeforeValidator(_rechazar_booleanos("int_type"))]
+Numero = Annotated[float, BeforeValidator(_rechazar_booleanos("float_type")), Field(allow_inf_nan=False)]
+Fecha = Annotated[date, PlainValidator(_fecha_iso)]
+Email = Annotated[str, StringConstraints(pattern=_EMAIL)]
+
+
+def Texto(minimo: Optional[int] = None, maximo: Optional[int] = None):
+    return Annotated[str, StringConstraints(min_length=minimo, max_length=maximo)]
+
+
+class DepartamentoCreate(TypedDict):
+    """Datos para crear o reemplazar un departamento"""
+    __pydantic_config__ = ConfigDict(extra="forbid")
+    nombre: Texto(minimo=1)
+    descripcion: NotRequired[Optional[str]]
+
+
+class PosicionCreate(TypedDict):
+    """Datos para crear o reemplazar una posición"""
+    __pydantic_config__ = ConfigDict(extra="forbid")
+    titulo: Texto(minimo=1)
+    descripcion: NotRequired[Optional[str]]
+    salario_min: NotRequired[Optional[Decimal]]
+    salario_max: NotRequired[Optional[Decimal]]
+
+
+class EmpleadoCreate(TypedDict):
+    """Datos para crear empleados - solo campos editables"""
+    __pydantic_config__ = ConfigDict(extra="forbid")
+    codigo_empleado: Texto(minimo=1)
+    nombre: Texto(minimo=1, maximo=50)
+    apellido: Texto(minimo=1, maximo=50)
+    email: Email
+    telefono: NotRequired[Optional[Texto(maximo=20)]]
+    fecha_nacimiento: NotRequired[Optional[Fecha]]
+    fecha_contratacion: Fecha
+    salario: Annotated[Numero, Field(ge=0)]
+    activo: NotRequired[bool]
+    departamento_id: Entero
+    Posicion_id: Entero
+
+
+class EmpleadoUpdate(TypedDict, total=False):
+    """Campos a modificar de un empleado (todos opcionales)"""
+    __pydantic_config__ = ConfigDict(extra="forbid")
+    codigo_empleado: Texto(minimo=1)
+    nombre: Texto(minimo=1, maximo=50)
+    apellido: Texto(minimo=1, maximo=50)
+    email: Email
+    telefono: Optional[Texto(maximo=20)]
+    fecha_nacimiento: Optional[Fecha]
+    fecha_contratacion: Fecha
+    salario: Annotated[Numero, Field(ge=0)]
+    activo: bool
+    departamento_id: Entero
+    Posicion_id: Entero
+
+
+# Tipo de error de pydantic -> mensaje de marshmallow
+_MENSAJES = {
+    "missing": "Missing data for required field.",
+    "extra_forbidden": "Unknown field.",
+    "string_type": "Not a valid string.",
+    "string_pattern_mismatch": "Not a valid email address.",  # el único patrón es el de Email
+    "int_type": "Not a valid integer.",
+    "int_parsing": "Not a valid integer.",
+    "int_from_float": "Not a valid integer.",
+    "float_type": "Not a valid number.",
+    "float_parsing": "Not a valid number.",
+    "decimal_type": "Not a valid number.",
+    "decimal_parsing": "Not a valid number.",
+    "finite_number": "Special numeric values (nan or infinity) are not permitted.",
+    "bool_type": "Not a valid boolean.",
+    "bool_parsing": "Not a valid boolean.",
+    "date_type": "Not a valid date.",
+    "greater_than_equal": "Must be greater than or equal to {ge}.",
+    "dict_type": "Invalid input type.",
+}
+
+
+def _restricciones_texto(anotacion) -> List[StringConstraints]:
+    restricciones = []
+    for argumento in get_args(anotacion):
+        if isinstance(argumento, StringConstraints):
+            restricciones.append(argumento)
+        else:
+            restricciones += _restricciones_texto(argumento)
+    return restricciones
+
+
+def _mensaje_longitud(minimo: Optional[int], maximo: Optional[int]) -> str:
+    """Mismos textos que marshmallow.validate.Length"""
+    if minimo is not None and maximo is not None:
+        return f"Length must be between {minimo} and {maximo}."
+    if minimo is not None:
+        return f"Shorter than minimum length {minimo}."
+    return f"Longer than maximum length {maximo}."
+
+
+class RequestValidator:
+    """
+    Valida el cuerpo de un request con un modelo de entrada. validate() devuelve
+    (datos, {}) o (None, errores) con la forma que tenían los errores de marshmallow:
+    {campo: [mensajes]} ("_schema" si el cuerpo no es un objeto).
+    """
+
+    def __init__(self, modelo: type, por_defecto: Optional[Dict[str, Any]] = None):
+        self.modelo = modelo
+        self._adapter = TypeAdapter(modelo)
+        self._por_defecto = por_defecto or {}
+        # Mensajes de longitud por campo: dependen de los dos límites, no solo del violado
+        self._longitudes = {
+            campo: _mensaje_longitud(restriccion.min_length, restriccion.max_length)
+            for campo, anotacion in get_type_hints(modelo, include_extras=True).items()
+            for restriccion in _restricciones_texto(anotacion)
+            if restriccion.min_length is not None or restriccion.max_length is not None
+        }
+
+    def validate(self, datos: Any) -> Tuple[Optional[dict], Dict[str, List[str]]]:
+        try:
+            validados = self._adapter.validate_python(datos)
+        except ValidationError as err:
+            return None, self._errores(err)
+        for campo, valor in self._por_defecto.items():
+            validados.setdefault(campo, valor)
+        return validados, {}
+
+    def _errores(self, err: ValidationError) -> Dict[str, List[str]]:
+        errores: Dict[str, List[str]] = {}
+        for error in err.errors(include_url=False):
+            campo = str(error["loc"][0]) if error["loc"] else "_schema"
+            errores.setdefault(campo, []).append(self._mensaje(campo, error))
+        return errores
+
+    def _mensaje(self, campo: str, error: dict) -> str:
+        tipo = error["type"]
+        if tipo in ("string_too_short", "string_too_long"):
+            return self._longitudes[campo]
+        if error.get("input", ...) is None and tipo != "missing":
+            return "Field may not be null."
+        mensaje = _MENSAJES.get(tipo)
+        if mensaje is None:
+            return error["msg"]
+        return mensaje.format(**error.get("ctx", {}))
+
+
+departamento_create_validator = RequestValidator(DepartamentoCreate)
+posicion_create_validator = RequestValidator(PosicionCreate)
+# Un empleado nuevo es activo si no se indica. Al actualizar solo se escriben los campos
+# enviados: completar activo reactivaría a los empleados dados de baja
+empleado_create_validator = RequestValidator(EmpleadoCreate, por_defecto={"activo": True})
+empleado_update_validator = RequestValidator(EmpleadoUpdate)
@@ -0,0 +1,272 @@
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+import pydantic_core
+from fastapi import Response
+from marshmallow import Schema, fields
+
+from app.metricas import medir_serializacion
+from app.schemas import DepartamentoSchema, EmpleadoSchema, PosicionSchema
+
+
+def _isoformat(value) -> str:
+    return value.isoformat()
+
+
+def _sin_valores(obj: Any) -> tuple:
+    return ()
+
+
+def _quantizer(places: Decimal, rounding: Optional[str]) -> Callable[[Decimal], Decimal]:
+    # marshmallow guarda places ya convertido a exponente (p. ej. Decimal("0.01"))
+    return lambda value: Decimal(value).quantize(places, rounding=rounding)
+
+
+class Serializer:
+    """
+    Serializador con tabla de campos precalculada a partir de un schema de marshmallow.
+    Produce la misma salida que Schema.dump pero leyendo todos los atributos con un
+    único attrgetter y aplicando conversiones solo a los campos que las necesitan.
+    Con getter=itemgetter lee de tuplas (posiciones o slices) en lugar de atributos.
+    """
+
+    def __init__(self, campos: List[Tuple[str, Any, Optional[Callable[[Any], Any]]]], getter=attrgetter):
+        """campos: tuplas (clave de salida, atributo del objeto o posición, conversión o None)"""
+        self.campos = tuple(campos)
+        self.claves = tuple(clave for clave, _, _ in campos)
+        atributos = tuple(atributo for _, atributo, _ in campos)
+        # attrgetter()/itemgetter() exigen al menos un argumento
+        self._getter = getter(*atributos) if atributos else _sin_valores
+        self._conversiones = tuple(
+            (indice, conversion)
+            for indice, (_, _, conversion) in enumerate(campos)
+            if conversion is not None
+        )
+
+    @classmethod
+    def from_schema(cls, schema_class: Type[Schema]) -> "Serializer":
+        campos = []
+        for nombre, campo in schema_class._declared_fields.items():
+            if campo.load_only:
+                continue
+            campos.append((campo.data_key or nombre, campo.attribute or nombre, cls._conversion(campo)))
+        return cls(campos)
+
+    @staticmethod
+    def _conversion(campo: fields.Field) -> Optional[Callable[[Any], Any]]:
+        if isinstance(campo, fields.Nested):
+            nested = campo.nested if isinstance(campo.nested, type) else type(campo.nested)
+            return Serializer.from_schema(nested).dump
+        if isinstance(campo, (fields.Date, fields.DateTime)):
+            return _isoformat
+        if isinstance(campo, fields.Decimal) and campo.places is not None:
+            return _quantizer(campo.places, campo.rounding)
+        return None
+
+    def para_filas(self, posiciones: Sequence[Union[int, slice]]) -> "Serializer":
+        """Mismo serializador leyendo cada campo de la posición indicada de una tupla"""
+        return Serializer(
+            [(clave, posicion, conversion) for (clave, _, conversion), posicion in zip(self.campos, posiciones)],
+            getter=itemgetter,
+        )
+
+    def dump(self, obj: Any) -> dict:
+        valores = self._getter(obj)
+        if len(self.claves) == 1:
+            valores = (valores,)
+        if self._conversiones:
+            valores = list(valores)
+            for indice, conversion in self._conversiones:
+                valor = valores[indice]
+                if valor is not None:
+                    valores[indice] = conversion(valor)
+        return dict(zip(self.claves, valores))
+
+    def dump_many(self, objs: Iterable[Any]) -> List[dict]:
+        dump = self.dump
+        with medir_serializacion():
+            return [dump(obj) for obj in objs]
+
+
+def json_response(data: Any, status_code: int = 200) -> Response:
+    """Codifica directamente a bytes JSON (pydantic-core) sin revalidar contra response_model"""
+    with medir_serializacion():
+        content = pydantic_core.to_json(data)
+    return Response(
+        content=content,
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+departamento_serializer = Serializer.from_schema(DepartamentoSchema)
+posicion_serializer = Serializer.from_schema(PosicionSchema)
+empleado_serializer = Serializer.from_schema(EmpleadoSchema)
+
+
+# ===== CAMPOS PARCIALES DE EMPLEADO (fields= / expand=) =====
+
+# Relación anidada -> columna con el id y serializador del objeto
+RELACIONES_EMPLEADO = {
+    "departamento": ("departamento_id", departamento_serializer),
+    "Posicion": ("Posicion_id", posicion_serializer),
+}
+CAMPOS_EMPLEADO = tuple(
+    nombre for nombre in EmpleadoSchema._declared_fields if nombre not in RELACIONES_EMPLEADO
+) + tuple(columna for columna, _ in RELACIONES_EMPLEADO.values())
+
+# Campos calculados y las columnas que necesitan
+_COLUMNAS_CALCULADAS = {"nombre_completo": ("nombre", "apellido")}
+
+
+class SeleccionEmpleado(NamedTuple):
+    """Columnas a leer, relaciones a hidratar y serializador para una combinación fields/expand"""
+    campos: Tuple[str, ...]
+    columnas: Tuple[str, ...]
+    expandir: Tuple[str, ...]
+    serializer: Serializer
+
+
+def _lista(valor: str) -> List[str]:
+    return [parte.strip() for parte in valor.split(",") if parte.strip()]
+
+
+def seleccion_empleado(fields_param: Optional[str], expand_param: Optional[str]) -> Optional[SeleccionEmpleado]:
+    """
+    Interpreta fields= y expand= (listas separadas por comas). Sin ninguno de los dos
+    devuelve None (respuesta completa). Las relaciones no expandidas salen como su id
+    (departamento_id, Posicion_id). Lanza ValueError con un mensaje si hay nombres inválidos
+    o si fields= no trae ningún nombre.
+    """
+    if fields_param is None and expand_param is None:
+        return None
+
+    relaciones = {nombre.lower(): nombre for nombre in RELACIONES_EMPLEADO}
+    invalidos = []
+    expandir = []
+    for nombre in _lista(expand_param or ""):
+        if nombre.lower() in relaciones:
+            expandir.append(relaciones[nombre.lower()])
+        else:
+            invalidos.append(nombre)
+    if invalidos:
+        raise ValueError(
+            f"Relaciones inválidas: {', '.join(invalidos)}. Permitidas: {', '.join(RELACIONES_EMPLEADO)}"
+        )
+
+    if fields_param is None:
+        campos = [
+            campo for campo in CAMPOS_EMPLEADO
+            if not any(campo == columna and relacion in expandir for relacion, (columna, _) in RELACIONES_EMPLEADO.items())
+        ]
+    else:
+        if not _lista(fields_param):
+            raise ValueError("fields no puede estar vacío")
+        campos = []
+        for nombre in _lista(fields_param):
+            if nombre.lower() in relaciones:
+                expandir.append(relaciones[nombre.lower()])
+            elif nombre in CAMPOS_EMPLEADO:
+                campos.append(nombre)
+            else:
+                invalidos.append(nombre)
+        if invalidos:
+            raise ValueError(
+                f"Campos inválidos: {', '.join(invalidos)}. "
+                f"Permitidos: {', '.join(CAMPOS_EMPLEADO + tuple(RELACIONES_EMPLEADO))}"
+            )
+
+    # Orden estable (el del schema) para que el serializador se reutilice del cache
+    expandir = tuple(relacion for relacion in RELACIONES_EMPLEADO if relacion in expandir)
+    campos = tuple(campo for campo in CAMPOS_EMPLEADO if campo in campos)
+
+    columnas = {"id"}
+    for campo in campos:
+        columnas.update(_COLUMNAS_CALCULADAS.get(campo, (campo,)))
+    for relacion in expandir:
+        columnas.add(RELACIONES_EMPLEADO[relacion][0])
+    return SeleccionEmpleado(campos, tuple(sorted(columnas)), expandir, _empleado_serializer_parcial(campos, expandir))
+
+
+@lru_cache(maxsize=256)
+def _empleado_serializer_parcial(campos: Tuple[str, ...], expandir: Tuple[str, ...]) -> Serializer:
+    declarados = EmpleadoSchema._declared_fields
+    tabla = []
+    for nombre, campo in declarados.items():
+        if nombre in campos:
+            tabla.append((nombre, nombre, Serializer._conversion(campo)))
+        elif nombre in expandir:
+            tabla.append((nombre, nombre, RELACIONES_EMPLEADO[nombre][1].dump))
+    for columna, _ in RELACIONES_EMPLEADO.values():
+        if columna in campos:
+            tabla.append((columna, columna, None))
+    return Serializer(tabla)
+
+
+# ===== LISTADO DE EMPLEADOS COMO TUPLAS (un solo SELECT con JOIN) =====
+
+# Campos de la respuesta completa (las dos relaciones van expandidas)
+CAMPOS_COMPLETOS = tuple(nombre for nombre in EmpleadoSchema._declared_fields if nombre not in RELACIONES_EMPLEADO)
+
+
+class FilasEmpleado(NamedTuple):
+    """Columnas de values_list (con JOIN a las relaciones), serializador de las tuplas y posiciones de id y orden"""
+    columnas: Tuple[str, ...]
+    serializer: Serializer
+    indice_id: int
+    indice_orden: int
+
+
+def _anidado(dump: Callable[[tuple], dict]) -> Callable[[tuple], Optional[dict]]:
+    # Con LEFT JOIN una relación inexistente llega como columnas NULL
+    return lambda fila: dump(fila) if fila[0] is not None else None
+
+
+# Cálculo de cada campo calculado a partir del slice con sus columnas
+_CALCULOS_FILAS = {"nombre_completo": lambda partes: f"{partes[0]} {partes[1]}"}
+
+
+@lru_cache(maxsize=256)
+def filas_empleado(campos: Tuple[str, ...], expandir: Tuple[str, ...], campo_orden: str) -> FilasEmpleado:
+    """
+    Plan para leer empleados con values_list: departamento y posición se traen en la
+    misma consulta (departamento__nombre, ...) y el serializador arma la misma salida
+    que el de instancias, sin crear objetos del ORM.
+    """
+    columnas: List[str] = []
+
+    def posicion(columna: str) -> int:
+        if columna not in columnas:
+            columnas.append(columna)
+        return columnas.index(columna)
+
+    def bloque(nuevas: Sequence[str]) -> slice:
+        inicio = len(columnas)
+        columnas.extend(nuevas)
+        return slice(inicio, len(columnas))
+
+    # Los campos calculados leen un slice de columnas contiguas: van primero
+    calculados = {
+        nombre: bloque(_COLUMNAS_CALCULADAS[nombre]) for nombre in campos if nombre in _COLUMNAS_CALCULADAS
+    }
+
+    tabla = []
+    for nombre, campo in EmpleadoSchema._declared_fields.items():
+        if nombre in expandir:
+            serializer = RELACIONES_EMPLEADO[nombre][1]
+            atributos = [atributo for _, atributo, _ in serializer.campos]
+            rango = bloque([f"{nombre}__{atributo}" for atributo in atributos])
+            tabla.append((nombre, rango, _anidado(serializer.para_filas(range(len(atributos))).dump)))
+        elif nombre in calculados:
+            tabla.append((nombre, calculados[nombre], _CALCULOS_FILAS[nombre]))
+        elif nombre in campos:
+            tabla.append((nombre, posicion(nombre), Serializer._conversion(campo)))
+    for columna, _ in RELACIONES_EMPLEADO.values():
+        if columna in campos:
+            tabla.append((columna, posicion(columna), None))
+
+    indice_id = posicion("id")
+    indice_orden = posicion(campo_orden)
+    return FilasEmpleado(tuple(columnas), Serializer(tabla, getter=itemgetter), indice_id, indice_orden)
@@ -0,0 +1,218 @@
+"""
+Prueba de carga de la API completa, en proceso, sobre una base SQLite sembrada.
+Corre cada escenario durante --segundos con --concurrencia tareas y reporta, por
+operación, requests/s y latencias p50/p95/p99. Los resultados se pueden guardar como
+baseline y comparar contra una corrida anterior para detectar regresiones.
+
+Escenarios: login, listado, detalle, crear, actualizar, mixto, eliminar.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_carga --empleados 1000 --guardar baselines/local.json
+    python -m benchmarks.bench_carga --empleados 1000 --comparar baselines/local.json
+    python -m benchmarks.bench_carga --base /tmp/empleados-100k.db --empleados 100000 --escenarios mixto
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.cliente import ClienteASGI, percentil, usar_base_temporal
+
+# eliminar va al final porque reduce la tabla para los escenarios siguientes
+ESCENARIOS = ("login", "listado", "detalle", "crear", "actualizar", "mixto", "eliminar")
+
+# Operaciones del escenario mixto y su peso
+MEZCLA = {"listado": 60, "detalle": 25, "actualizar": 8, "crear": 5, "eliminar": 2}
+
+# Status esperados por operación; con borrados concurrentes un 404 es legítimo
+ESPERADOS = {
+    "login": {200},
+    "listado": {200},
+    "detalle": {200, 404},
+    "crear": {201},
+    "actualizar": {200, 404},
+    "eliminar": {200, 404},
+}
+
+# Con menos muestras la p95 es puro ruido y no se compara contra la baseline
+MIN_MUESTRAS = 30
+
+
+class Carga:
+    """Estado compartido por las tareas de un escenario: ids vivos y latencias por operación"""
+
+    def __init__(self, cliente: ClienteASGI, ids: List[int], total_empleados: int):
+        self.cliente = cliente
+        self.ids = ids
+        self.secuencia = total_empleados
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.errores: Dict[str, int] = defaultdict(int)
+
+    def _id_al_azar(self) -> int:
+        return random.choice(self.ids) if self.ids else 1
+
+    async def ejecutar(self, operacion: str) -> None:
+        cliente = self.cliente
+        inicio = time.perf_counter()
+        if operacion == "login":
+            status, _, _ = await cliente.request("POST", "/api/auth/login", form={
+                "username": "bench", "password": "bench123",
+            })
+        elif operacion == "listado":
+            status, _, _ = await cliente.request("GET", "/api/employees/", params={
+                "limit": 50, "skip": random.randrange(0, max(len(self.ids) - 50, 1)),
+            })
+        elif operacion == "detalle":
+            status, _, _ = await cliente.request("GET", f"/api/employees/{self._id_al_azar()}")
+        elif operacion == "crear":
+            self.secuencia += 1
+            n = self.secuencia
+            status, _, body = await cliente.request("POST", "/api/employees/", json_body={
+                "codigo_empleado": f"CARGA{n:08d}", "nombre": f"Nombre{n % 500}", "apellido": f"Apellido{n % 997}",
+                "email": f"carga{n}@example.com", "fecha_contratacion": "2024-01-15", "salario": 1000 + n % 9000,
+                "departamento_id": 1, "Posicion_id": 1,
+            })
+            if status == 201:
+                self.ids.append(json.loads(body)["id"])
+        elif operacion == "actualizar":
+            status, _, _ = await cliente.request(
+                "PUT", f"/api/employees/{self._id_al_azar()}", json_body={"salario": random.randint(1000, 9000)}
+            )
+        elif operacion == "eliminar":
+            if not self.ids:
+                return
+            # Saca un id al azar en O(1): lo intercambia con el último
+            indice = random.randrange(len(self.ids))
+            self.ids[indice], self.ids[-1] = self.ids[-1], self.ids[indice]
+            status, _, _ = await cliente.request("DELETE", f"/api/employees/{self.ids.pop()}")
+        else:
+            raise ValueError(f"Operación desconocida: {operacion}")
+
+        self.latencias[operacion].append(time.perf_counter() - inicio)
+        if status not in ESPERADOS[operacion]:
+            self.errores[operacion] += 1
+
+
+async def correr_escenario(carga: Carga, escenario: str, args) -> Dict[str, dict]:
+    carga.latencias.clear()
+    carga.errores.clear()
+    operaciones, pesos = (list(MEZCLA), list(MEZCLA.values())) if escenario == "mixto" else ([escenario], [1])
+    fin = time.perf_counter() + args.segundos
+
+    async def tarea():
+        while time.perf_counter() < fin:
+            await carga.ejecutar(random.choices(operaciones, pesos)[0])
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(tarea() for _ in range(args.concurrencia)))
+    duracion = time.perf_counter() - inicio
+
+    resultados = {}
+    for operacion, latencias in sorted(carga.latencias.items()):
+        resultados[f"{escenario}/{operacion}"] = {
+            "n": len(latencias),
+            "errores": carga.errores[operacion],
+            "rps": len(latencias) / duracion,
+            "p50_ms": percentil(latencias, 0.50) * 1000,
+            "p95_ms": percentil(latencias, 0.95) * 1000,
+            "p99_ms": percentil(latencias, 0.99) * 1000,
+        }
+    return resultados
+
+
+def comparar(actual: Dict[str, dict], baseline: Dict[str, dict], tolerancia: float) -> List[str]:
+    """Claves cuya p95 empeoró o cuyo throughput cayó más que la tolerancia"""
+    regresiones = []
+    for clave, base in baseline.items():
+        r = actual.get(clave)
+        if r is None or min(r["n"], base["n"]) < MIN_MUESTRAS:
+            continue
+        if r["p95_ms"] > base["p95_ms"] * (1 + tolerancia):
+            regresiones.append(f"{clave}: p95 {base['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms")
+        if r["rps"] < base["rps"] * (1 - tolerancia):
+            regresiones.append(f"{clave}: req/s {base['rps']:.1f} -> {r['rps']:.1f}")
+    return regresiones
+
+
+async def main(args) -> int:
+    from app.config import settings
+
+    random.seed(args.semilla)
+    settings.LOG_LEVEL = "ERROR"  # que los logs de la app no se mezclen con el reporte
+    if args.base:
+        settings.DATABASE_URL = f"sqlite://{args.base}"
+    else:
+        usar_base_temporal("carga.db")
+
+    from app.generacion import generar_empleados
+    from app.main import app
+    from app.models import Empleado
+
+    cliente = ClienteASGI(app)
+    await cliente.iniciar()
+    try:
+        if not await Empleado.exists():
+            reporte = await generar_empleados(args.empleados, semilla=args.semilla)
+            print(f"Sembrados {reporte['creados']} empleados en {reporte['segundos']}s")
+        await cliente.login()
+        ids = list(await Empleado.all().values_list("id", flat=True))
+        carga = Carga(cliente, ids, total_empleados=max(ids, default=0))
+
+        print(f"{len(ids)} empleados, concurrencia {args.concurrencia}, {args.segundos}s por escenario\n")
+        print(f"{'Operación':24} {'n':>7} {'err':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        resultados: Dict[str, dict] = {}
+        for escenario in args.escenarios:
+            for clave, r in (await correr_escenario(carga, escenario, args)).items():
+                resultados[clave] = r
+                print(
+                    f"{clave:24} {r['n']:>7} {r['errores']:>5} {r['rps']:>9.1f} "
+                    f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+                )
+    finally:
+        await cliente.cerrar()
+
+    parametros = {
+        "empleados": len(ids),
+        "concurrencia": args.concurrencia,
+        "segundos": args.segundos,
+        "escenarios": args.escenarios,
+    }
+    if args.guardar:
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump({"parametros": parametros, "resultados": resultados}, archivo, indent=2)
+        print(f"\nBaseline guardada en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            baseline = json.load(archivo)
+        if baseline["parametros"] != parametros:
+            print(f"\n⚠️  La baseline se tomó con otros parámetros: {baseline['parametros']}")
+        regresiones = comparar(resultados, baseline["resultados"], args.tolerancia)
+        if regresiones:
+            print(f"\n❌ Regresiones respecto de {args.comparar} (tolerancia {args.tolerancia:.0%}):")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print(f"\n✅ Sin regresiones respecto de {args.comparar}")
+
+    return 1 if any(r["errores"] for r in resultados.values()) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--empleados", type=int, default=1000, help="Empleados a sembrar si la base está vacía")
+    parser.add_argument("--base", help="Archivo SQLite a usar (se siembra solo si está vacío); por defecto uno temporal")
+    parser.add_argument("--escenarios", nargs="+", choices=ESCENARIOS, default=list(ESCENARIOS))
+    parser.add_argument("--concurrencia", type=int, default=10, help="Tareas concurrentes por escenario")
+    parser.add_argument("--segundos", type=float, default=5.0, help="Duración de cada escenario")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador aleatorio")
+    parser.add_argument("--guardar", help="Guardar los resultados como baseline (JSON)")
+    parser.add_argument("--comparar", help="Baseline (JSON) contra la cual detectar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento aceptado (0.2 = 20%%)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
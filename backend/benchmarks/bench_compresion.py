@@ -0,0 +1,61 @@
+"""
+Bytes en la red y costo de CPU por request del listado de empleados con y sin compresión
+(gzip y, si están instalados, br / zstd), atravesando la app completa con CompressionMiddleware.
+
+Uso (desde backend/):  python -m benchmarks.bench_compresion --empleados 2000 --repeticiones 30
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.cliente import ClienteASGI, sembrar_empleados, usar_base_temporal
+
+
+async def medir(cliente: ClienteASGI, params: dict, encoding: str, repeticiones: int) -> dict:
+    headers = {"Accept-Encoding": encoding}
+    bytes_red = 0
+    cpu_inicio, reloj_inicio = time.process_time(), time.perf_counter()
+    for _ in range(repeticiones):
+        status, cabeceras, body = await cliente.request("GET", "/api/employees/", params=params, headers=headers)
+        assert status == 200, status
+        bytes_red = len(body)
+        recibido = cabeceras.get("content-encoding", "identity")
+    return {
+        "encoding": recibido,
+        "bytes": bytes_red,
+        "cpu_ms": (time.process_time() - cpu_inicio) * 1000 / repeticiones,
+        "ms": (time.perf_counter() - reloj_inicio) * 1000 / repeticiones,
+    }
+
+
+async def main(args) -> None:
+    usar_base_temporal()
+    from app.compresion import codecs_disponibles
+    from app.main import app
+
+    cliente = ClienteASGI(app)
+    await cliente.iniciar()
+    try:
+        await sembrar_empleados(args.empleados)
+        await cliente.login()
+
+        encodings = ["identity"] + [e for e in ("gzip", "br", "zstd") if e in codecs_disponibles()]
+        print(f"Encodings disponibles: {', '.join(encodings)}\n")
+        print(f"{'limit':>6} {'encoding':>9} {'bytes':>10} {'ratio':>7} {'CPU ms/req':>11} {'ms/req':>8}")
+        for limit in args.limits:
+            base = None
+            for encoding in encodings:
+                r = await medir(cliente, {"limit": limit}, encoding, args.repeticiones)
+                base = base or r
+                ratio = base["bytes"] / r["bytes"] if r["bytes"] else 0
+                print(f"{limit:>6} {r['encoding']:>9} {r['bytes']:>10} {ratio:>6.1f}x {r['cpu_ms']:>11.2f} {r['ms']:>8.2f}")
+    finally:
+        await cliente.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--empleados", type=int, default=2000, help="Empleados a sembrar")
+    parser.add_argument("--repeticiones", type=int, default=30, help="Requests por combinación")
+    parser.add_argument("--limits", type=int, nargs="+", default=[20, 100, 500], help="Tamaños de página")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""
+Throughput de lecturas (listado y detalle de empleados) mientras un escritor actualiza
+empleados sin pausa. Compara el perfil SQLite por defecto de la app (WAL + PRAGMAs +
+conexiones de solo lectura) con uno sin ajustes (journal DELETE, synchronous FULL y
+una única conexión compartida).
+
+Uso (desde backend/):  python -m benchmarks.bench_lecturas --empleados 5000 --segundos 5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from benchmarks.cliente import ClienteASGI, percentil, sembrar_empleados, usar_base_temporal
+
+PERFILES = {
+    "sin ajustes": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_MMAP_SIZE": 0,
+        "SQLITE_CACHE_SIZE": -2000,
+        "SQLITE_READ_CONNECTIONS": 0,
+    },
+    "optimizado": {},  # valores de app.config
+}
+
+
+async def correr_perfil(nombre: str, ajustes: dict, args) -> dict:
+    from app.config import settings
+
+    originales = {clave: getattr(settings, clave) for clave in ajustes}
+    for clave, valor in ajustes.items():
+        setattr(settings, clave, valor)
+    usar_base_temporal(f"{nombre.replace(' ', '_')}.db")
+
+    from app.main import app
+
+    cliente = ClienteASGI(app)
+    await cliente.iniciar()
+    try:
+        await sembrar_empleados(args.empleados)
+        await cliente.login()
+
+        latencias, escrituras = [], 0
+        fin = time.perf_counter() + args.segundos
+
+        async def lector():
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                if random.random() < 0.5:
+                    status, _, _ = await cliente.request("GET", "/api/employees/", params={
+                        "limit": 50, "skip": random.randrange(0, max(args.empleados - 50, 1)),
+                    })
+                else:
+                    status, _, _ = await cliente.request("GET", f"/api/employees/{random.randint(1, args.empleados)}")
+                assert status == 200, status
+                latencias.append(time.perf_counter() - inicio)
+
+        async def escritor():
+            nonlocal escrituras
+            while time.perf_counter() < fin:
+                status, _, _ = await cliente.request(
+                    "PUT", f"/api/employees/{random.randint(1, args.empleados)}",
+                    json_body={"salario": random.randint(1000, 9000)},
+                )
+                assert status == 200, status
+                escrituras += 1
+
+        await asyncio.gather(escritor(), *(lector() for _ in range(args.lectores)))
+    finally:
+        await cliente.cerrar()
+        for clave, valor in originales.items():
+            setattr(settings, clave, valor)
+
+    return {
+        "lecturas_s": len(latencias) / args.segundos,
+        "escrituras_s": escrituras / args.segundos,
+        "p50_ms": statistics.median(latencias) * 1000 if latencias else 0.0,
+        "p95_ms": percentil(latencias, 0.95) * 1000,
+    }
+
+
+async def main(args) -> None:
+    print(f"{args.empleados} empleados, {args.lectores} lectores concurrentes + 1 escritor, {args.segundos}s por perfil\n")
+    print(f"{'Perfil':12} {'Lecturas/s':>11} {'Escrituras/s':>13} {'p50 ms':>8} {'p95 ms':>8}")
+    for nombre, ajustes in PERFILES.items():
+        r = await correr_perfil(nombre, ajustes, args)
+        print(f"{nombre:12} {r['lecturas_s']:>11.1f} {r['escrituras_s']:>13.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--empleados", type=int, default=5000, help="Empleados a sembrar")
+    parser.add_argument("--segundos", type=float, default=5.0, help="Duración de cada perfil")
+    parser.add_argument("--lectores", type=int, default=8, help="Tareas de lectura concurrentes")
+    asyncio.run(main(parser.parse_args()))
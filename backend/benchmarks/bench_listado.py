@@ -0,0 +1,81 @@
+"""
+Compara los caminos para leer y serializar páginas grandes del listado de empleados:
+  - prefetch_related: instancias + una consulta extra por relación (camino original)
+  - cache de referencias: instancias + departamento/posición del cache en memoria
+  - JOIN a tuplas: un solo SELECT con LEFT JOIN leído con values_list, sin instancias
+Verifica que los tres produzcan el mismo JSON y mide consulta + serialización.
+
+Uso (desde backend/):  python -m benchmarks.bench_listado --empleados 20000 --limit 10000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from tortoise import Tortoise
+
+from benchmarks.cliente import ContadorConsultas, usar_base_temporal
+
+
+async def medir(funcion, repeticiones: int):
+    """Mejor tiempo de repeticiones corridas, cantidad de consultas SQL y el último resultado"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        with ContadorConsultas() as contador:
+            inicio = time.perf_counter()
+            cuerpo = await funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, len(contador.consultas), cuerpo
+
+
+async def main(args) -> None:
+    usar_base_temporal("listado.db")
+    from app import crud
+    from app.database import close_db, get_tortoise_config
+    from app.generacion import generar_empleados
+    from app.models import Empleado
+    from app.serializers import CAMPOS_COMPLETOS, empleado_serializer, filas_empleado, json_response
+
+    await Tortoise.init(config=get_tortoise_config())
+    await Tortoise.generate_schemas()
+    try:
+        await generar_empleados(args.empleados, semilla=1)
+        plan = filas_empleado(CAMPOS_COMPLETOS, crud.EMPLEADO_RELACIONES, "id")
+
+        async def prefetch():
+            empleados = await Empleado.all().order_by("id").limit(args.limit).prefetch_related("departamento", "Posicion")
+            return json_response(empleado_serializer.dump_many(empleados)).body
+
+        async def cache_referencias():
+            empleados = await crud.get_empleados(limit=args.limit)
+            return json_response(empleado_serializer.dump_many(empleados)).body
+
+        async def join_tuplas():
+            filas = await crud.get_empleados_filas(plan.columnas, limit=args.limit)
+            return json_response(plan.serializer.dump_many(filas)).body
+
+        caminos = [("prefetch_related", prefetch), ("cache de referencias", cache_referencias), ("JOIN a tuplas", join_tuplas)]
+        resultados = [(nombre, *await medir(funcion, args.repeticiones)) for nombre, funcion in caminos]
+
+        # Los tres caminos deben producir el mismo JSON
+        esperado = json.loads(resultados[0][3])
+        for nombre, _, _, cuerpo in resultados[1:]:
+            assert json.loads(cuerpo) == esperado, f"Salida distinta en {nombre}"
+
+        print(f"Empleados: {args.empleados}, página de {args.limit} (mejor de {args.repeticiones})")
+        base = resultados[0][1]
+        for nombre, segundos, consultas, _ in resultados:
+            print(
+                f"  {nombre:22} {segundos * 1000:8.1f} ms  {args.limit / segundos:9.0f} filas/s  "
+                f"{consultas} SQL  x{base / segundos:.1f}"
+            )
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--empleados", type=int, default=20000, help="Empleados a generar en la base temporal")
+    parser.add_argument("--limit", type=int, default=10000, help="Tamaño de la página a leer")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+"""
+Compara la serialización de listados: marshmallow + response_model (camino anterior)
+contra la tabla de campos precalculada + pydantic-core (app.serializers).
+
+Uso (desde backend/):  python -m benchmarks.bench_serializacion --filas 10000
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models import Departamento, Empleado, Posicion
+from app.schemas import EmpleadoSchema
+from app.serializers import empleado_serializer, json_response
+
+
+def generar_empleados(cantidad: int) -> List[Empleado]:
+    """Crea instancias en memoria (sin base de datos) con relaciones ya cargadas"""
+    ahora = datetime.now(timezone.utc)
+    departamentos = [
+        Departamento(id=i, nombre=f"Departamento {i}", descripcion="Área", creado_en=ahora, actualizado_en=ahora)
+        for i in range(1, 11)
+    ]
+    posiciones = [
+        Posicion(id=i, titulo=f"Posición {i}", descripcion=None, salario_min=Decimal("1000"),
+                 salario_max=Decimal("9000.5"), creado_en=ahora, actualizado_en=ahora)
+        for i in range(1, 21)
+    ]
+    empleados = []
+    for i in range(1, cantidad + 1):
+        empleado = Empleado(
+            id=i, codigo_empleado=f"EMP{i:07d}", nombre="Nombre", apellido=f"Apellido{i}",
+            email=f"empleado{i}@example.com", telefono=None, fecha_nacimiento=date(1990, 1, 1),
+            fecha_contratacion=date(2024, 1, 1), salario=Decimal("1234.5"), activo=i % 4 != 0,
+            creado_en=ahora, actualizado_en=ahora,
+        )
+        empleado.departamento = departamentos[i % len(departamentos)]
+        empleado.Posicion = posiciones[i % len(posiciones)]
+        empleados.append(empleado)
+    return empleados
+
+
+def camino_marshmallow(empleados) -> bytes:
+    """Equivalente a EmpleadoSchema(many=True).dump + response_model=List[dict] + JSONResponse"""
+    adapter = TypeAdapter(List[dict])
+    datos = adapter.dump_python(adapter.validate_python(EmpleadoSchema(many=True).dump(empleados)), mode="json")
+    return json.dumps(datos, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def camino_rapido(empleados) -> bytes:
+    return json_response(empleado_serializer.dump_many(empleados)).body
+
+
+def medir(funcion, empleados, repeticiones: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(empleados)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    empleados = generar_empleados(args.filas)
+
+    # Ambos caminos deben producir el mismo JSON
+    assert json.loads(camino_marshmallow(empleados)) == json.loads(camino_rapido(empleados)), "Salidas distintas"
+
+    lento = medir(camino_marshmallow, empleados, args.repeticiones)
+    rapido = medir(camino_rapido, empleados, args.repeticiones)
+    print(f"Filas: {args.filas} (mejor de {args.repeticiones})")
+    print(f"  marshmallow + response_model: {lento * 1000:8.1f} ms  ({args.filas / lento:10.0f} filas/s)")
+    print(f"  serializador precalculado:    {rapido * 1000:8.1f} ms  ({args.filas / rapido:10.0f} filas/s)")
+    print(f"  mejora: x{lento / rapido:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Compara la validación de los cuerpos de escritura: schemas marshmallow con .load()
+(camino anterior) contra los modelos de entrada compilados con pydantic-core
+(app.schemas). Verifica que ambos devuelvan los mismos datos y los mismos errores
+para un conjunto de casos válidos e inválidos, y mide cuerpos sueltos y lotes.
+
+Uso (desde backend/):  python -m benchmarks.bench_validacion --iteraciones 20000 --lote 1000
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from marshmallow import Schema, ValidationError, fields, validate
+
+from app.schemas import (
+    departamento_create_validator,
+    empleado_create_validator,
+    empleado_update_validator,
+    posicion_create_validator,
+)
+
+
+# ===== SCHEMAS ANTERIORES (marshmallow) =====
+
+class DepartamentoCreateSchema(Schema):
+    nombre = fields.Str(required=True, validate=validate.Length(min=1))
+    descripcion = fields.Str(required=False, allow_none=True)
+
+
+class PosicionCreateSchema(Schema):
+    titulo = fields.Str(required=True, validate=validate.Length(min=1))
+    descripcion = fields.Str(required=False, allow_none=True)
+    salario_min = fields.Decimal(required=False, allow_none=True)
+    salario_max = fields.Decimal(required=False, allow_none=True)
+
+
+class EmpleadoCreateSchema(Schema):
+    codigo_empleado = fields.Str(required=True, validate=validate.Length(min=1))
+    nombre = fields.Str(required=True, validate=validate.Length(min=1, max=50))
+    apellido = fields.Str(required=True, validate=validate.Length(min=1, max=50))
+    email = fields.Email(required=True)
+    telefono = fields.Str(required=False, allow_none=True, validate=validate.Length(max=20))
+    fecha_nacimiento = fields.Date(required=False, allow_none=True)
+    fecha_contratacion = fields.Date(required=True)
+    salario = fields.Float(required=True, places=2, validate=validate.Range(min=0))
+    activo = fields.Bool(required=False, load_default=True)
+    departamento_id = fields.Int(required=True)
+    Posicion_id = fields.Int(required=True)
+
+
+class EmpleadoUpdateSchema(Schema):
+    codigo_empleado = fields.Str(required=False, validate=validate.Length(min=1))
+    nombre = fields.Str(required=False, validate=validate.Length(min=1, max=50))
+    apellido = fields.Str(required=False, validate=validate.Length(min=1, max=50))
+    email = fields.Email(required=False)
+    telefono = fields.Str(required=False, allow_none=True, validate=validate.Length(max=20))
+    fecha_nacimiento = fields.Date(required=False, allow_none=True)
+    fecha_contratacion = fields.Date(required=False)
+    salario = fields.Float(required=False, places=2, validate=validate.Range(min=0))
+    # Sin load_default=True: el schema anterior reactivaba al empleado en cada PUT
+    activo = fields.Bool(required=False)
+    departamento_id = fields.Int(required=False)
+    Posicion_id = fields.Int(required=False)
+
+
+# ===== CASOS =====
+
+def empleado(i: int) -> dict:
+    """Cuerpo de POST /api/employees tal como lo entrega FastAPI (JSON ya decodificado)"""
+    return {
+        "codigo_empleado": f"EMP{i:07d}", "nombre": "Nombre", "apellido": f"Apellido{i}",
+        "email": f"empleado{i}@example.com", "telefono": "+54 11 5555-0000",
+        "fecha_nacimiento": "1990-01-01", "fecha_contratacion": "2024-01-01",
+        "salario": 1234.5, "activo": i % 4 != 0, "departamento_id": i % 10 + 1, "Posicion_id": i % 20 + 1,
+    }
+
+
+def _con(**cambios) -> dict:
+    datos = dict(empleado(1), **cambios)
+    return {campo: valor for campo, valor in datos.items() if valor is not ...}
+
+
+CASOS_EMPLEADO = [
+    empleado(1),
+    _con(telefono=..., fecha_nacimiento=..., activo=...),
+    _con(telefono=None, fecha_nacimiento=None, salario=0, activo="yes"),
+    _con(fecha_contratacion="2024-1-5", salario="1500.75", departamento_id="3", Posicion_id=4.0),
+    _con(email="josé.pérez@compañía.com.ar"),
+    _con(email='"con espacio"@example.com'),
+    _con(email="admin@localhost"),
+    _con(email="x@[192.168.0.1]"),
+    {},
+    _con(nombre="", apellido="x" * 51, telefono="1" * 21, codigo_empleado=""),
+    _con(nombre=5, email="sin-arroba", fecha_contratacion="01/02/2024", salario=-1),
+    _con(email="a@b", fecha_nacimiento="2024-01-01T00:00:00", fecha_contratacion=1704067200),
+    _con(email="a..b@example.com", salario=True, departamento_id=False, Posicion_id=2.0),
+    _con(salario="nan", departamento_id="x", activo="quizás"),
+    _con(nombre=None, fecha_contratacion=None, activo=None, departamento_id=None),
+    _con(desconocido=1, id=7),
+]
+
+CASOS_UPDATE = [
+    {}, {"nombre": "Otro"}, {"salario": "10"}, {"salario": "10", "activo": False}, {"telefono": None},
+    {"nombre": "", "email": "mal", "Posicion_id": "y"}, {"codigo_empleado": None, "otro": 1},
+]
+
+CASOS_DEPARTAMENTO = [{"nombre": "Ventas"}, {"nombre": "X", "descripcion": None}, {"nombre": ""}, {"descripcion": 3}, {"nombre": "A", "b": 1}]
+
+CASOS_POSICION = [
+    {"titulo": "Analista", "salario_min": 1000, "salario_max": "2500.50"},
+    {"titulo": "X", "salario_min": 1.1, "salario_max": None},
+    {"titulo": "", "salario_min": "nan", "salario_max": True},
+    {"salario_min": "abc"},
+]
+
+
+def cargar_marshmallow(schema: Schema, datos):
+    try:
+        return schema.load(datos), {}
+    except ValidationError as err:
+        return None, err.messages
+
+
+def verificar() -> int:
+    """
+    Ambos caminos deben devolver los mismos datos o los mismos errores. Diferencias
+    buscadas: un id con decimales (2.5) ahora es un error (marshmallow lo truncaba a 2),
+    un id como texto decimal ("2.0") ahora se acepta y al actualizar ya no se completa
+    activo=True (el baseline de EmpleadoUpdateSchema está corregido en ese punto).
+    """
+    pares = [
+        (EmpleadoCreateSchema(), empleado_create_validator, CASOS_EMPLEADO),
+        (EmpleadoUpdateSchema(), empleado_update_validator, CASOS_UPDATE),
+        (DepartamentoCreateSchema(), departamento_create_validator, CASOS_DEPARTAMENTO),
+        (PosicionCreateSchema(), posicion_create_validator, CASOS_POSICION),
+    ]
+    for schema, validator, casos in pares:
+        for caso in casos:
+            anterior = cargar_marshmallow(schema, caso)
+            nuevo = validator.validate(caso)
+            assert anterior == nuevo, f"Resultado distinto para {caso}:\n  {anterior}\n  {nuevo}"
+    return sum(len(casos) for _, _, casos in pares)
+
+
+# ===== MEDICIÓN =====
+
+def medir(funcion: Callable[[], object], repeticiones: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def lote_marshmallow(schema: Schema, items: List[dict]):
+    """Como el endpoint anterior: un load con many=True y las filas válidas desde valid_data"""
+    try:
+        return schema.load(items), {}
+    except ValidationError as err:
+        return err.valid_data, err.messages
+
+
+def lote_pydantic(validator, items: List[dict]):
+    filas, errores = [], {}
+    for indice, item in enumerate(items):
+        datos, errores_fila = validator.validate(item)
+        if errores_fila:
+            errores[indice] = errores_fila
+        else:
+            filas.append(datos)
+    return filas, errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iteraciones", type=int, default=20000, help="Validaciones por medición de cuerpos sueltos")
+    parser.add_argument("--lote", type=int, default=1000, help="Filas del lote (POST /api/employees/bulk)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Casos verificados: {verificar()} (mismos datos y mismos errores)")
+
+    sueltos = [
+        ("POST empleado", EmpleadoCreateSchema(), empleado_create_validator, empleado(1)),
+        ("PUT empleado", EmpleadoUpdateSchema(), empleado_update_validator, {"nombre": "Otro", "salario": 2000}),
+        ("POST empleado inválido", EmpleadoCreateSchema(), empleado_create_validator, CASOS_EMPLEADO[10]),
+        ("POST departamento", DepartamentoCreateSchema(), departamento_create_validator, {"nombre": "Ventas", "descripcion": "Área"}),
+        ("POST posición", PosicionCreateSchema(), posicion_create_validator, CASOS_POSICION[0]),
+    ]
+    n = args.iteraciones
+    print(f"\nCuerpos sueltos ({n} validaciones, mejor de {args.repeticiones})")
+    for nombre, schema, validator, datos in sueltos:
+        lento = medir(lambda: [cargar_marshmallow(schema, datos) for _ in range(n)], args.repeticiones)
+        rapido = medir(lambda: [validator.validate(datos) for _ in range(n)], args.repeticiones)
+        print(
+            f"  {nombre:24} marshmallow {lento / n * 1e6:6.1f} µs   pydantic {rapido / n * 1e6:6.1f} µs"
+            f"   {n / rapido:9.0f} val/s   x{lento / rapido:.1f}"
+        )
+
+    items = [empleado(i) for i in range(args.lote)]
+    # Una de cada 50 filas con errores, como en un lote real con algún rechazo
+    for i in range(0, args.lote, 50):
+        items[i] = dict(items[i], email="sin-arroba", salario=-1)
+    anterior, nuevo = lote_marshmallow(EmpleadoCreateSchema(many=True), items), lote_pydantic(empleado_create_validator, items)
+    assert anterior[1] == nuevo[1], "Errores distintos en el lote"
+    assert [fila for i, fila in enumerate(anterior[0]) if i not in anterior[1]] == nuevo[0], "Filas distintas en el lote"
+
+    schema_lote = EmpleadoCreateSchema(many=True)
+    lento = medir(lambda: lote_marshmallow(schema_lote, items), args.repeticiones)
+    rapido = medir(lambda: lote_pydantic(empleado_create_validator, items), args.repeticiones)
+    print(f"\nLote de {args.lote} empleados ({len(nuevo[1])} con errores, mejor de {args.repeticiones})")
+    print(f"  marshmallow many=True: {lento * 1000:8.1f} ms  ({args.lote / lento:9.0f} filas/s)")
+    print(f"  pydantic por fila:     {rapido * 1000:8.1f} ms  ({args.lote / rapido:9.0f} filas/s)")
+    print(f"  mejora: x{lento / rapido:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Utilidades compartidas por los benchmarks: cliente ASGI en proceso y contador de consultas"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+def usar_base_temporal(nombre: str = "benchmark.db") -> str:
+    """Apunta la configuración de Tortoise a una base SQLite temporal (no toca empleados.db)"""
+    from app.config import settings
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="empleados-bench-"), nombre)
+    settings.DATABASE_URL = f"sqlite://{ruta}"
+    return ruta
+
+
+def percentil(valores, p: float) -> float:
+    """Percentil p (0..1) por rango más cercano; 0 si no hay valores"""
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+class ClienteASGI:
+    """Cliente HTTP mínimo que llama a la aplicación ASGI directamente, sin sockets"""
+
+    def __init__(self, app):
+        self.app = app
+        self.token: Optional[str] = None
+
+    async def iniciar(self) -> None:
+        await self.app.router.startup()
+
+    async def cerrar(self) -> None:
+        await self.app.router.shutdown()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json_body=None,
+        form: Optional[dict] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> Tuple[int, dict, bytes]:
+        cabeceras = {k.lower(): v for k, v in (headers or {}).items()}
+        body = b""
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            cabeceras.setdefault("content-type", "application/json")
+        elif form is not None:
+            body = urlencode(form).encode("utf-8")
+            cabeceras.setdefault("content-type", "application/x-www-form-urlencoded")
+        if self.token:
+            cabeceras.setdefault("authorization", f"Bearer {self.token}")
+        cabeceras["content-length"] = str(len(body))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": urlencode(params or {}).encode("utf-8"),
+            "root_path": "",
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in cabeceras.items()],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        pendiente = [{"type": "http.request", "body": body, "more_body": False}]
+        respuesta = {"status": 500, "headers": {}, "body": bytearray()}
+        terminada = asyncio.Event()
+
+        async def receive():
+            if pendiente:
+                return pendiente.pop()
+            # Como un cliente real: se desconecta recién al terminar la respuesta
+            await terminada.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(mensaje):
+            if mensaje["type"] == "http.response.start":
+                respuesta["status"] = mensaje["status"]
+                respuesta["headers"] = {
+                    k.decode("latin-1"): v.decode("latin-1") for k, v in mensaje.get("headers", [])
+                }
+            elif mensaje["type"] == "http.response.body":
+                respuesta["body"] += mensaje.get("body", b"")
+                if not mensaje.get("more_body", False):
+                    terminada.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            terminada.set()
+        return respuesta["status"], respuesta["headers"], bytes(respuesta["body"])
+
+    async def login(self, username: str = "bench", password: str = "bench123") -> None:
+        """Registra (si hace falta) e inicia sesión; guarda el token para los siguientes requests"""
+        await self.request("POST", "/api/auth/register", json_body={
+            "username": username, "email": f"{username}@example.com", "password": password,
+        })
+        status, _, body = await self.request("POST", "/api/auth/login", form={
+            "username": username, "password": password,
+        })
+        if status != 200:
+            raise RuntimeError(f"Login fallido ({status}): {body!r}")
+        self.token = json.loads(body)["access_token"]
+
+
+class ContadorConsultas(logging.Handler):
+    """Cuenta las sentencias SQL que Tortoise registra en el logger tortoise.db_client"""
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.consultas: List[str] = []
+        self.parametros: List[list] = []
+        self._logger = logging.getLogger("tortoise.db_client")
+        self._nivel_anterior = self._logger.level
+        self._propagate_anterior = self._logger.propagate
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Las sentencias se registran como "%s: %s" (sql, valores)
+        if record.msg == "%s: %s":
+            self.consultas.append(str(record.args[0]))
+            self.parametros.append(list(record.args[1] or []))
+
+    def __enter__(self) -> "ContadorConsultas":
+        self._logger.addHandler(self)
+        self._logger.setLevel(logging.DEBUG)
+        # Las sentencias solo se cuentan, no llegan al log de la app
+        self._logger.propagate = False
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._logger.removeHandler(self)
+        self._logger.setLevel(self._nivel_anterior)
+        self._logger.propagate = self._propagate_anterior
+
+
+async def sembrar_empleados(cantidad: int, departamentos: int = 10, posiciones: int = 20) -> None:
+    """Carga departamentos, posiciones y empleados de prueba con las operaciones en lote de crud"""
+    from datetime import date
+    from decimal import Decimal
+
+    from app import crud
+    from app.models import Departamento, Posicion
+
+    await Departamento.bulk_create([Departamento(nombre=f"Departamento {i}") for i in range(1, departamentos + 1)])
+    await Posicion.bulk_create([Posicion(titulo=f"Posición {i}") for i in range(1, posiciones + 1)])
+    filas = [
+        (i, {
+            "codigo_empleado": f"EMP{i:07d}", "nombre": f"Nombre{i % 500}", "apellido": f"Apellido{i % 997}",
+            "email": f"empleado{i}@example.com", "fecha_contratacion": date(2020, 1, 1 + i % 28),
+            "salario": Decimal(1000 + (i * 37) % 9000), "activo": i % 5 != 0,
+            "departamento_id": 1 + i % departamentos, "Posicion_id": 1 + i % posiciones,
+        })
+        for i in range(1, cantidad + 1)
+    ]
+    _, errores = await crud.bulk_create_empleados(filas)
+    if errores:
+        raise RuntimeError(f"Error al sembrar datos: {errores[:3]}")
@@ -0,0 +1,98 @@
+"""
+Verifica la cantidad de sentencias SQL por endpoint de escritura/lectura puntual.
+Sale con código 1 si algún endpoint supera el máximo esperado.
+
+Uso (desde backend/):  python -m benchmarks.contar_consultas [-v]
+"""
+import argparse
+import asyncio
+import sys
+from urllib.parse import parse_qsl
+
+from benchmarks.cliente import ClienteASGI, ContadorConsultas, usar_base_temporal
+
+EMPLEADO = {
+    "codigo_empleado": "Q001", "nombre": "Ana", "apellido": "Gómez", "email": "ana@example.com",
+    "fecha_contratacion": "2025-01-01", "salario": 1000, "departamento_id": 1, "Posicion_id": 1,
+}
+
+# (método, ruta, body, status esperado, máximo de sentencias)
+# "GET*" repite el GET anterior de la ruta con If-None-Match (ETag); la ruta puede llevar ?consulta
+ESCENARIOS = [
+    ("POST", "/api/departments/", {"nombre": "Ventas"}, 201, 1),
+    ("POST", "/api/departments/", {"nombre": "Compras"}, 201, 1),
+    ("PUT", "/api/departments/1", {"nombre": "Ventas", "descripcion": "Comercial"}, 200, 1),
+    ("PUT", "/api/departments/999", {"nombre": "X"}, 404, 1),
+    ("POST", "/api/positions/", {"titulo": "Vendedor", "salario_min": 100}, 201, 1),
+    ("PUT", "/api/positions/1", {"titulo": "Vendedor Sr"}, 200, 1),
+    # Todos los GET con ETag leen la marca de agua de la base (1 consulta), también los de
+    # referencias; la primera lectura después de escribir recarga además su cache
+    ("GET", "/api/departments/", None, 200, 2),
+    ("GET", "/api/departments/1", None, 200, 1),
+    ("GET", "/api/positions/", None, 200, 2),
+    ("GET", "/api/positions/1", None, 200, 1),
+    ("POST", "/api/employees/", EMPLEADO, 201, 2),
+    ("GET", "/api/employees/", None, 200, 2),
+    ("GET*", "/api/employees/", None, 304, 1),
+    ("GET", "/api/employees/1", None, 200, 2),
+    ("GET*", "/api/employees/1", None, 304, 1),
+    ("GET*", "/api/departments/1", None, 304, 1),
+    # fields= vacío es un error del cliente, no un 500
+    ("GET", "/api/employees/?fields=", None, 400, 0),
+    ("GET", "/api/employees/?fields=,", None, 400, 0),
+    ("GET", "/api/employees/1?fields=", None, 400, 0),
+    ("GET", "/api/employees/?fields=departamento", None, 200, 2),
+    ("PUT", "/api/employees/1", {"salario": 2000, "departamento_id": 2}, 200, 2),
+    ("PUT", "/api/employees/999", {"salario": 1}, 404, 1),
+    ("DELETE", "/api/employees/1", None, 200, 1),
+    ("DELETE", "/api/departments/2", None, 200, 1),
+]
+
+
+async def main(verbose: bool) -> int:
+    usar_base_temporal()
+    from app.auth import user_cache
+    from app.main import app
+
+    # Se cuentan las consultas de cada endpoint con el usuario ya en cache: que no venza
+    # (AUTH_USER_CACHE_TTL_SECONDS es corto) si la corrida tarda más que eso
+    user_cache.ttl = 3600
+    cliente = ClienteASGI(app)
+    await cliente.iniciar()
+    fallas = 0
+    try:
+        await cliente.login()
+        await cliente.request("GET", "/api/auth/me")  # calienta el cache de usuarios
+
+        print(f"{'Endpoint':45} {'Status':>6} {'SQL':>4} {'Máx':>4}")
+        etags = {}
+        for metodo, ruta, body, status_esperado, maximo in ESCENARIOS:
+            headers = {"If-None-Match": etags.get(ruta, "")} if metodo == "GET*" else None
+            with ContadorConsultas() as contador:
+                status, cabeceras, respuesta = await cliente.request(
+                    metodo.rstrip("*"), ruta.partition("?")[0], json_body=body, headers=headers,
+                    params=dict(parse_qsl(ruta.partition("?")[2], keep_blank_values=True)),
+                )
+            if "etag" in cabeceras:
+                etags[ruta] = cabeceras["etag"]
+            cantidad = len(contador.consultas)
+            ok = status == status_esperado and cantidad <= maximo
+            fallas += not ok
+            print(f"{metodo + ' ' + ruta:45} {status:>6} {cantidad:>4} {maximo:>4} {'' if ok else '❌'}")
+            if verbose or not ok:
+                for sql in contador.consultas:
+                    print(f"      {sql[:150]}")
+                if status != status_esperado:
+                    print(f"      respuesta: {respuesta[:200]!r}")
+    finally:
+        await cliente.cerrar()
+
+    print("\n✅ Todo dentro de lo esperado" if not fallas else f"\n❌ {fallas} endpoint(s) fuera de lo esperado")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostrar las sentencias de cada endpoint")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.verbose)))
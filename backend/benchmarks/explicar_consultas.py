@@ -0,0 +1,98 @@
+"""
+Revisa con EXPLAIN QUERY PLAN las consultas de los caminos calientes de empleados
+(filtros de listado, búsqueda por prefijo y orden) y sale con código 1 si alguna recorre
+la tabla empleados completa en lugar de usar un índice, o si un orden pedido con sort
+necesita ordenar todas las filas en un B-tree temporal.
+
+Uso (desde backend/):  python -m benchmarks.explicar_consultas [--empleados 2000] [-v]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+
+from tortoise import Tortoise
+
+from benchmarks.cliente import ContadorConsultas, sembrar_empleados, usar_base_temporal
+
+ESCENARIOS = [
+    ("departamento + activo", {"departamento_id": 3, "activo": True}),
+    ("posición + activo", {"Posicion_id": 5, "activo": False}),
+    ("solo departamento", {"departamento_id": 3}),
+    ("rango de contratación", {"fecha_desde": date(2020, 1, 10), "fecha_hasta": date(2020, 1, 12)}),
+    ("orden por apellido", {"sort": "apellido"}),
+    ("orden por apellido (cursor)", {"sort": "apellido", "after_id": 10, "after_value": "Apellido5"}),
+    ("orden por nombre", {"sort": "-nombre"}),
+    ("orden por contratación", {"sort": "fecha_contratacion"}),
+    ("departamento, orden por id (cursor)", {"departamento_id": 3, "after_id": 100}),
+    ("búsqueda por prefijo (q)", {"q": "nombre12"}),
+    ("búsqueda por prefijo (q) + activo", {"q": "Apellido5", "activo": True}),
+    ("rango de salario", {"salario_min": 5000, "salario_max": 5100}),
+    ("salario mínimo, orden por salario", {"salario_min": 9000, "sort": "salario"}),
+    ("orden por salario", {"sort": "salario"}),
+    ("orden por salario (cursor)", {"sort": "-salario", "after_id": 10, "after_value": 3000.0}),
+]
+
+
+def es_scan_completo(detalle: str) -> bool:
+    """SCAN sin índice sobre empleados ("SCAN empleados" a secas)"""
+    partes = detalle.split()
+    return len(partes) >= 2 and partes[0] == "SCAN" and partes[1] == "empleados" and "INDEX" not in detalle
+
+
+def es_orden_sin_indice(detalle: str) -> bool:
+    """Todo el ORDER BY en un B-tree temporal (no "FOR RIGHT PART OF ORDER BY")"""
+    return detalle == "USE TEMP B-TREE FOR ORDER BY"
+
+
+async def main(args) -> int:
+    usar_base_temporal()
+    from app import crud
+    from app.database import asegurar_indices_expresion, close_db, get_tortoise_config
+    from app.serializers import CAMPOS_COMPLETOS, filas_empleado
+
+    await Tortoise.init(config=get_tortoise_config())
+    await Tortoise.generate_schemas()
+    await asegurar_indices_expresion()
+    fallas = 0
+    try:
+        await sembrar_empleados(args.empleados)
+        db = Tortoise.get_connection("default")
+        await db.execute_script("ANALYZE")
+
+        for descripcion, parametros in ESCENARIOS:
+            # La misma consulta con JOIN que usa el listado de la API
+            plan = filas_empleado(CAMPOS_COMPLETOS, crud.EMPLEADO_RELACIONES, parametros.get("sort", "id").lstrip("-"))
+            with ContadorConsultas() as contador:
+                await crud.get_empleados_filas(plan.columnas, limit=20, **parametros)
+
+            planes = []
+            for sql, valores in zip(contador.consultas, contador.parametros):
+                if '"empleados"' not in sql.split("FROM", 1)[-1][:20]:
+                    continue
+                _, filas = await db.execute_query(f"EXPLAIN QUERY PLAN {sql}", valores)
+                planes.append((sql, [fila["detail"] for fila in filas]))
+
+            scans = [detalle for _, detalles in planes for detalle in detalles if es_scan_completo(detalle)]
+            if "sort" in parametros:
+                scans += [detalle for _, detalles in planes for detalle in detalles if es_orden_sin_indice(detalle)]
+            fallas += bool(scans)
+            print(f"{'❌' if scans else '✅'} {descripcion}")
+            if args.verbose or scans:
+                for sql, detalles in planes:
+                    print(f"      {sql[:140]}")
+                    for detalle in detalles:
+                        print(f"        {detalle}")
+    finally:
+        await close_db()
+
+    print("\n✅ Ninguna consulta caliente recorre la tabla completa ni ordena sin índice" if not fallas
+          else f"\n❌ {fallas} consulta(s) con SCAN completo de empleados u orden sin índice")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--empleados", type=int, default=2000, help="Empleados a sembrar antes de ANALYZE")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostrar el plan de cada consulta")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,129 @@
+"""
+Verifica que las actualizaciones escriban solo los campos enviados: un PUT (individual
+o en lote) con el salario de un empleado dado de baja no debe reactivarlo. Verifica
+también que el ETag de las tablas de referencia y de las estadísticas cambie, y la
+respuesta traiga el dato nuevo, ante una escritura que no pasa por los caches de este
+proceso (como la de otro worker), y que el autocompletado la refleje.
+Sale con código 1 si alguna verificación falla.
+
+Uso (desde backend/):  python -m benchmarks.verificar_escrituras
+"""
+import asyncio
+import json
+import sys
+
+from tortoise import timezone
+
+from benchmarks.cliente import ClienteASGI, usar_base_temporal
+
+
+def empleado(i: int, activo: bool) -> dict:
+    return {
+        "codigo_empleado": f"V{i:03d}", "nombre": "Ana", "apellido": f"Gómez{i}", "email": f"v{i}@example.com",
+        "fecha_contratacion": "2025-01-01", "salario": 1000, "activo": activo, "departamento_id": 1, "Posicion_id": 1,
+    }
+
+
+async def main() -> int:
+    usar_base_temporal()
+    from app.autocompletado import autocompletado
+    from app.config import settings
+    from app.main import app
+    from app.models import Departamento, Empleado
+
+    settings.AUTOCOMPLETE_SYNC_SECONDS = 0
+
+    cliente = ClienteASGI(app)
+    await cliente.iniciar()
+    fallas = 0
+
+    async def pedir(metodo: str, ruta: str, body=None, status_esperado: int = 200, headers=None, params=None):
+        status, cabeceras, respuesta = await cliente.request(metodo, ruta, json_body=body, params=params, headers=headers)
+        if status != status_esperado:
+            raise RuntimeError(f"{metodo} {ruta}: {status} {respuesta[:200]!r}")
+        return cabeceras if status == 304 else json.loads(respuesta)
+
+    def verificar(descripcion: str, ok: bool) -> None:
+        nonlocal fallas
+        fallas += not ok
+        print(f"{'✅' if ok else '❌'} {descripcion}")
+
+    try:
+        await cliente.login()
+        await pedir("POST", "/api/departments/", {"nombre": "Ventas"}, 201)
+        await pedir("POST", "/api/positions/", {"titulo": "Vendedor"}, 201)
+        inactivo = await pedir("POST", "/api/employees/", empleado(1, activo=False), 201)
+
+        await pedir("PUT", f"/api/employees/{inactivo['id']}", {"salario": 1500})
+        actual = await pedir("GET", f"/api/employees/{inactivo['id']}")
+        verificar("PUT solo con salario no reactiva al empleado", actual["activo"] is False)
+        verificar("PUT solo con salario actualiza el salario", float(actual["salario"]) == 1500)
+
+        await pedir("PUT", f"/api/employees/{inactivo['id']}", {"activo": True})
+        actual = await pedir("GET", f"/api/employees/{inactivo['id']}")
+        verificar("PUT con activo=true lo reactiva", actual["activo"] is True)
+
+        # Lote con empleados inactivos y uno activo: salario y departamento, sin activo
+        await pedir("POST", "/api/departments/", {"nombre": "Compras"}, 201)
+        lote = await pedir("POST", "/api/employees/bulk", [empleado(i, activo=i == 12) for i in range(10, 13)])
+        verificar("POST bulk crea los tres empleados", lote["creados"] == 3 and not lote["errores"])
+        ids = {e["codigo_empleado"]: e["id"] for e in await pedir("GET", "/api/employees/")}
+        cambios = [{"id": ids[f"V{i:03d}"], "salario": 2000 + i, "departamento_id": 2} for i in range(10, 13)]
+        resultado = await pedir("PUT", "/api/employees/bulk", cambios)
+        verificar("PUT bulk actualiza las tres filas", resultado["actualizados"] == 3 and not resultado["errores"])
+        for i in range(10, 13):
+            actual = await pedir("GET", f"/api/employees/{ids[f'V{i:03d}']}")
+            verificar(
+                f"PUT bulk conserva activo={i == 12} y aplica salario/departamento en V{i:03d}",
+                actual["activo"] is (i == 12)
+                and float(actual["salario"]) == 2000 + i
+                and actual["departamento"]["id"] == 2,
+            )
+
+        nuevo = await pedir("POST", "/api/employees/", {k: v for k, v in empleado(2, True).items() if k != "activo"}, 201)
+        verificar("POST sin activo crea un empleado activo", nuevo["activo"] is True)
+
+        # Escritura de otro worker: no invalida el cache de referencias de este proceso
+        status, cabeceras, _ = await cliente.request("GET", "/api/departments/")
+        etag = cabeceras["etag"]
+        await pedir("GET", "/api/departments/", status_esperado=304, headers={"If-None-Match": etag})
+        await Departamento.filter(id=1).update(nombre="Ventas Norte", actualizado_en=timezone.now())
+        status, cabeceras, _ = await cliente.request("GET", "/api/departments/", headers={"If-None-Match": etag})
+        verificar("Escritura de otro worker en departamentos cambia el ETag", status == 200 and cabeceras["etag"] != etag)
+        departamentos = await pedir("GET", "/api/departments/")
+        verificar("La respuesta con el ETag nuevo trae el dato nuevo", departamentos[0]["nombre"] == "Ventas Norte")
+
+        # Lo mismo con las estadísticas, que tienen su propio cache por proceso
+        status, cabeceras, respuesta = await cliente.request("GET", "/api/stats/")
+        antes, etag = json.loads(respuesta), cabeceras["etag"]
+        await Empleado.filter(id=nuevo["id"]).update(activo=False, actualizado_en=timezone.now())
+        status, cabeceras, respuesta = await cliente.request("GET", "/api/stats/", headers={"If-None-Match": etag})
+        verificar(
+            "Escritura de otro worker en empleados cambia el ETag y las estadísticas",
+            status == 200 and cabeceras["etag"] != etag
+            and json.loads(respuesta)["empleados_activos"] == antes["empleados_activos"] - 1,
+        )
+
+        # Autocompletado: altas, cambios y bajas de otro worker
+        def sugerencias(respuesta: dict) -> set:
+            return {e["codigo_empleado"] for e in respuesta["employees"]}
+
+        await pedir("GET", "/api/autocomplete/", params={"q": "ana"})  # arma el índice
+        await Empleado.filter(id=nuevo["id"]).update(nombre="Zulema", actualizado_en=timezone.now())
+        await Empleado.filter(id=ids["V010"]).delete()
+        externo = await Empleado.create(**empleado(20, activo=True))
+        zulema = sugerencias(await pedir("GET", "/api/autocomplete/", params={"q": "zul", "types": "employees"}))
+        ana = sugerencias(await pedir("GET", "/api/autocomplete/", params={"q": "ana", "types": "employees"}))
+        verificar("Autocompletado ve el cambio de nombre de otro worker", zulema == {"V002"})
+        verificar("Autocompletado ve el alta y la baja de otro worker", "V020" in ana and "V010" not in ana and "V002" not in ana)
+        verificar("El índice se actualizó sin rearmarse", autocompletado._vigente and len(autocompletado.empleados) == await Empleado.all().count())
+        await externo.delete()
+    finally:
+        await cliente.cerrar()
+
+    print("\n✅ Todo dentro de lo esperado" if not fallas else f"\n❌ {fallas} verificación(es) fallida(s)")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,92 @@
+"""
+Verifica que el cache de referencias devuelva las mismas instancias con cualquier
+backend: una posición (decimales, fechas y nulos) y un departamento leídos a través de
+RedisBackend, que guarda las filas como JSON, deben ser iguales, con los mismos tipos,
+a los leídos con MemoryBackend. Usa fakeredis en lugar de un servidor Redis y repite
+la verificación clasificando los campos como en PostgreSQL, donde _init_from_db no
+convierte los decimales (los da por nativos del driver).
+Sale con código 1 si alguna verificación falla.
+
+Uso (desde backend/):  python -m benchmarks.verificar_referencias
+Requiere: pip install redis fakeredis
+"""
+import asyncio
+import sys
+from decimal import Decimal
+
+from benchmarks.cliente import usar_base_temporal
+
+
+async def main() -> int:
+    try:
+        from fakeredis import FakeAsyncRedis
+    except ImportError:
+        print("❌ Esta verificación requiere fakeredis (pip install redis fakeredis)")
+        return 1
+
+    usar_base_temporal()
+    from tortoise import Tortoise
+    from tortoise.backends.base_postgres.executor import BasePostgresExecutor
+
+    from app.database import get_tortoise_config
+    from app.referencias import MemoryBackend, RedisBackend, ReferenceCache
+    from app.models import Departamento, Posicion
+
+    await Tortoise.init(config=get_tortoise_config())
+    await Tortoise.generate_schemas()
+    fallas = 0
+
+    def verificar(descripcion: str, ok: bool) -> None:
+        nonlocal fallas
+        fallas += not ok
+        print(f"{'✅' if ok else '❌'} {descripcion}")
+
+    def clasificar_campos(executor_class=None) -> None:
+        """Rearma la clasificación de campos (nativos/convertidos) con los tipos nativos de otro driver"""
+        conexion = Tortoise.get_connection("default")
+        if executor_class is None:
+            del conexion.executor_class
+        else:
+            conexion.executor_class = executor_class
+        for modelo in (Departamento, Posicion):
+            modelo._meta._generate_db_fields()
+
+    try:
+        await Departamento.create(nombre="Ventas", descripcion="Comercial")
+        await Posicion.create(titulo="Vendedor", salario_min=Decimal("1000.50"), salario_max=Decimal("2500"))
+        await Posicion.create(titulo="Pasante")
+
+        esperados = {nombre: await ReferenceCache(MemoryBackend()).tabla(nombre) for nombre in ("departamentos", "posiciones")}
+        for driver, executor_class in (("SQLite", None), ("PostgreSQL", BasePostgresExecutor)):
+            if executor_class is not None:
+                clasificar_campos(executor_class)
+            redis = RedisBackend()
+            redis._redis = FakeAsyncRedis()
+            await ReferenceCache(redis).departamentos()  # primera lectura: de la base, y la guarda en Redis
+            await ReferenceCache(redis).posiciones()
+
+            for nombre, esperado in esperados.items():
+                obtenido = await ReferenceCache(redis).tabla(nombre)  # instancias armadas desde Redis
+                verificar(f"{driver} {nombre}: mismos ids", obtenido.keys() == esperado.keys())
+                for item_id, instancia in esperado.items():
+                    campos = instancia._meta.db_fields
+                    distintos = [
+                        campo for campo in campos
+                        if getattr(obtenido[item_id], campo) != getattr(instancia, campo)
+                        or type(getattr(obtenido[item_id], campo)) is not type(getattr(instancia, campo))
+                    ]
+                    verificar(
+                        f"{driver} {nombre} {item_id}: {len(campos)} campos con el mismo valor y tipo"
+                        + (f" (difieren: {', '.join(distintos)})" if distintos else ""),
+                        not distintos,
+                    )
+        clasificar_campos()
+    finally:
+        await Tortoise.close_connections()
+
+    print("\n✅ Todo dentro de lo esperado" if not fallas else f"\n❌ {fallas} verificación(es) fallida(s)")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import sys
+from app.database import TORTOISE_ORM
+from app.generacion import generar_empleados
+from tortoise import Tortoise
+
+async def generar(args):
+    print("🔄 Inicializando base de datos...")
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas()
+
+    try:
+        print(f"🏭 Generando {args.empleados} empleados...")
+        reporte = await generar_empleados(
+            args.empleados,
+            departamentos=args.departamentos,
+            posiciones=args.posiciones,
+            batch_size=args.batch_size,
+            filas_por_transaccion=args.filas_por_transaccion,
+            semilla=args.semilla,
+            recrear_indices=not args.mantener_indices,
+        )
+
+        print("\n✅ Generación finalizada")
+        print(f"   Empleados creados: {reporte['creados']}")
+        print(f"   Departamentos: {reporte['departamentos']}  Posiciones: {reporte['posiciones']}")
+        print(f"   Carga: {reporte['segundos_carga']} s  Índices: {reporte['segundos_indices']} s")
+        print(f"   Total: {reporte['segundos']} s ({reporte['filas_por_segundo']} filas/s)")
+    finally:
+        await Tortoise.close_connections()
+        print("🔒 Conexiones cerradas.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera empleados sintéticos (con departamentos y posiciones) para pruebas de rendimiento")
+    parser.add_argument("--empleados", type=int, default=100000, help="Cantidad de empleados a agregar")
+    parser.add_argument("--departamentos", type=int, default=25, help="Departamentos a usar (se crean los que falten)")
+    parser.add_argument("--posiciones", type=int, default=50, help="Posiciones a usar (se crean las que falten)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Filas por executemany")
+    parser.add_argument("--filas-por-transaccion", type=int, default=200000, help="Filas por transacción")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para datos reproducibles")
+    parser.add_argument("--mantener-indices", action="store_true", help="No borrar ni recrear los índices secundarios (SQLite)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(generar(args))
+    except KeyboardInterrupt:
+        print("\n⚠️  Proceso interrumpido por el usuario")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
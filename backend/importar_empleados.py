@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import sys
+from app.database import TORTOISE_ORM
+from app.importacion import importar_empleados_csv
+from tortoise import Tortoise
+
+async def importar(ruta: str, batch_size: int):
+    print("🔄 Inicializando base de datos...")
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas()
+    
+    try:
+        print(f"📥 Importando empleados desde {ruta}...")
+        with open(ruta, encoding="utf-8-sig", newline="") as archivo:
+            reporte = await importar_empleados_csv(archivo, batch_size=batch_size)
+        
+        print("\n✅ Importación finalizada")
+        print(f"   Filas procesadas: {reporte['procesadas']}")
+        print(f"   Creados: {reporte['creados']}")
+        print(f"   Actualizados: {reporte['actualizados']}")
+        print(f"   Rechazadas: {reporte['rechazadas']}")
+        print(f"   Tiempo: {reporte['segundos']} s ({reporte['filas_por_segundo']} filas/s)")
+        
+        for error in reporte["errores"][:20]:
+            print(f"   ⚠️  Línea {error['linea']}: {error['errores']}")
+        if reporte["rechazadas"] > 20:
+            print(f"   ... y {reporte['rechazadas'] - 20} filas rechazadas más")
+    finally:
+        await Tortoise.close_connections()
+        print("🔒 Conexiones cerradas.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa empleados desde un CSV (upsert por codigo_empleado)")
+    parser.add_argument("archivo", help="Ruta del archivo CSV")
+    parser.add_argument("--batch-size", type=int, default=None, help="Filas por transacción")
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(importar(args.archivo, args.batch_size))
+    except KeyboardInterrupt:
+        print("\n⚠️  Proceso interrumpido por el usuario")
+        sys.exit(0)
+    except FileNotFoundError:
+        print(f"❌ No se encontró el archivo: {args.archivo}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
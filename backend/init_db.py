@@ -1,11 +1,12 @@
 from tortoise import Tortoise
-from app.database import TORTOISE_ORM
+from app.database import TORTOISE_ORM, asegurar_indices_expresion
 
 async def init_db():
     print("🔄 Inicializando base de datos...")
     await Tortoise.init(config=TORTOISE_ORM)
     print("📝 Generando esquemas de tablas...")
     await Tortoise.generate_schemas()
+    await asegurar_indices_expresion()
     print("✅ Base de datos inicializada correctamente!")
     await Tortoise.close_connections()
     print("🔒 Conexiones cerradas.")
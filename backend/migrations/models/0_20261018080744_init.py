@@ -0,0 +1,65 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "departamentos" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "nombre" VARCHAR(100) NOT NULL UNIQUE,
+    "descripcion" TEXT,
+    "creado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "actualizado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+) /* Modelo para Departamento */;
+CREATE TABLE IF NOT EXISTS "posiciones" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "titulo" VARCHAR(100) NOT NULL,
+    "descripcion" TEXT,
+    "salario_min" VARCHAR(40),
+    "salario_max" VARCHAR(40),
+    "creado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "actualizado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+) /* Modelo para Puesto\/Posición */;
+CREATE TABLE IF NOT EXISTS "empleados" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "codigo_empleado" VARCHAR(20) NOT NULL UNIQUE,
+    "nombre" VARCHAR(50) NOT NULL,
+    "apellido" VARCHAR(50) NOT NULL,
+    "email" VARCHAR(100) NOT NULL UNIQUE,
+    "telefono" VARCHAR(20),
+    "fecha_nacimiento" DATE,
+    "fecha_contratacion" DATE NOT NULL,
+    "salario" VARCHAR(40) NOT NULL,
+    "activo" INT NOT NULL  DEFAULT 1,
+    "creado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "actualizado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "Posicion_id" INT NOT NULL REFERENCES "posiciones" ("id") ON DELETE CASCADE,
+    "departamento_id" INT NOT NULL REFERENCES "departamentos" ("id") ON DELETE CASCADE
+) /* Modelo para Empleado */;
+CREATE INDEX IF NOT EXISTS "idx_empleados_nombre_a84e38" ON "empleados" ("nombre");
+CREATE INDEX IF NOT EXISTS "idx_empleados_apellid_907139" ON "empleados" ("apellido");
+CREATE INDEX IF NOT EXISTS "idx_empleados_fecha_c_e295e1" ON "empleados" ("fecha_contratacion");
+CREATE INDEX IF NOT EXISTS "idx_empleados_activo_5d5e70" ON "empleados" ("activo");
+CREATE INDEX IF NOT EXISTS "idx_empleados_Posicio_19972e" ON "empleados" ("Posicion_id");
+CREATE INDEX IF NOT EXISTS "idx_empleados_departa_a09da1" ON "empleados" ("departamento_id");
+CREATE TABLE IF NOT EXISTS "users" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "username" VARCHAR(50) NOT NULL UNIQUE,
+    "email" VARCHAR(100) NOT NULL UNIQUE,
+    "full_name" VARCHAR(100),
+    "hashed_password" VARCHAR(255) NOT NULL,
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "is_superuser" INT NOT NULL  DEFAULT 0,
+    "creado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "actualizado_en" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+) /* Modelo para Usuario del sistema */;
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_empleados_Posicio_19972e";
+        DROP INDEX IF EXISTS "idx_empleados_apellid_907139";
+        DROP INDEX IF EXISTS "idx_empleados_departa_a09da1";
+        CREATE INDEX IF NOT EXISTS "idx_empleados_Posicio_459549" ON "empleados" ("Posicion_id", "activo");
+        CREATE INDEX IF NOT EXISTS "idx_empleados_departa_d69209" ON "empleados" ("departamento_id", "activo");
+        CREATE INDEX IF NOT EXISTS "idx_empleados_apellid_ddedd6" ON "empleados" ("apellido", "nombre");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_empleados_apellid_ddedd6";
+        DROP INDEX IF EXISTS "idx_empleados_departa_d69209";
+        DROP INDEX IF EXISTS "idx_empleados_Posicio_459549";
+        CREATE INDEX IF NOT EXISTS "idx_empleados_departa_a09da1" ON "empleados" ("departamento_id");
+        CREATE INDEX IF NOT EXISTS "idx_empleados_apellid_907139" ON "empleados" ("apellido");
+        CREATE INDEX IF NOT EXISTS "idx_empleados_Posicio_19972e" ON "empleados" ("Posicion_id");"""
@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_empleados_salario_num" ON "empleados" ((CAST("salario" AS DOUBLE PRECISION)));
+        CREATE INDEX IF NOT EXISTS "idx_empleados_nombre_lower" ON "empleados" ((lower("nombre")));
+        CREATE INDEX IF NOT EXISTS "idx_empleados_apellido_lower" ON "empleados" ((lower("apellido")));
+        CREATE INDEX IF NOT EXISTS "idx_empleados_email_lower" ON "empleados" ((lower("email")));
+        CREATE INDEX IF NOT EXISTS "idx_empleados_codigo_empleado_lower" ON "empleados" ((lower("codigo_empleado")));"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_empleados_salario_num";
+        DROP INDEX IF EXISTS "idx_empleados_nombre_lower";
+        DROP INDEX IF EXISTS "idx_empleados_apellido_lower";
+        DROP INDEX IF EXISTS "idx_empleados_email_lower";
+        DROP INDEX IF EXISTS "idx_empleados_codigo_empleado_lower";"""
@@ -0,0 +1,33 @@
+import asyncio
+import sys
+from app.busqueda import disponible, reconstruir_indice
+from app.database import TORTOISE_ORM
+from tortoise import Tortoise
+
+async def reconstruir():
+    print("🔄 Inicializando base de datos...")
+    await Tortoise.init(config=TORTOISE_ORM)
+
+    try:
+        connection = Tortoise.get_connection("default")
+        if not disponible(connection):
+            print("⚠️  El índice de búsqueda solo existe en SQLite con SEARCH_FTS_ENABLED activado")
+            return
+        print("🔎 Reconstruyendo índice de búsqueda de empleados...")
+        reporte = await reconstruir_indice(connection)
+        print(f"\n✅ Índice reconstruido: {reporte['indexados']} empleados en {reporte['segundos']} s")
+    finally:
+        await Tortoise.close_connections()
+        print("🔒 Conexiones cerradas.")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(reconstruir())
+    except KeyboardInterrupt:
+        print("\n⚠️  Proceso interrumpido por el usuario")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -2,13 +2,14 @@ import React, { useState, useEffect } from 'react';
 import './EmployeesPage.css';
 import EmployeeForm from '../components/forms/EmployeeForm';
 import DataTable from '../components/DataTable';
-import { employeeService } from '../services/employeeService';
+import { employeeService, statsService } from '../services/employeeService';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 import './Page.css';
 
 const EmployeesPage = () => {
   const [employees, setEmployees] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   
@@ -30,8 +31,18 @@ const EmployeesPage = () => {
     }
   };
 
+  // Los conteos se calculan en el backend (no dependen de la página cargada)
+  const fetchStats = async () => {
+    try {
+      setStats(await statsService.get());
+    } catch (err) {
+      console.error('Error fetching employee stats', err);
+    }
+  };
+
   useEffect(() => {
     fetchEmployees();
+    fetchStats();
   }, []);
 
   // Manejar creación de nuevo empleado
@@ -59,6 +70,7 @@ const EmployeesPage = () => {
       
       // Actualizar la lista localmente (sin recargar desde la API)
       setEmployees(prev => prev.filter(emp => emp.id !== employee.id));
+      fetchStats();
       
       setOperationMessage({
         type: 'success',
@@ -103,6 +115,8 @@ const EmployeesPage = () => {
         });
       }
 
+      fetchStats();
+
       // Cerrar formulario
       setShowForm(false);
       setEditingEmployee(null);
@@ -231,15 +245,15 @@ const EmployeesPage = () => {
       <div className="page-stats">
         <div className="stat-box">
           <span className="stat-label">Total</span>
-          <span className="stat-value">{employees.length}</span>
+          <span className="stat-value">{stats ? stats.total_empleados : employees.length}</span>
         </div>
         <div className="stat-box">
           <span className="stat-label">Activos</span>
-          <span className="stat-value active">{employees.filter(e => e.activo).length}</span>
+          <span className="stat-value active">{stats ? stats.empleados_activos : employees.filter(e => e.activo).length}</span>
         </div>
         <div className="stat-box">
           <span className="stat-label">Inactivos</span>
-          <span className="stat-value inactive">{employees.filter(e => !e.activo).length}</span>
+          <span className="stat-value inactive">{stats ? stats.empleados_inactivos : employees.filter(e => !e.activo).length}</span>
         </div>
       </div>
 
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { employeeService, departmentService, positionService } from '../services/employeeService';
+import { statsService } from '../services/employeeService';
 import './HomePage.css';
 
 const HomePage = () => {
@@ -16,15 +16,11 @@ const HomePage = () => {
     const fetchCounts = async () => {
       try {
         setLoading(true);
-        const [emps, depts, pos] = await Promise.all([
-          employeeService.getAll(),
-          departmentService.getAll(),
-          positionService.getAll()
-        ]);
+        const stats = await statsService.get();
         setCounts({
-          employees: Array.isArray(emps) ? emps.length : 0,
-          departments: Array.isArray(depts) ? depts.length : 0,
-          positions: Array.isArray(pos) ? pos.length : 0
+          employees: stats.total_empleados,
+          departments: stats.total_departamentos,
+          positions: stats.total_posiciones
         });
       } catch (err) {
         // silenciar; si quieres mostrar error añade estado para ello
@@ -39,6 +39,20 @@ const handleResponse = async (response) => {
   return response.json();
 };
 
+/**
+ * Construir query string ignorando parámetros vacíos
+ */
+const buildQuery = (params = {}) => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      query.append(key, value);
+    }
+  });
+  const str = query.toString();
+  return str ? `?${str}` : '';
+};
+
 /**
  * Servicio de autenticación
  */
@@ -97,8 +111,10 @@ export const authService = {
  * Servicio para manejar operaciones de empleados
  */
 export const employeeService = {
-  getAll: async () => {
-    const response = await fetch(`${API_BASE_URL}/employees`, {
+  // params: departamento_id, Posicion_id, activo, fecha_desde, fecha_hasta,
+  // salario_min, salario_max, q, sort, skip, limit
+  getAll: async (params = {}) => {
+    const response = await fetch(`${API_BASE_URL}/employees${buildQuery(params)}`, {
       headers: getAuthHeaders(),
     });
     return handleResponse(response);
@@ -226,4 +242,16 @@ export const positionService = {
     });
     return handleResponse(response);
   }
-};
\ No newline at end of file
+};
+
+/**
+ * Servicio de estadísticas (conteos y agregados calculados en el backend)
+ */
+export const statsService = {
+  get: async () => {
+    const response = await fetch(`${API_BASE_URL}/stats`, {
+      headers: getAuthHeaders(),
+    });
+    return handleResponse(response);
+  }
+};